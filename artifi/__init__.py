@@ -96,6 +96,7 @@ class Artifi(BaseConfig):
             end_time: Optional[str] = None,
             interval: Optional[int] = None,
             no_duplicate: bool = True,
+            no_end: bool = False,
     ):
         """
         @param job_id:
@@ -108,6 +109,8 @@ class Artifi(BaseConfig):
         @param end_date: Starting date of the scheduler execution
         @param no_duplicate: 'True' to replace the existing scheduler with same
                                 job_id.'False' to add same scheduler with same job_id.
+        @param no_end: 'True' to run until the job is removed, end_date and
+                       end_time are ignored
         example_usage: self.add_scheduler(function,'HH:MM','HH:MM','YYYY-MM-DD',
                        'YYYY-MM-DD',60)
         Note: If the start_time or end_time is not given it will take 00:00 and 23:59,
@@ -132,7 +135,7 @@ class Artifi(BaseConfig):
             datetime.strptime(f"{start_date} {start_time}",
                               "%Y-%m-%d %H:%M")
         )
-        end_datetime = self.tz.localize(
+        end_datetime = None if no_end else self.tz.localize(
             datetime.strptime(f"{end_date} {end_time}",
                               "%Y-%m-%d %H:%M")
         )
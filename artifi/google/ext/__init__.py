@@ -1,18 +1,267 @@
 """Ext for Google"""
+import asyncio
+import atexit
+import inspect
 import json
 import os
-import time
+import threading
+from collections import OrderedDict
 from contextlib import suppress
+from typing import Callable, Dict, Optional, Tuple
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 
 from artifi import Artifi
 from artifi.google import Google
 
 
+class GoogleBrowserPool:
+    """
+    One long-lived Chromium shared by every web session, each account gets an
+    isolated browser context which is reused between session fetches
+    Playwright runs on its own event loop thread, so the pool can be used
+    from any thread
+    example_usage: pool = GoogleBrowserPool.shared(chrome_path, headless=True)
+    """
+
+    _pools: Dict[Tuple[Optional[str], bool], "GoogleBrowserPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, executable_path: Optional[str] = None,
+                 headless: bool = True, max_contexts: int = 4):
+        """
+        @param executable_path: chromium executable, None for the bundled one
+        @param headless: Set 'True' to do on background, 'False' to open browser
+        @param max_contexts: Maximum number of account contexts kept open
+        """
+        self.executable_path = executable_path
+        self.headless = headless
+        self.max_contexts = max_contexts
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="google-browser-pool", daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self._browser = None
+        self._contexts: OrderedDict = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # fetches holding or waiting for the lock of an account
+        self._lock_users: Dict[str, int] = {}
+        # asyncio primitives bind to the running loop on first use
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._launch_lock = asyncio.Lock()
+
+    @classmethod
+    def shared(cls, executable_path: Optional[str] = None, headless: bool = True,
+               max_contexts: int = 4) -> "GoogleBrowserPool":
+        """
+        @param executable_path: chromium executable, None for the bundled one
+        @param headless: Set 'True' to do on background, 'False' to open browser
+        @param max_contexts: used when the pool is created
+        @return: process wide pool of the browser
+        """
+        with cls._pools_lock:
+            key = (executable_path, headless)
+            if key not in cls._pools:
+                cls._pools[key] = cls(executable_path, headless, max_contexts)
+            return cls._pools[key]
+
+    def _run(self, coro):
+        """
+        @param coro: coroutine to run on the pool loop
+        @return: result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _get_browser(self):
+        """@return: running browser, launched again after a crash"""
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._contexts.clear()
+                self._browser = await self._playwright.chromium.launch(
+                    executable_path=self.executable_path,
+                    headless=self.headless,
+                    args=["--disable-blink-features=AutomationControlled"],
+                )
+            return self._browser
+
+    async def _get_context(self, account: str, storage_state: Optional[dict],
+                           user_agent: str):
+        """
+        @param account: account the context belongs to
+        @param storage_state: saved session used for a new context
+        @param user_agent: user agent of a new context
+        @return: browser context of the account
+        """
+        browser = await self._get_browser()
+        if account in self._contexts:
+            self._contexts.move_to_end(account)
+            return self._contexts[account]
+        while len(self._contexts) >= self.max_contexts:
+            idle = next((name for name in self._contexts
+                         if name not in self._lock_users), None)
+            if idle is None:
+                break
+            self._locks.pop(idle, None)
+            await self._contexts.pop(idle).close()
+        browser_context = await browser.new_context(
+            storage_state=storage_state,
+            user_agent=user_agent,
+            java_script_enabled=True,
+        )
+        self._contexts[account] = browser_context
+        return browser_context
+
+    async def _fetch(self, session: "GoogleWebSession", goto_url: str,
+                     intercept_func: Optional[Callable],
+                     wait_for: Optional[str]) -> Tuple[str, dict]:
+        """
+        @param session: :class GoogleWebSession of the account
+        @param goto_url: URL to go and save the session of the site
+        @param intercept_func: called with every response of the page
+        @param wait_for: part of a response url which marks the page as ready
+        @return: current page url and storage state of the context
+        """
+        account = session._email
+        lock = self._locks.setdefault(account, asyncio.Lock())
+        self._lock_users[account] = self._lock_users.get(account, 0) + 1
+        try:
+            # the account lock comes first, so waiting fetches of one account
+            # don't hold the slots other accounts need
+            async with lock, self._slots:
+                return await self._fetch_page(session, goto_url, intercept_func,
+                                              wait_for)
+        finally:
+            self._lock_users[account] -= 1
+            if not self._lock_users[account]:
+                del self._lock_users[account]
+                if account not in self._contexts:
+                    self._locks.pop(account, None)
+
+    async def _fetch_page(self, session: "GoogleWebSession", goto_url: str,
+                          intercept_func: Optional[Callable],
+                          wait_for: Optional[str]) -> Tuple[str, dict]:
+        """
+        Runs with the account lock and a context slot held
+        @param session: :class GoogleWebSession of the account
+        @param goto_url: URL to go and save the session of the site
+        @param intercept_func: called with every response of the page
+        @param wait_for: part of a response url which marks the page as ready
+        @return: current page url and storage state of the context
+        """
+        browser_context = await self._get_context(
+            session._email, session.load_session(), session._user_agent)
+        page = await browser_context.new_page()
+        ready = asyncio.Event()
+
+        async def on_response(response):
+            # ready is set once the interceptor has read the response
+            if intercept_func and inspect.isawaitable(
+                    result := intercept_func(response)):
+                await result
+            if wait_for and wait_for in response.url:
+                ready.set()
+
+        page.on("response", on_response)
+        try:
+            await page.goto(goto_url)
+            if "accounts.google.com" in page.url:
+                await self._login(session, page)
+            session.context.logger.info(
+                "Almost There Just Validating Session...!")
+            if wait_for:
+                await asyncio.wait_for(ready.wait(), timeout=60)
+            else:
+                await page.wait_for_load_state("networkidle")
+            return page.url, await browser_context.storage_state()
+        finally:
+            await page.close()
+
+    @staticmethod
+    async def _login(session: "GoogleWebSession", page):
+        """
+        @param session: :class GoogleWebSession of the account
+        @param page: page showing the Google sign in
+        """
+        session.context.logger.info("Logging In With Given Credentials")
+        await page.fill('input[type="email"]', f"{session._email}")
+        await page.click("div#identifierNext")
+
+        await page.wait_for_selector('input[type="password"]', state="visible")
+        await page.fill('input[type="password"]', f"{session._password}")
+        await page.click("div#passwordNext")
+        await page.wait_for_url(lambda url: "accounts.google.com" not in url,
+                                timeout=60000)
+        session.context.logger.info("Login Successfully...!")
+
+    def fetch(self, session: "GoogleWebSession", goto_url: str,
+              intercept_func: Optional[Callable] = None,
+              wait_for: Optional[str] = None) -> Tuple[str, dict]:
+        """
+        @param session: :class GoogleWebSession of the account
+        @param goto_url: URL to go and save the session of the site
+        @param intercept_func: called with every response, may be a coroutine
+        @param wait_for: part of a response url which marks the page as ready
+        @return: current page url and storage state of the context
+        """
+        return self._run(self._fetch(session, goto_url, intercept_func, wait_for))
+
+    async def _discard(self, account: str):
+        """@param account: account whose context is closed"""
+        if account not in self._lock_users:
+            self._locks.pop(account, None)
+        if browser_context := self._contexts.pop(account, None):
+            with suppress(Exception):
+                await browser_context.close()
+
+    def discard(self, account: str):
+        """
+        Close the context of the account, the next fetch starts from the
+        saved session
+        @param account: Google email
+        """
+        self._run(self._discard(account))
+
+    async def _close(self):
+        """Close contexts, browser and playwright"""
+        for account in list(self._contexts):
+            await self._discard(account)
+        with suppress(Exception):
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+    def close(self):
+        """Stop the pool"""
+        if self._loop.is_running():
+            self._run(self._close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    @classmethod
+    def close_all(cls):
+        """Stop every shared pool, registered with atexit"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            with suppress(Exception):
+                pool.close()
+
+
+atexit.register(GoogleBrowserPool.close_all)
+
+
 class GoogleWebSession(Google):
     """To use the Google web API unofficial method using web session and playwright"""
 
+    # account contexts kept open by the shared browser
+    max_browser_contexts = 4
+
     def __init__(self, context, email, password, headless, user_agent):
         """
 
@@ -32,6 +281,15 @@ class GoogleWebSession(Google):
         self._password: str = password
         self._user_agent: str = user_agent
 
+    @property
+    def browser_pool(self) -> GoogleBrowserPool:
+        """
+        Shared browser of every session with the same chrome and headless mode
+        @return: :class GoogleBrowserPool
+        """
+        return GoogleBrowserPool.shared(self._chrome_path, self._headless,
+                                        self.max_browser_contexts)
+
     def load_session(self):
         """
         Check and return the data of the session
@@ -49,53 +307,22 @@ class GoogleWebSession(Google):
         with suppress(Exception), open(self._session_path, "w") as f:
             json.dump(data, f)
 
-    def fetch_save_gsession(self, goto_url, intercept_func: callable):
+    def fetch_save_gsession(self, goto_url, intercept_func: callable,
+                            wait_for: Optional[str] = None):
         """
 
         @param goto_url: URL to go and save the session of the site
-        @param intercept_func: Optional if upu want to see the network request
+        @param intercept_func: Optional if upu want to see the network request,
+                               receives the playwright async response, use a
+                               coroutine function to read the body
+        @param wait_for: part of a response url which marks the page as ready,
+                         default waits for the network to be idle
         @return Current page url
         """
         self.context.logger.info(
             f"Setting Up Session For {self._email}, Please Wait...!"
         )
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                executable_path=self._chrome_path,
-                headless=self._headless,
-                args=["--disable-blink-features=AutomationControlled"],
-            )
-            session_data = self.load_session()
-            browser_context = browser.new_context(
-                storage_state=session_data,
-                user_agent=self._user_agent,
-                java_script_enabled=True,
-            )
-            page = browser_context.new_page()
-            if intercept_func:
-                page.on("response", intercept_func)
-
-            page.goto(goto_url)
-            if "accounts.google.com" in page.url:
-                self.context.logger.info("Logging In With Given Credentials")
-                page.fill('input[type="email"]', f"{self._email}")
-                page.click("div#identifierNext")
-
-                page.wait_for_selector('input[type="password"]',
-                                       state="visible")
-                page.fill('input[type="password"]', f"{self._password}")
-                page.click("div#passwordNext")
-                time.sleep(5)
-                page.wait_for_selector(
-                    '[id="menu-paper-icon-item-1"]', state="attached"
-                )
-                session_data = browser_context.storage_state()
-                self.save_session(session_data)
-                self.context.logger.info("Login Successfully...!")
-
-            browser_context.storage_state = session_data
-            self.context.logger.info("Almost There Just Validating Session...!")
-            page.wait_for_timeout(10000)
-            current_page_url = page.url
-            browser_context.close()
+        current_page_url, session_data = self.browser_pool.fetch(
+            self, goto_url, intercept_func, wait_for)
+        self.save_session(session_data)
         return current_page_url
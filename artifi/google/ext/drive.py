@@ -1,16 +1,31 @@
 """Google Drive"""
+import fnmatch
+import hashlib
 import io
+import json
+import math
 import os
+import posixpath
+import queue
 import re
+import shutil
+import tarfile
+import threading
 import time
 import urllib.parse as urlparse
 import uuid
-from random import randrange
+import zipfile
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, suppress
+from datetime import datetime, timezone
+from random import random, randrange
 from urllib.parse import parse_qs
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+from googleapiclient.http import HttpRequest, MediaIoBaseDownload, \
+    MediaIoBaseUpload, MediaUpload
 from tenacity import *
 
 from artifi.config.ext.exception import DriveUploadError, DriveError, \
@@ -62,6 +77,604 @@ export_mime = {
 }
 
 
+class DriveFilter:
+    """
+    Include and exclude rules for drive listings, rules supported by the drive
+    query language are pushed down to 'q', the rest are applied on the client
+    Note: folders are always listed so the tree can be walked, only the name
+          exclude globs are applied to them
+    """
+
+    folder_mime = "application/vnd.google-apps.folder"
+    shortcut_mime = "application/vnd.google-apps.shortcut"
+
+    def __init__(self,
+                 include=None,
+                 exclude=None,
+                 mime_types=None,
+                 exclude_mime_types=None,
+                 min_size=None,
+                 max_size=None,
+                 modified_after=None,
+                 modified_before=None
+                 ):
+        """
+        @param include: name globs, a file must match one of them :example ['*.mkv']
+        @param exclude: name globs, matching files and folders are skipped
+        @param mime_types: only files with these mime types
+        @param exclude_mime_types: skip files with these mime types
+        @param min_size: minimum file size in bytes, items without a size
+                         such as shortcuts and Google Docs are kept
+        @param max_size: maximum file size in bytes, same as min_size
+        @param modified_after: datetime or RFC 3339 string
+        @param modified_before: datetime or RFC 3339 string
+        """
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.mime_types = list(mime_types or [])
+        self.exclude_mime_types = list(exclude_mime_types or [])
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = self._to_datetime(modified_after)
+        self.modified_before = self._to_datetime(modified_before)
+
+    @staticmethod
+    def _to_datetime(value):
+        """
+        @param value: datetime or RFC 3339 string
+        @return: aware datetime in UTC
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    @staticmethod
+    def _quote(value):
+        """@return: value escaped for the drive query"""
+        return value.replace('\\', '\\\\').replace("'", "\\'")
+
+    def query(self, folder_id) -> str:
+        """
+        @param folder_id: ID of the folder to be listed
+        @return: drive query for the children of the folder
+        """
+        terms = [f"'{folder_id}' in parents", "trashed = false"]
+        keep_folder = f"mimeType = '{self.folder_mime}'"
+        if self.mime_types:
+            wanted = [keep_folder, f"mimeType = '{self.shortcut_mime}'"]
+            wanted += [f"mimeType = '{self._quote(mime)}'" for mime in
+                       self.mime_types]
+            terms.append(f"({' or '.join(wanted)})")
+        for mime in self.exclude_mime_types:
+            terms.append(f"mimeType != '{self._quote(mime)}'")
+        if self.modified_after:
+            stamp = self.modified_after.strftime('%Y-%m-%dT%H:%M:%S')
+            terms.append(f"({keep_folder} or modifiedTime > '{stamp}')")
+        if self.modified_before:
+            stamp = self.modified_before.strftime('%Y-%m-%dT%H:%M:%S')
+            terms.append(f"({keep_folder} or modifiedTime < '{stamp}')")
+        return " and ".join(terms)
+
+    def matches(self, item) -> bool:
+        """
+        Client side rules, mime and time rules are checked again since
+        shortcuts are listed with their own mime type
+        @param item: drive file resource
+        @return: 'True' if the item should be transferred
+        """
+        name = item.get('name', '')
+        if any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude):
+            return False
+        mime_type = item.get('mimeType')
+        if shortcut := item.get('shortcutDetails'):
+            mime_type = shortcut.get('targetMimeType', mime_type)
+        if mime_type == self.folder_mime:
+            return True
+        if self.include and not any(
+                fnmatch.fnmatch(name, pattern) for pattern in self.include):
+            return False
+        if self.mime_types and mime_type not in self.mime_types:
+            return False
+        if mime_type in self.exclude_mime_types:
+            return False
+        # shortcuts and Google Docs have no size, the size rules skip them
+        if (size := item.get('size')) is not None:
+            size = int(size)
+            if self.min_size is not None and size < self.min_size:
+                return False
+            if self.max_size is not None and size > self.max_size:
+                return False
+        if (modified := item.get('modifiedTime')) and (
+                self.modified_after or self.modified_before):
+            modified = self._to_datetime(modified)
+            if self.modified_after and modified <= self.modified_after:
+                return False
+            if self.modified_before and modified >= self.modified_before:
+                return False
+        return True
+
+    def apply(self, items) -> list:
+        """
+        @param items: drive file resources
+        @return: items matching the client side rules
+        """
+        return [item for item in items if self.matches(item)]
+
+
+class StreamMediaUpload(MediaUpload):
+    """
+    Resumable media read once, in order, from a stream that can't seek,
+    MediaIoBaseUpload seeks to find the size and on every chunk. The last
+    chunk is kept so a chunk the server didn't fully acknowledge can be resent
+    """
+
+    def __init__(self, fd, size, mimetype, chunksize=10 * 1024 * 1024):
+        """
+        @param fd: readable stream
+        @param size: total bytes that will be read from the stream
+        @param mimetype: mime type of the media
+        @param chunksize: size of each uploaded chunk
+        """
+        super().__init__()
+        self._fd = fd
+        self._size = size
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._buffer = b''
+        self._buffer_start = 0
+
+    def chunksize(self):
+        """@return: chunk size"""
+        return self._chunksize
+
+    def mimetype(self):
+        """@return: mime type"""
+        return self._mimetype
+
+    def size(self):
+        """@return: total size"""
+        return self._size
+
+    def resumable(self):
+        """@return: always resumable"""
+        return True
+
+    def has_stream(self):
+        """@return: 'False', so the client uses :meth getbytes"""
+        return False
+
+    def _read(self, length) -> bytes:
+        """
+        @param length: bytes to read
+        @return: up to length bytes, less only at the end of the stream
+        """
+        parts = []
+        while length > 0 and (data := self._fd.read(length)):
+            parts.append(data)
+            length -= len(data)
+        return b''.join(parts)
+
+    def getbytes(self, begin, length):
+        """
+        @param begin: offset requested by the client
+        @param length: number of bytes
+        @return: bytes
+        """
+        buffer_end = self._buffer_start + len(self._buffer)
+        if not self._buffer_start <= begin <= buffer_end:
+            raise DriveUploadError(
+                f"Stream Can't Seek To {begin}, Buffered {self._buffer_start}-{buffer_end}")
+        pending = self._buffer[begin - self._buffer_start:][:length]
+        data = pending + self._read(length - len(pending))
+        self._buffer = data
+        self._buffer_start = begin
+        return data
+
+
+class FanoutReader:
+    """
+    Read a stream once and hand the same bytes to several readers, the
+    fastest reader waits when it runs more than max_lag bytes ahead of the
+    slowest one, so memory stays bounded
+    """
+
+    def __init__(self, fd, readers, on_read=None, max_lag=20 * 1024 * 1024):
+        """
+        @param fd: source stream
+        @param readers: number of readers
+        @param on_read: called with the number of bytes read from the source
+        @param max_lag: maximum bytes buffered between the readers
+        """
+        self._fd = fd
+        self._on_read = on_read
+        self._max_lag = max_lag
+        self._buffer = b''
+        self._buffer_start = 0
+        self._offsets = {n: 0 for n in range(readers)}
+        self._condition = threading.Condition()
+
+    def reader(self, n):
+        """
+        @param n: index of the reader
+        @return: file like object with read()
+        """
+        return _FanoutStream(self, n)
+
+    def detach(self, n):
+        """
+        Stop waiting for a reader, used when its destination failed
+        @param n: index of the reader
+        """
+        with self._condition:
+            self._offsets.pop(n, None)
+            self._trim()
+            self._condition.notify_all()
+
+    def _trim(self):
+        """Drop the bytes every reader consumed, condition held"""
+        if not self._offsets:
+            return
+        low = min(self._offsets.values())
+        if low > self._buffer_start:
+            self._buffer = self._buffer[low - self._buffer_start:]
+            self._buffer_start = low
+
+    def read(self, n, length) -> bytes:
+        """
+        @param n: index of the reader
+        @param length: bytes to read
+        @return: bytes
+        """
+        with self._condition:
+            offset = self._offsets[n]
+            self._condition.wait_for(
+                lambda: offset + length - min(self._offsets.values()) <= (
+                        self._max_lag) or min(self._offsets.values()) == offset)
+            buffer_end = self._buffer_start + len(self._buffer)
+            if offset + length > buffer_end:
+                data = self._fd.read(offset + length - buffer_end) or b''
+                self._buffer += data
+                if self._on_read and data:
+                    self._on_read(len(data))
+            start = offset - self._buffer_start
+            data = self._buffer[start:start + length]
+            self._offsets[n] = offset + len(data)
+            self._trim()
+            self._condition.notify_all()
+            return data
+
+
+class _FanoutStream:
+    """Readable view of :class FanoutReader for one destination"""
+
+    def __init__(self, source, n):
+        self._source = source
+        self._n = n
+
+    def read(self, length=-1):
+        """@param length: bytes to read"""
+        return self._source.read(self._n, length)
+
+
+class ChunkPipe:
+    """
+    Bounded in memory pipe between a download and an upload running on
+    different threads, the writer blocks when max_chunks are waiting
+    """
+
+    def __init__(self, max_chunks=4):
+        """@param max_chunks: Number of chunks buffered between both ends"""
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._pending = b''
+        self._finished = False
+        self._cancelled = threading.Event()
+
+    def write(self, data):
+        """
+        Writer side, called by MediaIoBaseDownload
+        @param data: downloaded bytes
+        """
+        data = bytes(data)
+        while True:
+            if self._cancelled.is_set():
+                raise DriveCloneError("Stream Copy Was Cancelled")
+            try:
+                self._queue.put(data, timeout=1)
+                return len(data)
+            except queue.Full:
+                continue
+
+    def close(self, error=None):
+        """
+        Writer side, mark the end of the stream
+        @param error: exception raised to the reader instead of EOF
+        """
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(error, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def cancel(self):
+        """Reader side, unblock and stop the writer"""
+        self._cancelled.set()
+
+    def read(self, length) -> bytes:
+        """
+        Reader side, called by :class StreamMediaUpload
+        @param length: bytes to read
+        @return: up to length bytes, b'' at the end of the stream
+        """
+        while len(self._pending) < length and not self._finished:
+            data = self._queue.get()
+            if data is None:
+                self._finished = True
+            elif isinstance(data, BaseException):
+                self._finished = True
+                raise data
+            else:
+                self._pending += data
+        data, self._pending = self._pending[:length], self._pending[length:]
+        return data
+
+
+class TransferProgress:
+    """
+    Progress state of a drive transfer, the speed is an EWMA over the recent
+    samples, so it recovers quickly after a stall instead of averaging over
+    the whole elapsed time, events are pushed to the subscribers
+    """
+
+    def __init__(self, status, total_bytes=0, window=5, logger=None):
+        """
+        @param status: Uploading, Downloading or Cloning
+        @param total_bytes: Total size of the transfer
+        @param window: Smoothing time constant of the speed in seconds
+        @param logger: used to report failing subscribers
+        """
+        self.status: str = status
+        self.total_bytes: int = total_bytes
+        self.transferred_bytes: int = 0
+        self.filename = None
+        self.started_time: float = time.time()
+        self._window = window
+        self._speed = 0.0
+        self._sample_time = self.started_time
+        self._logger = logger
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, rate=1):
+        """
+        @param callback: called with the progress event dict
+        @param rate: Maximum number of events per second
+        @return: callback, to be used with :meth unsubscribe
+        """
+        with self._lock:
+            self._subscribers[callback] = [1 / rate if rate else 0, 0]
+        return callback
+
+    def unsubscribe(self, callback):
+        """@param callback: previously subscribed callback"""
+        with self._lock:
+            self._subscribers.pop(callback, None)
+
+    def set_file(self, filename):
+        """@param filename: File currently transferred"""
+        self.filename = filename
+        self.publish()
+
+    def advance(self, nbytes):
+        """
+        @param nbytes: bytes transferred since the last call, negative when
+                       a file is restarted
+        """
+        now = time.time()
+        with self._lock:
+            if nbytes > 0:
+                self._speed = self._decayed_speed(now, nbytes)
+                self._sample_time = now
+            self.transferred_bytes += nbytes
+        self.publish()
+
+    def _decayed_speed(self, now, nbytes=0):
+        """
+        @param now: current timestamp
+        @param nbytes: bytes transferred since the last sample
+        @return: speed in bytes per second
+        """
+        elapsed = now - self._sample_time
+        if elapsed <= 0:
+            return self._speed
+        alpha = 1 - math.exp(-elapsed / self._window)
+        return self._speed + alpha * (nbytes / elapsed - self._speed)
+
+    @property
+    def speed(self) -> float:
+        """@return: current speed in bytes per second"""
+        return self._decayed_speed(time.time())
+
+    @property
+    def eta(self):
+        """@return: remaining seconds, None if it can't be estimated"""
+        speed = self.speed
+        remaining = self.total_bytes - self.transferred_bytes
+        if speed < 1 or remaining <= 0:
+            return None if remaining > 0 else 0
+        return remaining / speed
+
+    def snapshot(self) -> dict:
+        """@return: progress event"""
+        eta = self.eta
+        return {
+            'filename': self.filename,
+            'status': self.status,
+            'progress': f'{readable_size(self.transferred_bytes)}/{readable_size(self.total_bytes)}',
+            'elapsed': readable_time(time.time() - self.started_time),
+            'speed': speed_convert(self.speed),
+            'eta': readable_time(eta) if eta is not None else '-',
+            'transferred_bytes': self.transferred_bytes,
+            'total_bytes': self.total_bytes,
+        }
+
+    def publish(self, force=False):
+        """
+        Push the current progress to the subscribers, rate limited per subscriber
+        @param force: 'True' to ignore the rate limit, used for the final event
+        """
+        now = time.time()
+        with self._lock:
+            due = [callback for callback, limit in self._subscribers.items()
+                   if force or now - limit[1] >= limit[0]]
+            for callback in due:
+                self._subscribers[callback][1] = now
+        if not due:
+            return
+        event = self.snapshot()
+        for callback in due:
+            try:
+                callback(event)
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"Progress Subscriber Failed: {e}")
+
+
+class ThroughputHistory:
+    """Throughput of the finished transfers, used for the ETA of a plan"""
+
+    def __init__(self, context, runs=20):
+        """
+        @param context: pass :class Artifi
+        @param runs: Number of recent transfers kept per kind
+        """
+        self._path = os.path.join(context.directory, '.drive_throughput.json')
+        self._runs = runs
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        """@return: recent runs per kind"""
+        try:
+            with open(self._path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, kind, nbytes, seconds):
+        """
+        @param kind: upload, download or clone
+        @param nbytes: bytes transferred
+        @param seconds: time taken
+        """
+        if nbytes <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            history = self._load()
+            runs = history.setdefault(kind, [])
+            runs.append([nbytes, seconds])
+            history[kind] = runs[-self._runs:]
+            with open(self._path, 'w') as f:
+                json.dump(history, f)
+
+    def rate(self, kind):
+        """
+        @param kind: upload, download or clone
+        @return: bytes per second, None without history
+        """
+        runs = self._load().get(kind, [])
+        seconds = sum(run[1] for run in runs)
+        return sum(run[0] for run in runs) / seconds if seconds else None
+
+
+class TransferPlan:
+    """Counts collected by the dry run of a transfer"""
+
+    sa_daily_quota = 750 * 1024 ** 3
+
+    def __init__(self, kind, name, gdrive):
+        """
+        @param kind: upload, download or clone
+        @param name: name of the file or folder
+        @param gdrive: pass :class GoogleDrive
+        """
+        self.kind = kind
+        self.name = name
+        self.gdrive: GoogleDrive = gdrive
+        self.files = 0
+        self.folders = 0
+        self.bytes = 0
+        self.requests = Counter()
+
+    def add_folder(self, **requests):
+        """@param requests: API requests needed for the folder, by type"""
+        self.folders += 1
+        self.requests.update(requests)
+
+    def add_file(self, size, **requests):
+        """
+        @param size: bytes transferred for the file
+        @param requests: API requests needed for the file, by type
+        """
+        self.files += 1
+        self.bytes += size
+        self.requests.update(requests)
+
+    def report(self) -> dict:
+        """@return: plan report"""
+        rate = ThroughputHistory(self.gdrive.context).rate(self.kind)
+        eta = self.bytes / rate if rate else None
+        requests = Counter(self.requests)
+        if deferred := requests.pop('deferred_permission', 0):
+            # shared 100 per batch request at the end of the transfer
+            requests['batch'] += math.ceil(deferred / 100)
+        report = {
+            'type': self.kind,
+            'name': self.name,
+            'files': self.files,
+            'folders': self.folders,
+            'bytes': self.bytes,
+            'size': readable_size(self.bytes),
+            'requests': {kind: count for kind, count in requests.items()
+                         if count},
+            'total_requests': sum(requests.values()),
+            'eta_seconds': eta,
+            'eta': readable_time(eta) if eta is not None else '-',
+        }
+        if self.kind != 'download':
+            accounts = math.ceil(self.bytes / self.sa_daily_quota)
+            report['service_accounts'] = {
+                'required': accounts,
+                'available': len(os.listdir(self.gdrive._sa_path)) if (
+                    self.gdrive.use_sa) else 1,
+            }
+        return report
+
+
+class CountingHttpRequest(HttpRequest):
+    """HttpRequest which reports every round-trip to the owning drive"""
+
+    def __init__(self, gdrive, *args, **kwargs):
+        """
+        @param gdrive: pass :class GoogleDrive
+        """
+        super().__init__(*args, **kwargs)
+        self._gdrive = gdrive
+
+    def execute(self, http=None, num_retries=0):
+        # resumable requests are counted per chunk
+        if self.resumable is None:
+            self._gdrive.count_call(self.methodId)
+        return super().execute(http=http, num_retries=num_retries)
+
+    def next_chunk(self, http=None, num_retries=0):
+        self._gdrive.count_call(f"{self.methodId}.chunk")
+        return super().next_chunk(http=http, num_retries=num_retries)
+
+
 class GoogleDrive(Google):
 
     def __init__(self,
@@ -84,8 +697,15 @@ class GoogleDrive(Google):
         self._sa_idx = randrange(len(os.listdir(self._sa_path))) if (
             self.use_sa) else None
         self.drive_folder_mime = "application/vnd.google-apps.folder"
+        self.bulk_retry_reasons = ['userRateLimitExceeded', 'rateLimitExceeded',
+                                   'sharingRateLimitExceeded', 'backendError',
+                                   'internalError']
         self.dl_file_prefix = "https://drive.google.com/uc?id={}&export=download"
         self.dl_folder_prefix = "https://drive.google.com/drive/folders/{}"
+        self._credentials = None
+        self._local = threading.local()
+        self.api_calls = Counter()
+        self._calls_lock = threading.Lock()
         self._service = self.authorize()
 
     def authorize(self):
@@ -94,10 +714,64 @@ class GoogleDrive(Google):
         @return:
         """
         # Get credentials
-        credentials = self.oauth_creds(self.scope,
-                                       service_user=self.use_sa,
-                                       cname="drive")
-        return build('drive', 'v3', credentials=credentials, cache_discovery=False)
+        self._credentials = self.oauth_creds(self.scope,
+                                             service_user=self.use_sa,
+                                             cname="drive")
+        return self._build_service()
+
+    def _build_service(self):
+        """@return: drive service which counts its API calls"""
+        return build('drive', 'v3', credentials=self._credentials,
+                     cache_discovery=False,
+                     requestBuilder=lambda *args, **kwargs: CountingHttpRequest(
+                         self, *args, **kwargs))
+
+    def count_call(self, method_id, count=1):
+        """
+        @param method_id: API method, e.g. drive.files.list
+        @param count: number of round-trips
+        """
+        with self._calls_lock:
+            self.api_calls[method_id] += count
+            for counter in getattr(self._local, 'counters', ()):
+                counter[method_id] += count
+
+    @contextmanager
+    def count_into(self, *counters):
+        """
+        Count the API calls made by the current thread into the counters as
+        well, other threads using this drive are not counted
+        @param counters: :class Counter
+        """
+        previous = getattr(self._local, 'counters', ())
+        self._local.counters = previous + counters
+        try:
+            yield
+        finally:
+            self._local.counters = previous
+
+    def bind_counters(self, function):
+        """
+        @param function: callable which will run on another thread
+        @return: callable counting into the counters of the current thread
+        """
+        counters = getattr(self._local, 'counters', ())
+
+        def run(*args, **kwargs):
+            with self.count_into(*counters):
+                return function(*args, **kwargs)
+        return run
+
+    def thread_service(self):
+        """
+        googleapiclient services share one httplib2 connection and are not
+        thread safe, so worker threads get their own service
+        @return: drive service bound to the current thread
+        """
+        if getattr(self._local, 'credentials', None) is not self._credentials:
+            self._local.service = self._build_service()
+            self._local.credentials = self._credentials
+        return self._local.service
 
     def switch_service_account(self):
         """switch to service"""
@@ -185,6 +859,158 @@ class GoogleDrive(Google):
                                                       body=permissions).execute()
         return None
 
+    def set_permissions(self, file_ids):
+        """
+        Share many files in batch requests
+        @param file_ids: drive file IDs
+        @return: see :meth bulk_share, None on a team drive
+        """
+        if self.is_td:
+            return None
+        return self.bulk_share(file_ids)
+
+    @staticmethod
+    def _error_reason(err):
+        """
+        @param err: :class HttpError
+        @return: reason of the error
+        """
+        try:
+            return err.error_details[0]["reason"]
+        except (AttributeError, IndexError, KeyError, TypeError):
+            return str(err.resp.status)
+
+    def _query_ids(self, query):
+        """
+        @param query: drive search query
+        @return: IDs of every matching file
+        """
+        file_ids = []
+        page_token = None
+        while True:
+            response = self._service.files().list(supportsAllDrives=True,
+                                                  includeItemsFromAllDrives=True,
+                                                  corpora='allDrives',
+                                                  q=query,
+                                                  fields='nextPageToken, files(id)',
+                                                  pageToken=page_token,
+                                                  pageSize=1000).execute()
+            file_ids.extend(item['id'] for item in response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return file_ids
+
+    def _bulk(self, operation, file_ids=None, query=None, workers=4,
+              batch_size=100, max_retries=5):
+        """
+        Run one request per file through batch requests on worker threads,
+        items failing on rate limits are retried with exponential backoff
+        @param operation: Callable(service, file_id) returning the request
+        @param file_ids: drive file IDs
+        @param query: drive search query, used when file_ids is None
+        @param workers: Number of concurrent batches
+        @param batch_size: requests per batch, at most 100
+        @param max_retries: attempts before giving up on an item
+        @return: {file_id: {'ok': bool, 'error': reason or None}}
+        """
+        if file_ids is None:
+            if query is None:
+                raise DriveError("Either File IDs Or Query Is Required...!")
+            file_ids = self._query_ids(query)
+        file_ids = list(dict.fromkeys(file_ids))
+        batch_size = min(batch_size, 100)
+        results = {}
+        lock = threading.Lock()
+
+        def run(chunk):
+            service = self.thread_service()
+            pending = chunk
+            for attempt in range(max_retries + 1):
+                retry_ids = []
+
+                def callback(request_id, response, exception):
+                    if exception is None:
+                        outcome = {'ok': True, 'error': None}
+                    elif (reason := self._error_reason(exception)) in \
+                            self.bulk_retry_reasons and attempt < max_retries:
+                        return retry_ids.append(request_id)
+                    else:
+                        outcome = {'ok': False, 'error': reason}
+                    with lock:
+                        results[request_id] = outcome
+
+                batch = service.new_batch_http_request(callback=callback)
+                for file_id in pending:
+                    batch.add(operation(service, file_id), request_id=file_id)
+                try:
+                    batch.execute()
+                    self.count_call('batch')
+                except HttpError as err:
+                    if attempt == max_retries:
+                        with lock:
+                            results.update({file_id: {'ok': False,
+                                                      'error': self._error_reason(err)}
+                                            for file_id in pending})
+                        return
+                    retry_ids = pending
+                if not retry_ids:
+                    return
+                pending = retry_ids
+                time.sleep(min(2 ** attempt + random(), 64))
+
+        chunks = [file_ids[idx:idx + batch_size]
+                  for idx in range(0, len(file_ids), batch_size)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            run = self.bind_counters(run)
+            for job in as_completed([pool.submit(run, chunk) for chunk in chunks]):
+                job.result()
+        failed = sum(1 for outcome in results.values() if not outcome['ok'])
+        self.context.logger.info(
+            f"Bulk Operation Done: {len(results) - failed} Succeeded, {failed} Failed")
+        return results
+
+    def bulk_delete(self, file_ids=None, query=None, workers=4):
+        """
+        Permanently delete files, skips the trash
+        @param file_ids: drive file IDs
+        @param query: drive search query, used when file_ids is None
+        @param workers: Number of concurrent batches
+        @return: see :meth _bulk
+        """
+        return self._bulk(lambda service, file_id: service.files().delete(
+            fileId=file_id, supportsAllDrives=True), file_ids, query, workers)
+
+    def bulk_trash(self, file_ids=None, query=None, workers=4):
+        """
+        @param file_ids: drive file IDs
+        @param query: drive search query, used when file_ids is None
+        @param workers: Number of concurrent batches
+        @return: see :meth _bulk
+        """
+        return self._bulk(lambda service, file_id: service.files().update(
+            fileId=file_id, supportsAllDrives=True, body={'trashed': True},
+            fields='id'), file_ids, query, workers)
+
+    def bulk_share(self, file_ids=None, query=None, permission=None, workers=4):
+        """
+        @param file_ids: drive file IDs
+        @param query: drive search query, used when file_ids is None
+        @param permission: permission body, default is anyone with the link
+                           can read
+        @param workers: Number of concurrent batches
+        @return: see :meth _bulk
+        """
+        permission = permission or {
+            'role': 'reader',
+            'type': 'anyone',
+            'value': None,
+            'withLink': True
+        }
+        return self._bulk(lambda service, file_id: service.permissions().create(
+            fileId=file_id, supportsAllDrives=True, body=permission,
+            fields='id'), file_ids, query, workers)
+
     def get_metadata(self, file_id):
         """
 
@@ -192,7 +1018,7 @@ class GoogleDrive(Google):
         @return:
         """
         return self._service.files().get(supportsAllDrives=True, fileId=file_id,
-                                         fields="name,id,mimeType,size").execute()
+                                         fields="name,id,mimeType,size,modifiedTime").execute()
 
     def drive_detail(self, fields=None):
         """
@@ -243,33 +1069,66 @@ class GoogleDrive(Google):
         )
         return file_id
 
-    def Upload(self, directory_path):
-        """
-
+    def Upload(self, directory_path, extract_archive=False,
+               simple_upload_threshold=5 * 1024 * 1024, bundle_threshold=None,
+               bundle_size=64 * 1024 * 1024, mirrors=None,
+               defer_permissions=False):
+        """
+        @param directory_path: local file or folder
+        @param extract_archive: 'True' to upload the members of a zip or tar
+                                file instead of the file itself
+        @param simple_upload_threshold: files up to this size are uploaded in
+                                        one multipart request
+        @param bundle_threshold: files up to this size are packed into tar
+                                 shards, None to disable
+        @param bundle_size: size of each tar shard
+        @param mirrors: other :class GoogleDrive destinations, every chunk is
+                        read once and sent to all of them
+        @param defer_permissions: 'True' to share the files in batches after
+                                  the upload instead of one request per file
         @return:
         """
-        return DriveUpload(self, directory_path)
+        return DriveUpload(self, directory_path, extract_archive,
+                           simple_upload_threshold, bundle_threshold, bundle_size,
+                           mirrors, defer_permissions)
 
-    def Download(self, drive_link):
+    def Download(self, drive_link, item_filter=None, export_workers=4,
+                 export_cache=True, export_cache_size=1024 * 1024 * 1024):
         """
-
+        @param drive_link:
+        @param item_filter: Optional :class DriveFilter
+        @param export_workers: Number of concurrent Google Docs exports
+        @param export_cache: 'True' to reuse unchanged exports from disk
+        @param export_cache_size: bytes kept by the export cache, the least
+                                  recently used exports are removed first
         @return:
         """
-        return DriveDownload(self, drive_link)
+        return DriveDownload(self, drive_link, item_filter, export_workers,
+                             export_cache, export_cache_size)
 
-    def Properties(self, drive_link):
+    def Properties(self, drive_link, item_filter=None, index=None):
         """
-
+        @param drive_link:
+        @param item_filter: Optional :class DriveFilter
+        @param index: Optional :class DriveIndex, folder totals are read from
+                      its rollups instead of walking the folder
         @return:
         """
-        return DriveProperties(self, drive_link)
+        return DriveProperties(self, drive_link, item_filter, index)
 
-    def Clone(self, drive_link):
+    def Clone(self, drive_link, item_filter=None, source=None,
+              defer_permissions=False):
         """
-
+        @param drive_link:
+        @param item_filter: Optional :class DriveFilter
+        @param source: :class GoogleDrive with read access to the link,
+                       default is this drive
+        @param defer_permissions: 'True' to share the copies in batches after
+                                  the clone instead of one request per file
         @return:
         """
-        return DriveCloner(self, drive_link)
+        return DriveCloner(self, drive_link, item_filter, source,
+                           defer_permissions)
 
     @property
     def service(self):
@@ -283,11 +1142,36 @@ class GoogleDrive(Google):
 class DriveUpload:
     """ Drive Upload Functionality"""
 
-    def __init__(self, gdrive, directory_path):
+    archive_extensions = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2',
+                          '.tbz2', '.tar.xz', '.txz')
+
+    bundle_manifest_name = 'artifi-bundle-manifest.json'
+
+    def __init__(self, gdrive, directory_path, extract_archive=False,
+                 simple_upload_threshold=5 * 1024 * 1024, bundle_threshold=None,
+                 bundle_size=64 * 1024 * 1024, mirrors=None,
+                 defer_permissions=False):
         self.__UPLOAD_STARTED_TIME = time.time()
 
         self.gdrive: GoogleDrive = gdrive
+        self._targets: list = [gdrive] + list(mirrors or [])
+        self.api_calls = Counter()
+        self._defer_permissions = defer_permissions
+        self._pending_permissions = []
+        self._children = {}
+        self._children_lock = threading.Lock()
+        if len(self._targets) > 1 and (extract_archive or bundle_threshold is not None):
+            raise ValueError("Mirrors Can't Be Used With Archive Or Bundle Upload")
         self._upload_path = directory_path
+        self._extract_archive = extract_archive
+        self._simple_upload_threshold = simple_upload_threshold
+        self._bundle_threshold = bundle_threshold
+        self._bundle_size = bundle_size
+        self._bundle = None
+        self._bundle_buffer = None
+        self._bundle_root_id = None
+        self._bundle_shards = []
+        self._bundle_manifest = []
 
         self.__CONTENT_PROPERTIES__ = self._directory_properties()
 
@@ -295,81 +1179,355 @@ class DriveUpload:
 
         self.__TOTAL_FILES = 0
         self.__TOTAL_FOLDERS = 0
-        self.__CURRENT_FILE_NAME = None
-        self.__UPLOADED_BYTES__ = 0
+        self.progress = TransferProgress('Uploading',
+                                         self.__CONTENT_PROPERTIES__['size'],
+                                         logger=self.gdrive.context.logger)
+        self.destination_progress = [
+            TransferProgress('Uploading', self.__CONTENT_PROPERTIES__['size'],
+                             logger=self.gdrive.context.logger)
+            for _ in self._targets
+        ] if len(self._targets) > 1 else [self.progress]
+        self.destination_failures = [[] for _ in self._targets]
 
         self.is_cancelled = False
 
+    def _counting(self):
+        """@return: context counting this transfer's API calls on the current thread"""
+        stack = ExitStack()
+        for drive in self._targets:
+            stack.enter_context(drive.count_into(self.api_calls))
+        return stack
+
+    def _bound(self, function):
+        """
+        @param function: callable which will run on a worker thread
+        @return: callable counting into this transfer's API calls
+        """
+        for drive in self._targets:
+            function = drive.bind_counters(function)
+        return function
+
     def on_upload_progress(self):
         """
 
         @return:
         """
-        progress = {
-            'filename': self.__CURRENT_FILE_NAME,
-            'status': 'Uploading',
-            'progress': f'{readable_size(self.__UPLOADED_BYTES__)}/{readable_size(self.__CONTENT_PROPERTIES__["size"])}',
-            "elapsed": readable_time(time.time() - self.__UPLOAD_STARTED_TIME),
-            'speed': f'{speed_convert(self.__UPLOADED_BYTES__ / (time.time() + 1 - self.__UPLOAD_STARTED_TIME))}'
-        }
-        return progress
+        return self.progress.snapshot()
+
+    def subscribe(self, callback, rate=1):
+        """
+        @param callback: called with the progress event
+        @param rate: Maximum number of events per second
+        @return: callback
+        """
+        return self.progress.subscribe(callback, rate)
 
-    def _upload_folder(self, input_directory, parent_id):
+    def on_destination_progress(self):
+        """
+        Progress of every destination, the first one is the main drive
+        @return: list of progress with drive_id and failed files
+        """
+        return [
+            dict(progress.snapshot(),
+                 drive_id=target.parent_id,
+                 failed=self.destination_failures[idx])
+            for idx, (target, progress) in enumerate(
+                zip(self._targets, self.destination_progress))
+        ]
+
+    def _target(self, target):
+        """
+        @param target: index of the destination, None for the main drive
+        @return: (:class GoogleDrive, :class TransferProgress) of the destination
+        """
+        if target is None:
+            return self.gdrive, self.progress
+        return self._targets[target], self.destination_progress[target]
+
+    def _create_folders(self, directory_name, parent_ids):
+        """
+        Create the folder on every destination which is still reachable
+        @param directory_name: name of the folder
+        @param parent_ids: parent folder ID per destination
+        @return: folder ID per destination, None where it failed
+        """
+        folder_ids = []
+        for idx, (target, parent_id) in enumerate(zip(self._targets, parent_ids)):
+            if parent_id is None:
+                folder_ids.append(None)
+                continue
+            try:
+                folder_ids.append(target.create_folder(directory_name, parent_id))
+            except (HttpError, RetryError) as err:
+                # create_folder retries HttpError and then raises RetryError
+                if len(self._targets) == 1:
+                    raise
+                self.gdrive.context.logger.error(
+                    f"Failed To Create Folder: {directory_name} On {target.parent_id} Reason: {err}")
+                self.destination_failures[idx].append(directory_name)
+                folder_ids.append(None)
+        return folder_ids
+
+    def _upload_folder(self, input_directory, parent_ids):
         """
 
         @param input_directory:
-        @param parent_id:
+        @param parent_ids: parent folder ID per destination
         @return:
         """
         list_dirs = os.listdir(input_directory)
         if len(list_dirs) == 0:
-            return parent_id
+            return parent_ids
         new_id = None
         for item in list_dirs:
             current_file = os.path.join(input_directory, item)
             if os.path.isdir(current_file):
                 self.__TOTAL_FOLDERS += 1
-                current_dir_id = self.gdrive.create_folder(item, parent_id)
-                new_id = self._upload_folder(current_file, current_dir_id)
+                current_dir_ids = self._create_folders(item, parent_ids)
+                new_id = self._upload_folder(current_file, current_dir_ids)
+
+            elif self._bundle_threshold is not None and (
+                    os.path.getsize(current_file) <= self._bundle_threshold):
+                self._bundle_file(current_file)
+                new_id = parent_ids
 
             else:
                 mime_type = fetch_mime_type(current_file)
                 file_name = os.path.basename(current_file)
-                self._upload_file(current_file, file_name, mime_type, parent_id)
-                new_id = parent_id
+                self._upload_file(current_file, file_name, mime_type, parent_ids)
+                new_id = parent_ids
 
             if self.is_cancelled:
                 raise DriveUploadError('Upload Cancelled!')
         return new_id
 
-    def _duplicate_file(self, file_md, media_body):
-        if self.gdrive.stop_duplicate and (
-                ext_file_id := self.gdrive.get_file_id(file_md['name'],
-                                                       file_md['mimeType'],
-                                                       file_md['parents'][0])):
-            drive_file = self.gdrive.service.files().update(fileId=ext_file_id,
-                                                            media_body=media_body
-                                                            )
+    @staticmethod
+    def _list_children(gdrive, parent_id) -> dict:
+        """
+        @param gdrive: destination :class GoogleDrive
+        @param parent_id: folder ID
+        @return: file ID by (name, mime type) of the folder children
+        """
+        children = {}
+        page_token = None
+        while True:
+            response = gdrive.thread_service().files().list(
+                supportsTeamDrives=True,
+                includeTeamDriveItems=True,
+                q=f"'{parent_id}' in parents and trashed=false",
+                spaces='drive',
+                fields='nextPageToken, files(id, name, mimeType)',
+                pageToken=page_token,
+                pageSize=1000).execute()
+            for item in response.get('files', []):
+                children.setdefault((item['name'], item['mimeType']), item['id'])
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return children
+
+    def _existing_file(self, gdrive, file_md):
+        """
+        Look up a file of the same name and mime type, the children of every
+        folder are listed once instead of one query per file
+        @param gdrive: destination :class GoogleDrive
+        @param file_md: body of the new file
+        @return: ID of the existing file, None if there is none
+        """
+        parent_id = file_md['parents'][0]
+        # the first thread lists the folder without the lock, others wait on it
+        with self._children_lock:
+            listing = self._children.get(parent_id)
+            if owner := listing is None:
+                listing = self._children[parent_id] = Future()
+        if owner:
+            try:
+                listing.set_result(self._list_children(gdrive, parent_id))
+            except BaseException as e:
+                listing.set_exception(e)
+                with self._children_lock:
+                    self._children.pop(parent_id, None)
+                raise
+        return listing.result().get((file_md['name'], file_md['mimeType']))
+
+    def _duplicate_file(self, file_md, media_body, gdrive=None):
+        gdrive = gdrive or self.gdrive
+        if gdrive.stop_duplicate and (
+                ext_file_id := self._existing_file(gdrive, file_md)):
+            drive_file = gdrive.service.files().update(fileId=ext_file_id,
+                                                       media_body=media_body
+                                                       )
         else:
-            drive_file = self.gdrive.service.files().create(supportsTeamDrives=True,
-                                                            body=file_md,
-                                                            media_body=media_body)
+            drive_file = gdrive.service.files().create(supportsTeamDrives=True,
+                                                       body=file_md,
+                                                       media_body=media_body,
+                                                       fields='id')
         return drive_file
 
     @retry(wait=wait_exponential(multiplier=2, min=3, max=6),
            stop=stop_after_attempt(5),
            retry=retry_if_exception_type(HttpError))
-    def _upload_file(self, file_path, file_name, mime_type, parent_id):
+    def _upload_file(self, file_path, file_name, mime_type, parent_ids):
         """
 
         @param file_path:
         @param file_name:
         @param mime_type:
-        @param parent_id:
+        @param parent_ids: parent folder ID per destination
         @return:
         """
+        if len(self._targets) > 1:
+            return self._upload_fanout(file_path, file_name, mime_type, parent_ids)
+        file_url = self._send_file(file_path, file_name, mime_type, parent_ids[0])
+        self.__TOTAL_FILES += 1
+        return file_url
+
+    def _send_file(self, file_path, file_name, mime_type, parent_id):
+        """
+        Upload a local file to the main drive, restarts itself after a
+        service account switch so the file is counted once by the caller
+        @param file_path:
+        @param file_name:
+        @param mime_type:
+        @param parent_id:
+        @return: url of the file
+        """
         file_size = os.path.getsize(file_path)
-        self.__CURRENT_FILE_NAME = file_name
+        with io.FileIO(file_path, 'rb') as fh:
+            if file_size <= self._simple_upload_threshold:
+                return self._upload_simple(fh, file_name, mime_type, parent_id,
+                                           file_size)
+            media_body = MediaIoBaseUpload(
+                fh,
+                mimetype=mime_type,
+                resumable=True,
+                chunksize=10 * 1024 * 1024
+            )
+            return self._upload_media(
+                media_body, file_name, mime_type, parent_id, file_size,
+                lambda: self._send_file(file_path, file_name, mime_type,
+                                        parent_id))
+
+    def _upload_fanout(self, file_path, file_name, mime_type, parent_ids):
+        """
+        Read the file once and send every chunk to all the destinations
+        concurrently, a failing destination doesn't stop the others
+        @param file_path:
+        @param file_name:
+        @param mime_type:
+        @param parent_ids: parent folder ID per destination
+        @return: url of the file on the first destination it reached
+        """
+        file_size = os.path.getsize(file_path)
+        live = [idx for idx, parent_id in enumerate(parent_ids) if parent_id]
+        if not live:
+            self.__FAILED_UPLOAD.append(file_name)
+            return None
+        urls = {}
+        self.progress.set_file(file_name)
+        with io.FileIO(file_path, 'rb') as fh:
+            source = FanoutReader(fh, len(live), self.progress.advance)
+            with ThreadPoolExecutor(max_workers=len(live)) as pool:
+                jobs = {
+                    pool.submit(self._bound(self._upload_destination), idx,
+                                source.reader(n),
+                                file_name, mime_type, parent_ids[idx],
+                                file_size): (n, idx)
+                    for n, idx in enumerate(live)
+                }
+                for job in as_completed(jobs):
+                    n, idx = jobs[job]
+                    try:
+                        urls[idx] = job.result()
+                    except (DriveError, DriveUploadError, HttpError,
+                            RetryError) as err:
+                        source.detach(n)
+                        self.destination_failures[idx].append(file_name)
+                        self.gdrive.context.logger.error(
+                            f"Failed To Upload FileName: {file_name} To "
+                            f"{self._targets[idx].parent_id} Reason: {err}")
+        if self.is_cancelled:
+            raise DriveUploadError("Drive Upload Cancelled")
+        if not urls:
+            self.__FAILED_UPLOAD.append(file_name)
+            return None
+        self.__TOTAL_FILES += 1
+        return urls[min(urls)]
+
+    def _upload_destination(self, target, reader, file_name, mime_type,
+                            parent_id, file_size):
+        """
+        Runs on the fan-out pool, uploads one file to one destination
+        @param target: index of the destination
+        @param reader: :class FanoutReader stream of the destination
+        @return: url of the file
+        """
+        media_body = StreamMediaUpload(reader, file_size, mime_type)
+        return self._upload_media(media_body, file_name, mime_type, parent_id,
+                                  file_size, target=target)
+
+    def _upload_simple(self, fh, file_name, mime_type, parent_id, file_size,
+                       track_progress=True):
+        """
+        Upload in a single multipart request, skips the resumable session setup
+        @param fh: seekable file object
+        @param file_name:
+        @param mime_type:
+        @param parent_id:
+        @param file_size:
+        @param track_progress: 'False' for bundle shards, already counted
+        @return:
+        """
+        self.progress.set_file(file_name)
+        self.gdrive.context.logger.info(f"Uploading FileName: {file_name}")
+        file_metadata = {
+            'name': file_name,
+            'description': 'Uploaded by ArtiFi',
+            'mimeType': mime_type,
+            "parents": [parent_id]
+        }
+        media_body = MediaIoBaseUpload(fh, mimetype=mime_type, resumable=False)
+        if self.is_cancelled:
+            raise DriveUploadError("Drive Upload Cancelled")
+        try:
+            drive_file = self._duplicate_file(file_metadata, media_body).execute()
+        except HttpError as err:
+            reason = err.error_details[0]["reason"]
+            if self.gdrive.use_sa and reason in [
+                'userRateLimitExceeded',
+                'dailyLimitExceeded',
+            ]:
+                self.gdrive.switch_service_account()
+                self.gdrive.context.logger.info(
+                    f"{reason}, Using Service Account And Trying Again...!")
+                fh.seek(0)
+                return self._upload_simple(fh, file_name, mime_type, parent_id,
+                                           file_size, track_progress)
+            self.__FAILED_UPLOAD.append(file_name)
+            self.is_cancelled = True
+            self.gdrive.context.logger.info(f"Got: {reason}")
+            raise DriveError(f"Something Went Wrong {err}")
+        if track_progress:
+            self.progress.advance(file_size)
+        return self._uploaded(drive_file['id'])
+
+    def _upload_media(self, media_body, file_name, mime_type, parent_id,
+                      file_size, restart=None, track_progress=True, target=None):
+        """
+
+        @param media_body: resumable media
+        @param file_name:
+        @param mime_type:
+        @param parent_id:
+        @param file_size:
+        @param restart: Callable to upload again from the start after switching
+                        service account, None if the media can't be re-read
+        @param track_progress: 'False' for bundle shards, already counted
+        @param target: index of the destination, None for the main drive
+        @return:
+        """
+        gdrive, progress = self._target(target)
+        progress.set_file(file_name)
         self.gdrive.context.logger.info(f"Uploading FileName: {file_name}")
         # File body description
         file_metadata = {
@@ -378,56 +1536,308 @@ class DriveUpload:
             'mimeType': mime_type,
             "parents": [parent_id]
         }
-        fh = io.FileIO(file_path, 'rb')
-        media_body = MediaIoBaseUpload(
-            fh,
-            mimetype=mime_type,
-            resumable=True,
-            chunksize=10 * 1024 * 1024
-        )
-        ul_file = self._duplicate_file(file_metadata, media_body)
+        ul_file = self._duplicate_file(file_metadata, media_body, gdrive)
+        uploaded = 0
 
         while True:
             if self.is_cancelled:
-                fh.close()
                 raise DriveUploadError("Drive Upload Cancelled")
             try:
                 cr_state, chunk_state = ul_file.next_chunk()
-                self.__UPLOADED_BYTES__ += (
-                    file_size if chunk_state
-                    else cr_state.total_size * cr_state.progress())
+                current = file_size if chunk_state else cr_state.resumable_progress
+                if track_progress:
+                    progress.advance(current - uploaded)
+                uploaded = current
                 if chunk_state:
                     file_id = chunk_state['id']
                     break
             except HttpError as err:
                 reason = err.error_details[0]["reason"]
 
-                if self.gdrive.use_sa and reason in [
+                if restart and gdrive.use_sa and reason in [
                     'userRateLimitExceeded',
                     'dailyLimitExceeded',
                 ]:
-                    self.gdrive.switch_service_account()
+                    gdrive.switch_service_account()
                     self.gdrive.context.logger.info(
                         f"{reason}, Using Service Account And Trying Again...!")
-                    return self._upload_file(file_path, file_name, mime_type,
-                                             parent_id)
+                    if track_progress:
+                        progress.advance(-uploaded)
+                    return restart()
                 else:
-                    self.__FAILED_UPLOAD.append(file_name)
-                    self.is_cancelled = True
                     self.gdrive.context.logger.info(f"Got: {reason}")
+                    if target is None:
+                        self.__FAILED_UPLOAD.append(file_name)
+                        self.is_cancelled = True
                     raise DriveError(f"Something Went Wrong {err}")
 
-        self.gdrive.set_permission(file_id)
-        # Define file instance and get url for download
-        file = self.gdrive.service.files().get(supportsTeamDrives=True,
-                                               fileId=file_id).execute()
-        file_url = self.gdrive.dl_file_prefix.format(file.get('id'))
-        self.__TOTAL_FILES += 1
-        return file_url
+        return self._uploaded(file_id, gdrive)
+
+    def _uploaded(self, file_id, gdrive=None):
+        """
+        @param file_id: ID of the uploaded file
+        @param gdrive: destination of the file, default is the main drive
+        @return: download url
+        """
+        gdrive = gdrive or self.gdrive
+        if self._defer_permissions:
+            with self._children_lock:
+                self._pending_permissions.append((gdrive, file_id))
+        else:
+            gdrive.set_permission(file_id)
+        return gdrive.dl_file_prefix.format(file_id)
+
+    def _share_pending(self):
+        """Share the uploaded files of every destination in batches"""
+        for target in self._targets:
+            # a destination with nothing pending sends no request
+            if file_ids := [file_id for gdrive, file_id in
+                            self._pending_permissions if gdrive is target]:
+                target.set_permissions(file_ids)
+        self._pending_permissions = []
+
+    def _bundle_file(self, file_path):
+        """
+        Pack a small file into the current tar shard
+        @param file_path: local file
+        """
+        if self._bundle is None:
+            self._bundle_buffer = io.BytesIO()
+            self._bundle = tarfile.open(fileobj=self._bundle_buffer, mode='w')
+        arcname = os.path.relpath(file_path, self._upload_path).replace(os.sep, '/')
+        file_size = os.path.getsize(file_path)
+        self.progress.set_file(arcname)
+        self._bundle.add(file_path, arcname=arcname, recursive=False)
+        self._bundle_manifest.append({
+            'path': arcname,
+            'size': file_size,
+            'shard': f"artifi-bundle-{len(self._bundle_shards) + 1:05d}.tar"
+        })
+        self.progress.advance(file_size)
+        if self._bundle_buffer.tell() >= self._bundle_size:
+            self._flush_bundle()
+
+    def _flush_bundle(self):
+        """Upload the current tar shard into the upload root folder"""
+        if self._bundle is None:
+            return
+        self._bundle.close()
+        shard_name = f"artifi-bundle-{len(self._bundle_shards) + 1:05d}.tar"
+        shard_size = self._bundle_buffer.tell()
+        self._bundle_buffer.seek(0)
+        if shard_size <= self._simple_upload_threshold:
+            self._upload_simple(self._bundle_buffer, shard_name, 'application/x-tar',
+                                self._bundle_root_id, shard_size,
+                                track_progress=False)
+        else:
+            media_body = MediaIoBaseUpload(self._bundle_buffer,
+                                           mimetype='application/x-tar',
+                                           resumable=True,
+                                           chunksize=10 * 1024 * 1024)
+            self._upload_media(media_body, shard_name, 'application/x-tar',
+                               self._bundle_root_id, shard_size,
+                               track_progress=False)
+        self._bundle_shards.append(shard_name)
+        self._bundle = None
+        self._bundle_buffer = None
+
+    def _upload_bundle_manifest(self):
+        """Upload the manifest mapping each bundled file to its shard"""
+        self._flush_bundle()
+        if not self._bundle_manifest:
+            return
+        data = json.dumps({'shards': self._bundle_shards,
+                           'files': self._bundle_manifest}, indent=2).encode('utf-8')
+        self._upload_simple(io.BytesIO(data), self.bundle_manifest_name,
+                            'application/json', self._bundle_root_id, len(data),
+                            track_progress=False)
+
+    def _plan_upload_file(self, plan, size):
+        """
+        @param plan: :class TransferPlan
+        @param size: file size
+        """
+        self._plan_upload_requests(plan, size)
+        plan.add_file(size)
+
+    def _plan_upload_requests(self, plan, size):
+        """
+        @param plan: :class TransferPlan
+        @param size: size of the uploaded body
+        """
+        for target in self._targets:
+            requests = Counter()
+            if not target.is_td:
+                requests['deferred_permission' if self._defer_permissions
+                         else 'permission'] += 1
+            if size <= self._simple_upload_threshold:
+                requests['simple_upload'] += 1
+            else:
+                requests['upload_session'] += 1
+                requests['upload_chunk'] += math.ceil(size / (10 * 1024 * 1024))
+            plan.requests.update(requests)
+
+    def _plan_folder(self, plan):
+        """@param plan: :class TransferPlan"""
+        for target in self._targets:
+            plan.requests.update(folder_lookup=1, folder_create=1,
+                                 permission=int(not target.is_td),
+                                 duplicate_check=int(target.stop_duplicate))
+        plan.add_folder()
+
+    def plan(self) -> dict:
+        """
+        Walk the source without uploading anything
+        @return: report of :meth TransferPlan.report
+        """
+        plan = TransferPlan('upload', self._archive_name() if self._extract_archive
+                            else os.path.basename(os.path.abspath(self._upload_path)),
+                            self.gdrive)
+        if self._extract_archive:
+            self._plan_folder(plan)
+            folders = {''}
+            for path, is_dir, size, _ in self._archive_members():
+                path = self._archive_path(path)
+                parts = path.split('/') if path else []
+                parents = parts if is_dir else parts[:-1]
+                for depth in range(1, len(parents) + 1):
+                    if (folder := '/'.join(parents[:depth])) not in folders:
+                        folders.add(folder)
+                        self._plan_folder(plan)
+                if not is_dir:
+                    self._plan_upload_file(plan, size)
+            return plan.report()
+        if os.path.isfile(self._upload_path):
+            for target in self._targets:
+                plan.requests.update(duplicate_check=int(target.stop_duplicate))
+            self._plan_upload_file(plan, os.path.getsize(self._upload_path))
+            return plan.report()
+        self._plan_folder(plan)
+        bundled = 0
+        for root, sub_folders, files in os.walk(self._upload_path):
+            for _ in sub_folders:
+                self._plan_folder(plan)
+            for filename in files:
+                size = os.path.getsize(os.path.join(root, filename))
+                if self._bundle_threshold is not None and (
+                        size <= self._bundle_threshold):
+                    plan.add_file(size)
+                    bundled += size
+                else:
+                    self._plan_upload_file(plan, size)
+        if bundled:
+            shards, rest = divmod(bundled, self._bundle_size)
+            for _ in range(shards):
+                self._plan_upload_requests(plan, self._bundle_size)
+            if rest:
+                self._plan_upload_requests(plan, rest)
+            # manifest
+            self._plan_upload_requests(plan, 0)
+        return plan.report()
+
+    def _archive_members(self):
+        """
+        Read the archive once, in order, without extracting it
+        @return: generator of (member path, is folder, size, readable stream)
+        """
+        source = self._upload_path
+        if isinstance(source, str) and zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        yield info.filename, True, 0, None
+                    else:
+                        with archive.open(info) as member:
+                            yield info.filename, False, info.file_size, member
+            return
+        with (tarfile.open(source, mode='r|*') if isinstance(source, str)
+              else tarfile.open(fileobj=source, mode='r|*')) as archive:
+            for info in archive:
+                if info.isdir():
+                    yield info.name, True, 0, None
+                elif info.isfile():
+                    yield info.name, False, info.size, archive.extractfile(info)
+
+    @staticmethod
+    def _archive_path(path):
+        """
+        Normalise an archive member path, './' prefixes of 'tar -C dir .'
+        and empty segments are dropped
+        @param path: member name inside the archive
+        @return: relative posix path, '' for the archive root
+        """
+        path = path.replace('\\', '/')
+        if '..' in path.split('/'):
+            raise DriveUploadError(f"Unsafe Path In Archive: {path}")
+        return '/'.join(part for part in posixpath.normpath(path).split('/')
+                        if part not in ('', '.'))
+
+    def _archive_folder(self, folders, member_dir):
+        """
+        Mirror the folder of an archive member on the drive
+        @param folders: cache of created folders, archive path -> drive ID
+        @param member_dir: folder of the member inside the archive
+        @return: drive folder ID
+        """
+        if member_dir in folders:
+            return folders[member_dir]
+        parent, _, name = member_dir.rpartition('/')
+        parent_id = self._archive_folder(folders, parent)
+        self.__TOTAL_FOLDERS += 1
+        folders[member_dir] = self.gdrive.create_folder(name, parent_id)
+        return folders[member_dir]
+
+    def _upload_archive(self, root_dir_id):
+        """
+        Upload every member of the archive into the mirrored folders
+        @param root_dir_id: drive folder ID of the archive root
+        @return:
+        """
+        folders = {'': root_dir_id}
+        for path, is_dir, size, member in self._archive_members():
+            if self.is_cancelled:
+                raise DriveUploadError('Upload Cancelled!')
+            path = self._archive_path(path)
+            if is_dir:
+                self._archive_folder(folders, path)
+                continue
+            member_dir, _, file_name = path.rpartition('/')
+            parent_id = self._archive_folder(folders, member_dir)
+            mime_type = fetch_mime_type(file_name)
+            if size <= self._simple_upload_threshold:
+                self._upload_simple(io.BytesIO(member.read()), file_name,
+                                    mime_type, parent_id, size)
+            else:
+                media_body = StreamMediaUpload(member, size, mime_type)
+                self._upload_media(media_body, file_name, mime_type, parent_id,
+                                   size)
+            self.__TOTAL_FILES += 1
+        return root_dir_id
+
+    def _archive_name(self):
+        """@return: name of the drive folder created for the archive"""
+        name = os.path.basename(str(getattr(self._upload_path, 'name',
+                                            self._upload_path)))
+        for extension in self.archive_extensions:
+            if name.lower().endswith(extension):
+                return name[:-len(extension)]
+        return os.path.splitext(name)[0]
 
     def _directory_properties(self):
         self.gdrive.context.logger.info("Counting Local Path:")
         output = {'size': 0, 'sub_folder': 0, 'files': 0}
+        if self._extract_archive:
+            if isinstance(self._upload_path, str) and zipfile.is_zipfile(
+                    self._upload_path):
+                with zipfile.ZipFile(self._upload_path) as archive:
+                    for info in archive.infolist():
+                        output['sub_folder' if info.is_dir() else 'files'] += 1
+                        output['size'] += info.file_size
+            elif isinstance(self._upload_path, str):
+                # Counting a compressed tar means reading it twice, the
+                # archive size is close enough for the progress
+                output['size'] = os.path.getsize(self._upload_path)
+            return output
 
         for root, sub_folders, files in os.walk(self._upload_path):
             output['sub_folder'] += len(sub_folders)
@@ -440,17 +1850,32 @@ class DriveUpload:
         return output
 
     def upload(self):
+        """
+        @return:
+        """
+        with self._counting():
+            return self._upload()
+
+    def _upload(self):
         """
         @return:
         """
         self.gdrive.context.logger.info(f"Uploading Media: {self._upload_path}")
 
         output = {}
-        if os.path.isfile(self._upload_path):
+        if self._extract_archive:
+            root_dir_name = self._archive_name()
+            root_dir_id = self.gdrive.create_folder(root_dir_name,
+                                                    self.gdrive.parent_id)
+            self._upload_archive(root_dir_id)
+            output['name'] = root_dir_name
+            output['type'] = "Folder"
+            output['link'] = f"https://drive.google.com/folderview?id={root_dir_id}"
+        elif os.path.isfile(self._upload_path):
             filename = os.path.basename(self._upload_path)
             mime_type = fetch_mime_type(self._upload_path)
             link = self._upload_file(self._upload_path, filename, mime_type,
-                                     self.gdrive.parent_id)
+                                     [target.parent_id for target in self._targets])
             if not link:
                 raise DriveError('Unable to Get File Link!')
             self.gdrive.context.logger.info(f"Uploaded To G-Drive: {self._upload_path}")
@@ -460,21 +1885,39 @@ class DriveUpload:
         else:
             root_dir_name = os.path.basename(
                 os.path.abspath(self._upload_path))
-            root_dir_id = self.gdrive.create_folder(root_dir_name,
-                                                    self.gdrive.parent_id)
+            root_dir_ids = self._create_folders(
+                root_dir_name, [target.parent_id for target in self._targets])
+            root_dir_id = root_dir_ids[0]
+            self._bundle_root_id = root_dir_id
 
-            result = self._upload_folder(self._upload_path, root_dir_id)
+            result = self._upload_folder(self._upload_path, root_dir_ids)
             if not result:
                 raise DriveUploadError('Upload has been manually cancelled!')
+            self._upload_bundle_manifest()
             link = f"https://drive.google.com/folderview?id={root_dir_id}"
+            output['mirrors'] = [
+                {'drive_id': target.parent_id,
+                 'link': f"https://drive.google.com/folderview?id={folder_id}"
+                 if folder_id else None,
+                 'failed': self.destination_failures[idx]}
+                for idx, (target, folder_id) in enumerate(
+                    zip(self._targets, root_dir_ids)) if idx
+            ]
             output['name'] = root_dir_name
             output['type'] = "Folder"
             output['link'] = link
         output['files'] = self.__TOTAL_FILES
         output['folders'] = self.__TOTAL_FOLDERS
+        output['bundled'] = len(self._bundle_manifest)
+        self._share_pending()
         output['size'] = readable_size(self.__CONTENT_PROPERTIES__['size'])
         output['elapsed'] = readable_time(time.time() - self.__UPLOAD_STARTED_TIME)
         output['failed'] = self.__FAILED_UPLOAD
+        output['api_calls'] = dict(self.api_calls)
+        self.progress.publish(force=True)
+        ThroughputHistory(self.gdrive.context).record(
+            'upload', self.progress.transferred_bytes,
+            time.time() - self.__UPLOAD_STARTED_TIME)
         return output
 
 
@@ -483,35 +1926,73 @@ class DriveDownload:
     Drive Download Functionality
     """
 
-    def __init__(self, gdrive, drive_link):
+    def __init__(self, gdrive, drive_link, item_filter=None, export_workers=4,
+                 export_cache=True, export_cache_size=1024 * 1024 * 1024):
         self.gdrive: GoogleDrive = gdrive
+        self.api_calls = Counter()
         self._drive_link = drive_link
+        self._filter: DriveFilter = item_filter or DriveFilter()
+        self._export_workers = export_workers
+        self._export_cache = os.path.join(self.gdrive.context.directory,
+                                          '.export_cache') if export_cache else None
+        self._export_cache_size = export_cache_size
+        self._export_jobs = []
+        self._export_pool = None
+        self._lock = threading.Lock()
         self.__DOWNLOADING = True
         self.__DOWNLOAD_START_TIME = time.time()
         self._properties = self.gdrive.Properties(
-            self._drive_link)
-        self.__CONTENT_PROPERTIES__ = self._properties.properties()
+            self._drive_link, self._filter)
+        # counted when the download starts, a plan walks the tree itself
+        self.__CONTENT_PROPERTIES__ = None
 
-        self.__DOWNLOADED_BYTES__ = 0
-        self.__CURRENT_FILE_NAME = None
         self.__TOTAL_FILES = 0
         self.__TOTAL_FOLDERS = 0
         self.__FAILED_DOWNLOAD = []
+        self.progress = TransferProgress('Downloading',
+                                         logger=self.gdrive.context.logger)
         self.is_cancelled = False
 
+    def _counting(self):
+        """@return: context counting this transfer's API calls on the current thread"""
+        stack = ExitStack()
+        for drive in (self.gdrive,):
+            stack.enter_context(drive.count_into(self.api_calls))
+        return stack
+
+    def _bound(self, function):
+        """
+        @param function: callable which will run on a worker thread
+        @return: callable counting into this transfer's API calls
+        """
+        for drive in (self.gdrive,):
+            function = drive.bind_counters(function)
+        return function
+
+    def _content_properties(self):
+        """
+        Count the source once, on the first transfer
+        @return: output of :meth DriveProperties.properties
+        """
+        if self.__CONTENT_PROPERTIES__ is None:
+            self.__CONTENT_PROPERTIES__ = self._properties.properties()
+            self.progress.total_bytes = self.__CONTENT_PROPERTIES__['size']
+        return self.__CONTENT_PROPERTIES__
+
     def on_download_progress(self):
         """
 
         @return:
         """
-        progress = {
-            'filename': self.__CURRENT_FILE_NAME,
-            'status': 'Downloading',
-            'progress': f'{readable_size(self.__DOWNLOADED_BYTES__)}/{readable_size(self.__CONTENT_PROPERTIES__["size"])}',
-            "elapsed": readable_time(time.time() - self.__DOWNLOAD_START_TIME),
-            'speed': f'{speed_convert(self.__DOWNLOADED_BYTES__ / (time.time() + 1 - self.__DOWNLOAD_START_TIME))}'
-        }
-        return progress
+        return self.progress.snapshot()
+
+    def subscribe(self, callback, rate=1):
+        """
+        @param callback: called with the progress event
+        @param rate: Maximum number of events per second
+        @return: callback
+        """
+        return self.progress.subscribe(callback, rate)
 
     def _download_folder(self, path, file):
         """
@@ -531,11 +2012,11 @@ class DriveDownload:
             files = self.gdrive.service.files().list(
                 supportsTeamDrives=True,
                 includeTeamDriveItems=True,
-                q=f"'{file['id']}' in parents",
-                fields='nextPageToken, files(id, name, mimeType, size, shortcutDetails)',
+                q=self._filter.query(file['id']),
+                fields='nextPageToken, files(id, name, mimeType, size, modifiedTime, shortcutDetails)',
                 pageToken=page_token,
                 pageSize=1000).execute()
-            result.extend(files['files'])
+            result.extend(self._filter.apply(files['files']))
             page_token = files.get("nextPageToken")
             if not page_token:
                 break
@@ -569,13 +2050,13 @@ class DriveDownload:
         new_file_name = sanitize_name(file['name'])
 
         if crm := export_mime.get(file['mimeType'], None):
-            request = self.gdrive.service.files().export(fileId=file['id'],
-                                                         mimeType=crm[0])
-            new_file_name += crm[1]
-        else:
-            request = self.gdrive.service.files().get_media(fileId=file['id'])
+            self._export_jobs.append(
+                self._export_pool.submit(self._bound(self._export_file), path,
+                                         file, crm))
+            return True
+        request = self.gdrive.service.files().get_media(fileId=file['id'])
 
-        self.__CURRENT_FILE_NAME = new_file_name
+        self.progress.set_file(new_file_name)
         file_path = os.path.join(path, new_file_name)
 
         if os.path.exists(file_path):
@@ -590,15 +2071,16 @@ class DriveDownload:
         fh = io.FileIO(file_path, 'wb')
         downloader = MediaIoBaseDownload(fh, request,
                                          chunksize=10 * 1024 * 1024)
+        downloaded = 0
         while True:
             if self.is_cancelled:
                 fh.close()
                 raise DriveDownloadError("Upload Cancelled By User...!")
             try:
                 cr_state, chunk_status = downloader.next_chunk()
-                self.__DOWNLOADED_BYTES__ += (
-                    cr_state.total_size if chunk_status
-                    else cr_state.total_size * cr_state.progress())
+                self.gdrive.count_call('drive.files.get_media.chunk')
+                self.progress.advance(cr_state.resumable_progress - downloaded)
+                downloaded = cr_state.resumable_progress
                 if chunk_status:
                     break
             except HttpError as err:
@@ -622,9 +2104,159 @@ class DriveDownload:
                         f"Failed To Download FileName: {new_file_name} Reason: {reason}"
                     )
                     raise DriveError(f'Something Went Wrong,{err}')
-        self.__TOTAL_FILES += 1
+        with self._lock:
+            self.__TOTAL_FILES += 1
+        return True
+
+    def _export_cache_path(self, file, export_type):
+        """
+        @param file: drive file resource
+        @param export_type: target mime type
+        @return: cache path keyed by (fileId, target mime) and suffixed with
+                 the modifiedTime, None if the file can't be cached
+        """
+        if not (self._export_cache and file.get('modifiedTime')):
+            return None
+        key = hashlib.sha1(f"{file['id']}:{export_type}".encode('utf-8')).hexdigest()
+        version = hashlib.sha1(file['modifiedTime'].encode('utf-8')).hexdigest()
+        return os.path.join(self._export_cache, f"{key}.{version[:12]}")
+
+    def _evict_exports(self, cache_path):
+        """
+        Remove older versions of the export just cached, then the least
+        recently used exports while the cache is over export_cache_size
+        @param cache_path: export which is kept
+        """
+        key = os.path.basename(cache_path).split('.')[0]
+        with self._lock:
+            entries = []
+            for name in os.listdir(self._export_cache):
+                path = os.path.join(self._export_cache, name)
+                if name.endswith('.part') or path == cache_path:
+                    continue
+                try:
+                    if name.split('.')[0] == key:
+                        os.remove(path)
+                        continue
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = os.path.getsize(cache_path) + sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self._export_cache_size:
+                    break
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+                total -= size
+
+    @retry(wait=wait_exponential(multiplier=2, min=3, max=6),
+           stop=stop_after_attempt(5),
+           retry=retry_if_exception_type(HttpError))
+    def _export_file(self, path, file, crm):
+        """
+        Runs on the export pool, Google Docs can't be downloaded, only exported
+        @param path: local folder
+        @param file: drive file resource
+        @param crm: (target mime type, extension) from :data export_mime
+        @return:
+        """
+        new_file_name = sanitize_name(file['name']) + crm[1]
+        file_path = os.path.join(path, new_file_name)
+        if self.is_cancelled:
+            raise DriveDownloadError("Download Cancelled By User...!")
+        if os.path.exists(file_path):
+            self.gdrive.context.logger.info(
+                f"FileName Already Exists: {new_file_name}"
+            )
+            return False
+
+        cache_path = self._export_cache_path(file, crm[0])
+        if cache_path and os.path.exists(cache_path):
+            self.gdrive.context.logger.info(
+                f"Using Cached Export: {new_file_name}"
+            )
+            # the modification time orders the cache by last use
+            with suppress(FileNotFoundError):
+                os.utime(cache_path)
+        else:
+            self.progress.set_file(new_file_name)
+            self.gdrive.context.logger.info(
+                f"Exporting FileName: {new_file_name}"
+            )
+            target = f"{cache_path or file_path}.{uuid.uuid4().hex[:8]}.part"
+            if cache_path:
+                os.makedirs(self._export_cache, exist_ok=True)
+            request = self.gdrive.thread_service().files().export(
+                fileId=file['id'], mimeType=crm[0])
+            try:
+                with io.FileIO(target, 'wb') as fh:
+                    downloader = MediaIoBaseDownload(fh, request,
+                                                     chunksize=10 * 1024 * 1024)
+                    done = False
+                    while not done:
+                        if self.is_cancelled:
+                            raise DriveDownloadError("Download Cancelled By User...!")
+                        _, done = downloader.next_chunk()
+                        self.gdrive.count_call('drive.files.export.chunk')
+            except HttpError as err:
+                os.remove(target)
+                reason = err.error_details[0]["reason"]
+                if reason in ['notFound', 'exportSizeLimitExceeded']:
+                    self.gdrive.context.logger.error(
+                        f"Failed To Export FileName: {new_file_name} Reason: {reason}"
+                    )
+                    with self._lock:
+                        self.__FAILED_DOWNLOAD.append(file['id'])
+                    return False
+                raise
+            except DriveDownloadError:
+                os.remove(target)
+                raise
+            os.replace(target, cache_path or file_path)
+            if cache_path:
+                self._evict_exports(cache_path)
+
+        if cache_path:
+            # a copy, so editing the download can't change the cached export
+            shutil.copyfile(cache_path, file_path)
+        self.progress.advance(os.path.getsize(file_path))
+        with self._lock:
+            self.__TOTAL_FILES += 1
         return True
 
+    def plan(self) -> dict:
+        """
+        Walk the source without downloading anything
+        @return: report of :meth TransferPlan.report
+        """
+        file = self.gdrive.get_metadata(self.gdrive.get_id_by_url(self._drive_link))
+        plan = TransferPlan('download', file.get('name'), self.gdrive)
+        plan.requests.update(get=1)
+        if file.get('mimeType') != self.gdrive.drive_folder_mime:
+            self._plan_file(plan, file)
+            return plan.report()
+        for _, children in self._properties.walk(file['id']):
+            plan.add_folder(list=max(1, math.ceil(len(children) / 1000)))
+            for item in children:
+                if item.get('mimeType') != self.gdrive.drive_folder_mime:
+                    self._plan_file(plan, item)
+        return plan.report()
+
+    def _plan_file(self, plan, file):
+        """
+        @param plan: :class TransferPlan
+        @param file: drive file resource
+        """
+        if crm := export_mime.get(file['mimeType']):
+            cache_path = self._export_cache_path(file, crm[0])
+            plan.add_file(0, export=int(not (cache_path and os.path.exists(
+                cache_path))))
+        else:
+            size = int(file.get('size', 0))
+            plan.add_file(size, download_chunk=max(
+                1, math.ceil(size / (10 * 1024 * 1024))))
+
     def download(self, unique=True):
         """
         @return:
@@ -633,7 +2265,16 @@ class DriveDownload:
                          Set 'False' to name local folder name as drive folder name,
                          Not Recommended, Use it only to perform Sync
         """
-        file_id = self.__CONTENT_PROPERTIES__['file_id']
+        with self._counting():
+            return self._download(unique)
+
+    def _download(self, unique):
+        """
+        @param unique: see :meth download
+        @return:
+        """
+        properties = self._content_properties()
+        file_id = properties['file_id']
 
         path = os.path.join(self.gdrive.context.directory,
                             str(uuid.uuid4()).lower()[:5]) if unique else (
@@ -644,18 +2285,32 @@ class DriveDownload:
         output = {}
         file = self.gdrive.get_metadata(file_id)
         output['name'] = file.get('name')
-        output['path'] = os.path.join(path, self.__CONTENT_PROPERTIES__['filename'])
-        if file.get("mimeType") == self.gdrive.drive_folder_mime:
-            output['type'] = "Folder"
-            self._download_folder(path, file)
-        else:
-            output['type'] = "File"
-            self._download_file(path, file)
+        output['path'] = os.path.join(path, properties['filename'])
+        self._export_pool = ThreadPoolExecutor(max_workers=self._export_workers)
+        try:
+            if file.get("mimeType") == self.gdrive.drive_folder_mime:
+                output['type'] = "Folder"
+                self._download_folder(path, file)
+            else:
+                output['type'] = "File"
+                self._download_file(path, file)
+            for job in self._export_jobs:
+                job.result()
+        except BaseException:
+            self.is_cancelled = True
+            raise
+        finally:
+            self._export_pool.shutdown(wait=True)
         output['files'] = self.__TOTAL_FILES
         output['folders'] = self.__TOTAL_FOLDERS
-        output['size'] = readable_size(self.__CONTENT_PROPERTIES__['size'])
+        output['size'] = readable_size(properties['size'])
         output['elapsed'] = readable_time(time.time() - self.__DOWNLOAD_START_TIME)
         output['failed'] = self.__FAILED_DOWNLOAD
+        output['api_calls'] = dict(self.api_calls)
+        self.progress.publish(force=True)
+        ThroughputHistory(self.gdrive.context).record(
+            'download', self.progress.transferred_bytes,
+            time.time() - self.__DOWNLOAD_START_TIME)
         return output
 
 
@@ -664,9 +2319,12 @@ class DriveProperties:
        Drive Download Functionality
     """
 
-    def __init__(self, gdrive, drive_link):
+    def __init__(self, gdrive, drive_link, item_filter=None, index=None):
         self.gdrive: GoogleDrive = gdrive
         self._drive_link = drive_link
+        self._filter: DriveFilter = item_filter or DriveFilter()
+        # rollups hold unfiltered totals
+        self._index = index if item_filter is None else None
         self.__TOTAL_BYTES = 0
         self.__TOTAL_FILES = 0
         self.__TOTAL_FOLDERS = 0
@@ -751,7 +2409,12 @@ class DriveProperties:
         name = drive_file['name']
         self.gdrive.context.logger.info(f"Counting: {name}")
         if drive_file['mimeType'] == self.gdrive.drive_folder_mime:
-            self._get_folder_size(**drive_file)
+            if self._index and (rollup := self._index.folder_size(file_id)):
+                self.__TOTAL_BYTES = rollup['bytes']
+                self.__TOTAL_FILES = rollup['files']
+                self.__TOTAL_FOLDERS = rollup['folders']
+            else:
+                self._get_folder_size(**drive_file)
             msg['filename'] = name
             msg['file_id'] = file_id
             msg['size'] = self.__TOTAL_BYTES
@@ -778,7 +2441,7 @@ class DriveProperties:
         @return:
         """
         page_token = None
-        q = f"'{folder_id}' in parents"
+        q = self._filter.query(folder_id)
         files = []
         while True:
             response = self.gdrive.service.files().list(supportsTeamDrives=True,
@@ -786,16 +2449,28 @@ class DriveProperties:
                                                         q=q,
                                                         spaces='drive',
                                                         pageSize=200,
-                                                        fields='nextPageToken, files(id, name, mimeType,size)',
+                                                        fields='nextPageToken, files(id, name, mimeType, size, modifiedTime, shortcutDetails)',
                                                         corpora='allDrives',
                                                         orderBy='folder, name',
                                                         pageToken=page_token).execute()
-            files.extend(response.get('files', []))
+            files.extend(self._filter.apply(response.get('files', [])))
             page_token = response.get('nextPageToken', None)
             if page_token is None:
                 break
         return files
 
+    def walk(self, folder_id):
+        """
+        Walk the folder tree top-down
+        @param folder_id: drive folder ID
+        @return: generator of (folder_id, filtered children)
+        """
+        children = self.list(folder_id)
+        yield folder_id, children
+        for item in children:
+            if item.get('mimeType') == self.gdrive.drive_folder_mime:
+                yield from self.walk(item['id'])
+
     @retry(wait=wait_exponential(multiplier=2, min=3, max=6),
            stop=stop_after_attempt(5),
            retry=retry_if_exception_type(HttpError))
@@ -814,7 +2489,7 @@ class DriveProperties:
         except HttpError as err:
             reason = err.error_details[0]["reason"]
             self.gdrive.context.logger.error(f"Failed To Delete: {reason}")
-            DriveError(f"Something Went Wrong: {err}")
+            raise DriveError(f"Something Went Wrong: {err}")
         return msg
 
 
@@ -823,43 +2498,78 @@ class DriveCloner:
     Copy Functionality
     """
 
-    def __init__(self, gdrive, drive_link):
+    stream_copy_reasons = ['insufficientFilePermissions', 'notFound',
+                           'cannotCopyFile', 'forbidden',
+                           'appNotAuthorizedToFile', 'insufficientPermissions']
+
+    def __init__(self, gdrive, drive_link, item_filter=None, source=None,
+                 defer_permissions=False):
         self.gdrive: GoogleDrive = gdrive
+        self.source: GoogleDrive = source or gdrive
+        self.api_calls = Counter()
+        self._defer_permissions = defer_permissions
+        self._pending_permissions = []
         self._drive_link = drive_link
-        self._properties = self.gdrive.Properties(
-            self._drive_link)
-        self.__CONTENT_PROPERTIES__ = self._properties.properties()
+        self._properties = self.source.Properties(
+            self._drive_link, item_filter)
+        # counted when the clone starts, a plan walks the tree itself
+        self.__CONTENT_PROPERTIES__ = None
         self.__CLONE_STARTED_TIME = time.time()
 
         self.__FAILED_CLONE = []
 
-        self.__TRANSFERRED_BYTES = 0
-
         self.__TOTAL_FILES = 0
         self.__TOTAL_FOLDERS = 0
-        self.__CURRENT_FILE_NAME = None
+        self.progress = TransferProgress('Cloning',
+                                         logger=self.gdrive.context.logger)
 
         self.is_cancelled = False
 
+    def _counting(self):
+        """@return: context counting this transfer's API calls on the current thread"""
+        stack = ExitStack()
+        for drive in {self.gdrive, self.source}:
+            stack.enter_context(drive.count_into(self.api_calls))
+        return stack
+
+    def _bound(self, function):
+        """
+        @param function: callable which will run on a worker thread
+        @return: callable counting into this transfer's API calls
+        """
+        for drive in {self.gdrive, self.source}:
+            function = drive.bind_counters(function)
+        return function
+
+    def _content_properties(self):
+        """
+        Count the source once, on the first transfer
+        @return: output of :meth DriveProperties.properties
+        """
+        if self.__CONTENT_PROPERTIES__ is None:
+            self.__CONTENT_PROPERTIES__ = self._properties.properties()
+            self.progress.total_bytes = self.__CONTENT_PROPERTIES__['size']
+        return self.__CONTENT_PROPERTIES__
+
     def on_clone_progress(self):
         """
 
         @return:
         """
-        progress = {
-            'filename': self.__CURRENT_FILE_NAME,
-            'status': 'Downloading',
-            'progress': f'{readable_size(self.__TRANSFERRED_BYTES)}/{readable_size(self.__CONTENT_PROPERTIES__["size"])}',
-            "elapsed": readable_time(time.time() - self.__CLONE_STARTED_TIME),
-            'speed': f'{speed_convert(self.__TRANSFERRED_BYTES / (time.time() + 1 - self.__CLONE_STARTED_TIME))}'
-        }
-        return progress
+        return self.progress.snapshot()
+
+    def subscribe(self, callback, rate=1):
+        """
+        @param callback: called with the progress event
+        @param rate: Maximum number of events per second
+        @return: callback
+        """
+        return self.progress.subscribe(callback, rate)
 
     @retry(wait=wait_exponential(multiplier=2, min=3, max=6),
            stop=stop_after_attempt(5),
            retry=retry_if_exception_type(HttpError))
     def _copy_file(self, file, dest_id):
-        print("===>", file)
         """
 
         @param file:
@@ -874,11 +2584,13 @@ class DriveCloner:
             "parents": [dest_id]
         }
         self.gdrive.context.logger.info(f"Cloning FileName:{file['name']}")
+        self.progress.set_file(file['name'])
         try:
             drive_file = self.gdrive.service.files().copy(supportsAllDrives=True,
                                                           fileId=file.get('id'),
-                                                          body=file_metadata).execute()
-            self.__TRANSFERRED_BYTES += int(file.get('size', 0))
+                                                          body=file_metadata,
+                                                          fields='id').execute()
+            self.progress.advance(int(file.get('size', 0)))
         except HttpError as err:
             reason = err.error_details[0]["reason"]
 
@@ -890,20 +2602,80 @@ class DriveCloner:
                 self.gdrive.context.logger.info(
                     f"{reason}, Using Service Account And Trying Again...!")
                 return self._copy_file(file, dest_id)
+            elif reason in self.stream_copy_reasons:
+                self.gdrive.context.logger.info(
+                    f"{reason}, Copying FileName: {file['name']} By Streaming...!")
+                drive_file = self._stream_copy(file, file_metadata)
             else:
                 self.__FAILED_CLONE.append(file['id'])
                 self.is_cancelled = True
                 self.gdrive.context.logger.info(f"Got: {reason}")
                 raise DriveError(f"Something Went Wrong {err}")
 
-        self.gdrive.set_permission(drive_file['id'])
-        # Define file instance and get url for download
-        file = self.gdrive.service.files().get(supportsTeamDrives=True,
-                                               fileId=drive_file['id']).execute()
-        file_url = self.gdrive.dl_file_prefix.format(file.get('id'))
+        if self._defer_permissions:
+            self._pending_permissions.append(drive_file['id'])
+        else:
+            self.gdrive.set_permission(drive_file['id'])
+        file_url = self.gdrive.dl_file_prefix.format(drive_file['id'])
         self.__TOTAL_FILES += 1
         return file_url
 
+    def _stream_copy(self, file, file_metadata):
+        """
+        Download with the source credentials and upload with the destination
+        credentials at the same time, used when the destination can't read
+        the source so files().copy is not possible
+        @param file: source drive file resource
+        @param file_metadata: body of the destination file
+        @return: destination drive file resource
+        """
+        if crm := export_mime.get(file['mimeType']):
+            request = self.source.thread_service().files().export(
+                fileId=file['id'], mimeType=crm[0])
+            media_type, size = crm[0], None
+        else:
+            request = self.source.thread_service().files().get_media(
+                fileId=file['id'], supportsAllDrives=True)
+            media_type, size = file['mimeType'], int(file.get('size', 0))
+        pipe = ChunkPipe()
+
+        def download():
+            try:
+                downloader = MediaIoBaseDownload(pipe, request,
+                                                 chunksize=10 * 1024 * 1024)
+                done = False
+                while not done:
+                    _, done = downloader.next_chunk()
+                    self.source.count_call('drive.files.get_media.chunk')
+                pipe.close()
+            except BaseException as e:
+                pipe.close(e)
+
+        download_thread = threading.Thread(target=self._bound(download), daemon=True)
+        download_thread.start()
+        media_body = StreamMediaUpload(pipe, size, media_type)
+        ul_file = self.gdrive.service.files().create(supportsAllDrives=True,
+                                                     body=file_metadata,
+                                                     media_body=media_body,
+                                                     fields='id')
+        uploaded = 0
+        try:
+            while True:
+                if self.is_cancelled:
+                    raise DriveCloneError("Cloning Was Cancelled By User!")
+                cr_state, drive_file = ul_file.next_chunk()
+                if drive_file:
+                    self.progress.advance((size or uploaded) - uploaded)
+                    return drive_file
+                self.progress.advance(cr_state.resumable_progress - uploaded)
+                uploaded = cr_state.resumable_progress
+        except BaseException:
+            self.progress.advance(-uploaded)
+            raise
+        finally:
+            pipe.cancel()
+            download_thread.join()
+
     def _clone_folder(self, local_path, file_id, parent_id):
         """
 
@@ -928,20 +2700,51 @@ class DriveCloner:
 
         return True
 
+    def plan(self) -> dict:
+        """
+        Walk the source without copying anything
+        @return: report of :meth TransferPlan.report
+        """
+        file = self.source.get_metadata(self.source.get_id_by_url(self._drive_link))
+        plan = TransferPlan('clone', file.get('name'), self.gdrive)
+        plan.requests.update(get=1)
+        permission = int(not self.gdrive.is_td)
+        file_permission = {'deferred_permission' if self._defer_permissions
+                           else 'permission': permission}
+        if file.get('mimeType') != self.gdrive.drive_folder_mime:
+            plan.add_file(int(file.get('size', 0)), copy=1, **file_permission)
+            return plan.report()
+        for _, children in self._properties.walk(file['id']):
+            plan.add_folder(list=max(1, math.ceil(len(children) / 200)),
+                            folder_lookup=1, folder_create=1,
+                            permission=permission)
+            for item in children:
+                if item.get('mimeType') != self.gdrive.drive_folder_mime:
+                    plan.add_file(int(item.get('size', 0)), copy=1,
+                                  **file_permission)
+        return plan.report()
+
     def clone(self):
         """
         @return:
         """
-        file_id = self.__CONTENT_PROPERTIES__['file_id']
+        with self._counting():
+            return self._clone()
+
+    def _clone(self):
+        """
+        @return:
+        """
+        file_id = self._content_properties()['file_id']
         msg = {}
-        file = self.gdrive.get_metadata(file_id)
+        file = self.source.get_metadata(file_id)
         if file.get("mimeType") == self.gdrive.drive_folder_mime:
             self.gdrive.context.logger.info(f"Cloning: {file.get('name')}")
             dir_id = self.gdrive.create_folder(file.get('name'), self.gdrive.parent_id)
             self._clone_folder(file.get('name'), file.get('id'), dir_id)
             msg['link'] = self.gdrive.dl_folder_prefix.format(dir_id)
             msg['filename'] = file.get("name")
-            msg['size'] = readable_size(self.__TRANSFERRED_BYTES)
+            msg['size'] = readable_size(self.progress.transferred_bytes)
             msg['type'] = "Folder"
             msg['sub_folders'] = self.__TOTAL_FOLDERS
             msg['files'] = self.__TOTAL_FILES
@@ -951,6 +2754,14 @@ class DriveCloner:
             msg['filename'] = file.get("name")
             msg['link'] = durl
             msg['type'] = 'File'
-            msg['size'] = readable_size(self.__TRANSFERRED_BYTES)
+            msg['size'] = readable_size(self.progress.transferred_bytes)
         msg['failed'] = self.__FAILED_CLONE
+        if self._pending_permissions:
+            self.gdrive.set_permissions(self._pending_permissions)
+            self._pending_permissions = []
+        msg['api_calls'] = dict(self.api_calls)
+        self.progress.publish(force=True)
+        ThroughputHistory(self.gdrive.context).record(
+            'clone', self.progress.transferred_bytes,
+            time.time() - self.__CLONE_STARTED_TIME)
         return msg
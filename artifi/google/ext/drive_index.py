@@ -0,0 +1,454 @@
+"""Google Drive Local Search Index"""
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from artifi.google.ext.drive import GoogleDrive
+from artifi.utils import readable_size
+
+
+class DriveIndex:
+    """
+    SQLite index of drive listings with full text search on names and paths,
+    kept in its own file since FTS5 is specific to SQLite
+    example_usage: index = DriveIndex(gdrive)
+                   index.build(folder_id)
+                   index.search('report 2023')
+                   index.duplicates()
+                   index.folder_size(folder_id)
+    Note: register :meth apply_changes on :class DriveWatcher to keep it fresh
+    """
+
+    item_fields = 'id, name, mimeType, size, md5Checksum, modifiedTime, parents, trashed'
+
+    def __init__(self, gdrive, index_path=None):
+        """
+        @param gdrive: pass :class GoogleDrive
+        @param index_path: sqlite file, default is Downloads/.drive_index.sqlite
+        """
+        self.gdrive: GoogleDrive = gdrive
+        self.index_path = index_path or os.path.join(self.gdrive.context.directory,
+                                                     '.drive_index.sqlite')
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the tables, the FTS table mirrors items through triggers"""
+        with self._lock, self._db:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS roots (id TEXT PRIMARY KEY);
+                CREATE TABLE IF NOT EXISTS items (
+                    id TEXT PRIMARY KEY,
+                    parent_id TEXT,
+                    name TEXT NOT NULL,
+                    mime_type TEXT,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    md5 TEXT,
+                    modified_time TEXT,
+                    path TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS items_parent ON items (parent_id);
+                CREATE INDEX IF NOT EXISTS items_md5 ON items (md5, size);
+                CREATE TABLE IF NOT EXISTS rollups (
+                    folder_id TEXT PRIMARY KEY,
+                    bytes INTEGER NOT NULL DEFAULT 0,
+                    files INTEGER NOT NULL DEFAULT 0,
+                    folders INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                    name, path, content='items', content_rowid='rowid');
+                CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+                    INSERT INTO items_fts (rowid, name, path)
+                    VALUES (new.rowid, new.name, new.path);
+                END;
+                CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+                    INSERT INTO items_fts (items_fts, rowid, name, path)
+                    VALUES ('delete', old.rowid, old.name, old.path);
+                END;
+                CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+                    INSERT INTO items_fts (items_fts, rowid, name, path)
+                    VALUES ('delete', old.rowid, old.name, old.path);
+                    INSERT INTO items_fts (rowid, name, path)
+                    VALUES (new.rowid, new.name, new.path);
+                END;
+            ''')
+
+    def _list_children(self, folder_id) -> list:
+        """
+        Runs on the crawl pool
+        @param folder_id: drive folder ID
+        @return: children of the folder
+        """
+        service = self.gdrive.thread_service()
+        items = []
+        page_token = None
+        while True:
+            response = service.files().list(
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                q=f"'{folder_id}' in parents and trashed=false",
+                fields=f'nextPageToken, files({self.item_fields})',
+                pageToken=page_token,
+                pageSize=1000).execute()
+            items.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return items
+
+    @staticmethod
+    def _row(item, parent_id, path) -> tuple:
+        """
+        @param item: drive file resource
+        @param parent_id: indexed parent folder ID
+        @param path: path of the item inside the indexed root
+        @return: items table row
+        """
+        return (item['id'], parent_id, item['name'], item['mimeType'],
+                int(item.get('size', 0)), item.get('md5Checksum'),
+                item.get('modifiedTime'), path)
+
+    def _upsert(self, rows):
+        """@param rows: items table rows"""
+        self._db.executemany('''
+            INSERT INTO items (id, parent_id, name, mime_type, size, md5,
+                               modified_time, path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                parent_id = excluded.parent_id, name = excluded.name,
+                mime_type = excluded.mime_type, size = excluded.size,
+                md5 = excluded.md5, modified_time = excluded.modified_time,
+                path = excluded.path
+        ''', rows)
+
+    def _subtree(self, item_id) -> List[str]:
+        """
+        @param item_id: indexed item ID
+        @return: IDs of the item and every descendant
+        """
+        return [row['id'] for row in self._db.execute('''
+            WITH RECURSIVE tree (id) AS (
+                SELECT ? UNION ALL
+                SELECT items.id FROM items JOIN tree ON items.parent_id = tree.id
+            ) SELECT id FROM tree
+        ''', (item_id,))]
+
+    def _contribution(self, item_id) -> Optional[tuple]:
+        """
+        @param item_id: indexed item ID
+        @return: (parent_id, bytes, files, folders) the item adds to its
+                 ancestors, None if it's not indexed
+        """
+        row = self._db.execute('''
+            SELECT items.parent_id, items.mime_type, items.size,
+                   rollups.bytes, rollups.files, rollups.folders
+            FROM items LEFT JOIN rollups ON rollups.folder_id = items.id
+            WHERE items.id = ?
+        ''', (item_id,)).fetchone()
+        if not row:
+            return None
+        if row['mime_type'] == self.gdrive.drive_folder_mime:
+            return (row['parent_id'], row['bytes'] or 0, row['files'] or 0,
+                    (row['folders'] or 0) + 1)
+        return row['parent_id'], row['size'], 1, 0
+
+    def _bump(self, parent_id, nbytes, files, folders):
+        """
+        Add a delta to the rollup of the folder and all of its ancestors
+        @param parent_id: indexed folder ID
+        @param nbytes: bytes delta
+        @param files: files delta
+        @param folders: folders delta
+        """
+        if parent_id is None or not (nbytes or files or folders):
+            return
+        self._db.execute('''
+            WITH RECURSIVE chain (id) AS (
+                SELECT ? UNION ALL
+                SELECT items.parent_id FROM items JOIN chain ON items.id = chain.id
+                WHERE items.parent_id IS NOT NULL
+            )
+            UPDATE rollups SET bytes = bytes + ?, files = files + ?,
+                               folders = folders + ?
+            WHERE folder_id IN (SELECT id FROM chain)
+        ''', (parent_id, nbytes, files, folders))
+
+    def _delete(self, item_id):
+        """@param item_id: indexed item ID, removed with its descendants"""
+        if contribution := self._contribution(item_id):
+            parent_id, nbytes, files, folders = contribution
+            self._bump(parent_id, -nbytes, -files, -folders)
+        subtree = [(child_id,) for child_id in self._subtree(item_id)]
+        self._db.executemany('DELETE FROM items WHERE id = ?', subtree)
+        self._db.executemany('DELETE FROM rollups WHERE folder_id = ?', subtree)
+
+    def _rebuild_rollups(self, root_id):
+        """
+        Compute the rollups of a freshly crawled tree bottom-up
+        @param root_id: indexed root folder ID
+        """
+        rows = self._db.execute('''
+            WITH RECURSIVE tree (id, depth) AS (
+                SELECT ?, 0 UNION ALL
+                SELECT items.id, tree.depth + 1
+                FROM items JOIN tree ON items.parent_id = tree.id
+            )
+            SELECT items.id, items.parent_id, items.mime_type, items.size
+            FROM tree JOIN items ON items.id = tree.id
+            ORDER BY tree.depth DESC
+        ''', (root_id,)).fetchall()
+        totals = {row['id']: [0, 0, 0] for row in rows
+                  if row['mime_type'] == self.gdrive.drive_folder_mime}
+        for row in rows:
+            if row['id'] == root_id or row['parent_id'] not in totals:
+                continue
+            parent = totals[row['parent_id']]
+            if child := totals.get(row['id']):
+                parent[0] += child[0]
+                parent[1] += child[1]
+                parent[2] += child[2] + 1
+            else:
+                parent[0] += row['size']
+                parent[1] += 1
+        self._db.executemany('''
+            INSERT OR REPLACE INTO rollups (folder_id, bytes, files, folders)
+            VALUES (?, ?, ?, ?)
+        ''', [(folder_id, *total) for folder_id, total in totals.items()])
+
+    def build(self, folder_id, workers=8) -> int:
+        """
+        Crawl the folder level by level and index every descendant
+        @param folder_id: drive folder or shared drive ID
+        @param workers: Number of concurrent folder listings
+        @return: number of indexed items
+        """
+        root = self.gdrive.service.files().get(
+            fileId=folder_id, supportsAllDrives=True,
+            fields=self.item_fields).execute()
+        with self._lock, self._db:
+            self._delete(root['id'])
+            self._db.execute('INSERT OR IGNORE INTO roots (id) VALUES (?)',
+                             (root['id'],))
+            self._upsert([self._row(root, None, root['name'])])
+        total = 1
+        frontier = {root['id']: root['name']}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while frontier:
+                next_frontier = {}
+                for parent_id, children in zip(
+                        frontier, pool.map(self._list_children, frontier)):
+                    rows = []
+                    for item in children:
+                        path = f"{frontier[parent_id]}/{item['name']}"
+                        rows.append(self._row(item, parent_id, path))
+                        if item['mimeType'] == self.gdrive.drive_folder_mime:
+                            next_frontier[item['id']] = path
+                    with self._lock, self._db:
+                        self._upsert(rows)
+                    total += len(rows)
+                frontier = next_frontier
+        with self._lock, self._db:
+            self._rebuild_rollups(root['id'])
+        self.gdrive.context.logger.info(
+            f"Indexed {total} Items Of: {root['name']}")
+        return total
+
+    @staticmethod
+    def _match_query(text) -> str:
+        """
+        @param text: free text
+        @return: FTS5 query matching every word as a prefix
+        """
+        words = re.findall(r'\w+', text)
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search(self, text, limit=50, mime_type=None) -> List[dict]:
+        """
+        @param text: words of the name or path
+        @param limit: maximum number of results
+        @param mime_type: Optional mime type filter
+        @return: matching items, best match first
+        """
+        if not (query := self._match_query(text)):
+            return []
+        sql = '''
+            SELECT items.* FROM items_fts
+            JOIN items ON items.rowid = items_fts.rowid
+            WHERE items_fts MATCH ?
+        '''
+        params = [query]
+        if mime_type:
+            sql += ' AND items.mime_type = ?'
+            params.append(mime_type)
+        sql += ' ORDER BY bm25(items_fts, 10.0, 1.0) LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def get(self, item_id) -> Optional[dict]:
+        """
+        @param item_id: drive file ID
+        @return: indexed item, None if it's not indexed
+        """
+        with self._lock:
+            row = self._db.execute('SELECT * FROM items WHERE id = ?',
+                                   (item_id,)).fetchone()
+        return dict(row) if row else None
+
+    def duplicates(self, min_size=1, limit=None) -> dict:
+        """
+        Files sharing the same md5Checksum and size
+        @param min_size: ignore files smaller than this
+        @param limit: maximum number of groups, largest waste first
+        @return: duplicate groups and the space they waste
+        """
+        sql = '''
+            SELECT md5, size, COUNT(*) AS copies,
+                   GROUP_CONCAT(id, char(31)) AS ids,
+                   GROUP_CONCAT(path, char(31)) AS paths
+            FROM items WHERE md5 IS NOT NULL AND size >= ?
+            GROUP BY md5, size HAVING COUNT(*) > 1
+            ORDER BY size * (COUNT(*) - 1) DESC
+        '''
+        params = [min_size]
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        groups = [{
+            'md5': row['md5'],
+            'size': row['size'],
+            'copies': row['copies'],
+            'wasted_bytes': row['size'] * (row['copies'] - 1),
+            'files': [{'id': file_id, 'path': path} for file_id, path in zip(
+                row['ids'].split('\x1f'), row['paths'].split('\x1f'))],
+        } for row in rows]
+        wasted = sum(group['wasted_bytes'] for group in groups)
+        return {
+            'groups': groups,
+            'wasted_bytes': wasted,
+            'wasted': readable_size(wasted),
+        }
+
+    def _move_subtree(self, folder_id, path):
+        """
+        Rewrite the paths below a renamed or moved folder
+        @param folder_id: indexed folder ID
+        @param path: new path of the folder
+        """
+        self._db.execute('''
+            WITH RECURSIVE tree (id, path) AS (
+                SELECT ?, ? UNION ALL
+                SELECT items.id, tree.path || '/' || items.name
+                FROM items JOIN tree ON items.parent_id = tree.id
+            )
+            UPDATE items SET path = (SELECT tree.path FROM tree
+                                     WHERE tree.id = items.id)
+            WHERE id IN (SELECT id FROM tree) AND id != ?
+        ''', (folder_id, path, folder_id))
+
+    def apply_changes(self, changes):
+        """
+        Listener of :class DriveWatcher, applies added, changed, moved and
+        removed items under the indexed roots
+        @param changes: drive changes resources
+        """
+        with self._lock, self._db:
+            for change in changes:
+                file = change.get('file') or {}
+                file_id = change.get('fileId') or file.get('id')
+                if not file_id:
+                    continue
+                if change.get('removed') or file.get('trashed'):
+                    self._delete(file_id)
+                    continue
+                is_root = self._db.execute('SELECT 1 FROM roots WHERE id = ?',
+                                           (file_id,)).fetchone()
+                parent = None
+                for parent_id in file.get('parents', []):
+                    if parent := self._db.execute(
+                            'SELECT id, path FROM items WHERE id = ?',
+                            (parent_id,)).fetchone():
+                        break
+                if is_root:
+                    path, parent_id = file['name'], None
+                elif parent:
+                    path, parent_id = f"{parent['path']}/{file['name']}", parent['id']
+                else:
+                    # moved out of every indexed root
+                    self._delete(file_id)
+                    continue
+                old = self._db.execute('SELECT path FROM items WHERE id = ?',
+                                       (file_id,)).fetchone()
+                if contribution := self._contribution(file_id):
+                    old_parent_id, nbytes, files, folders = contribution
+                    self._bump(old_parent_id, -nbytes, -files, -folders)
+                self._upsert([self._row(file, parent_id, path)])
+                if file['mimeType'] == self.gdrive.drive_folder_mime:
+                    self._db.execute('INSERT OR IGNORE INTO rollups (folder_id) '
+                                     'VALUES (?)', (file_id,))
+                _, nbytes, files, folders = self._contribution(file_id)
+                self._bump(parent_id, nbytes, files, folders)
+                if old and old['path'] != path and (
+                        file['mimeType'] == self.gdrive.drive_folder_mime):
+                    self._move_subtree(file_id, path)
+
+    def folder_size(self, folder_id) -> Optional[dict]:
+        """
+        @param folder_id: indexed folder ID
+        @return: bytes, files and sub folders below the folder, None if the
+                 folder is not indexed
+        """
+        with self._lock:
+            row = self._db.execute('''
+                SELECT items.name, rollups.* FROM rollups
+                JOIN items ON items.id = rollups.folder_id
+                WHERE rollups.folder_id = ?
+            ''', (folder_id,)).fetchone()
+        if not row:
+            return None
+        return {
+            'folder_id': folder_id,
+            'name': row['name'],
+            'bytes': row['bytes'],
+            'size': readable_size(row['bytes']),
+            'files': row['files'],
+            'folders': row['folders'],
+        }
+
+    def largest_folders(self, folder_id, limit=10, direct=False) -> List[dict]:
+        """
+        @param folder_id: indexed folder ID
+        @param limit: number of folders
+        @param direct: 'True' to rank only the direct sub folders
+        @return: largest sub folders, biggest first
+        """
+        with self._lock:
+            rows = self._db.execute(f'''
+                WITH RECURSIVE tree (id, depth) AS (
+                    SELECT ?, 0 UNION ALL
+                    SELECT items.id, tree.depth + 1
+                    FROM items JOIN tree ON items.parent_id = tree.id
+                    {'WHERE tree.depth < 1' if direct else ''}
+                )
+                SELECT items.id, items.name, items.path, rollups.bytes,
+                       rollups.files, rollups.folders
+                FROM tree
+                JOIN rollups ON rollups.folder_id = tree.id
+                JOIN items ON items.id = tree.id
+                WHERE tree.depth > 0
+                ORDER BY rollups.bytes DESC LIMIT ?
+            ''', (folder_id, limit)).fetchall()
+        return [dict(row, size=readable_size(row['bytes'])) for row in rows]
+
+    def close(self):
+        """Close the index database"""
+        with self._lock:
+            self._db.close()
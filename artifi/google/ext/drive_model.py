@@ -0,0 +1,42 @@
+"""Google Drive watch state DB Model"""
+from sqlalchemy import INTEGER, TIMESTAMP, VARCHAR, Column
+
+from artifi import Artifi
+
+
+class DriveChangeTokenModel(Artifi.dbmodel):
+    """Changes feed page token of a drive"""
+
+    def __init__(self, context):
+        self.context: Artifi = context
+
+    __tablename__ = "drive_change_token"
+    drive_token_pid = Column(INTEGER(), autoincrement=True, primary_key=True)
+    # 'root' for My Drive, shared drive ID otherwise
+    drive_token_drive_id = Column(VARCHAR())
+    drive_token_page_token = Column(VARCHAR())
+
+    # logs
+    drive_token_created_at = Column(TIMESTAMP())
+    drive_token_updated_at = Column(TIMESTAMP())
+
+
+class DriveChannelModel(Artifi.dbmodel):
+    """Push notification channel registered on the changes feed"""
+
+    def __init__(self, context):
+        self.context: Artifi = context
+
+    __tablename__ = "drive_channel"
+    drive_channel_pid = Column(INTEGER(), autoincrement=True, primary_key=True)
+    drive_channel_id = Column(VARCHAR())
+    drive_channel_resource_id = Column(VARCHAR())
+    drive_channel_token = Column(VARCHAR())
+    drive_channel_drive_id = Column(VARCHAR())
+    # webhook address, each watcher renews only its own channels
+    drive_channel_address = Column(VARCHAR())
+    drive_channel_expiration = Column(TIMESTAMP())
+
+    # logs
+    drive_channel_created_at = Column(TIMESTAMP())
+    drive_channel_updated_at = Column(TIMESTAMP())
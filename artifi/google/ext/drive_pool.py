@@ -0,0 +1,315 @@
+"""Google Drive Process Pool"""
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from artifi import Artifi
+from artifi.google.ext.drive import GoogleDrive
+
+_TRANSFER_KINDS = {
+    'upload': ('Upload', 'upload'),
+    'download': ('Download', 'download'),
+    'clone': ('Clone', 'clone'),
+}
+
+
+# context and drives of the worker process, built once and reused by its jobs
+_worker_contexts: Dict[Tuple[str, str], Artifi] = {}
+_worker_drives: Dict[tuple, GoogleDrive] = {}
+
+
+class _DriveRef:
+    """Picklable stand-in of a :class GoogleDrive passed as a transfer option"""
+
+    def __init__(self, drive: dict):
+        """@param drive: constructor options of the drive"""
+        self.drive = drive
+
+
+def _worker_drive(options, drive) -> GoogleDrive:
+    """
+    @param options: output of :meth DriveProcessPool._drive_options
+    @param drive: constructor options of the drive
+    @return: drive of this worker process, built on first use
+    """
+    context_key = (options['import_name'], options['config_path'])
+    if context_key not in _worker_contexts:
+        _worker_contexts[context_key] = Artifi(*context_key)
+    drive_key = context_key + tuple(sorted(drive.items()))
+    if drive_key not in _worker_drives:
+        _worker_drives[drive_key] = GoogleDrive(_worker_contexts[context_key],
+                                                **drive)
+    return _worker_drives[drive_key]
+
+
+def _unpack(options, value):
+    """
+    @param options: output of :meth DriveProcessPool._drive_options
+    @param value: transfer option sent by the parent
+    @return: value with every :class _DriveRef replaced by its drive
+    """
+    if isinstance(value, _DriveRef):
+        return _worker_drive(options, value.drive)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unpack(options, item) for item in value)
+    return value
+
+
+def _run_transfer(options, kind, source, transfer_options, kwargs, job_id,
+                  progress_queue, cancel_event, interval):
+    """
+    Executed inside the worker process, the context and the drive service
+    can't be pickled so they are rebuilt once per worker and reused
+    @param options: output of :meth DriveProcessPool._drive_options
+    @param kind: upload, download or clone
+    @param source: local path for upload, drive link for download and clone
+    @param transfer_options: passed to the Upload, Download or Clone factory
+    @param kwargs: passed to the transfer method
+    @param job_id: job unique ID
+    @param progress_queue: manager queue shared with the parent
+    @param cancel_event: manager event set by the parent to cancel the job
+    @param interval: minimum interval between relayed progress events
+    @return: output of the transfer
+    """
+    factory_name, run_name = _TRANSFER_KINDS[kind]
+    gdrive = _worker_drive(options, options['drive'])
+    transfer = getattr(gdrive, factory_name)(
+        source, **{key: _unpack(options, value)
+                   for key, value in transfer_options.items()})
+    transfer.subscribe(lambda event: progress_queue.put((job_id, event)),
+                       rate=1 / interval)
+    stop_watch = threading.Event()
+
+    def watch_cancel():
+        while not stop_watch.wait(interval):
+            if cancel_event.is_set():
+                transfer.is_cancelled = True
+                break
+
+    watch_thread = threading.Thread(target=watch_cancel, daemon=True)
+    watch_thread.start()
+    try:
+        return getattr(transfer, run_name)(**kwargs)
+    finally:
+        stop_watch.set()
+        watch_thread.join()
+        progress_queue.put((job_id, transfer.progress.snapshot()))
+
+
+class DriveJob:
+    """Handle of a transfer running inside :class DriveProcessPool"""
+
+    def __init__(self, job_id, kind, source, cancel_event):
+        """
+        @param job_id: job unique ID
+        @param kind: upload, download or clone
+        @param source: local path or drive link
+        @param cancel_event: manager event shared with the worker
+        """
+        self.job_id: str = job_id
+        self.kind: str = kind
+        self.source: str = source
+        self.created_at: float = time.time()
+        self._cancel_event = cancel_event
+        self._progress: dict = {}
+        self._subscribers: List[Callable] = []
+        self._future: Optional[Future] = None
+
+    def on_progress(self) -> dict:
+        """
+        Latest progress relayed by the worker process
+        @return: same format of on_*_progress of the transfer
+        """
+        return self._progress
+
+    def subscribe(self, callback):
+        """
+        @param callback: called on the pool relay thread with every progress
+                         event of the job
+        @return: callback
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def _dispatch(self, progress, logger):
+        """
+        @param progress: event relayed by the worker
+        @param logger: used to report failing subscribers
+        """
+        self._progress = progress
+        for callback in list(self._subscribers):
+            try:
+                callback(progress)
+            except Exception as e:
+                logger.error(f"Job Subscriber Failed: {e}")
+
+    def cancel(self):
+        """Ask the worker process to cancel the transfer"""
+        self._cancel_event.set()
+
+    def done(self) -> bool:
+        """@return: 'True' if the transfer is finished"""
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """
+        Wait for the transfer to finish
+        @param timeout: seconds to wait
+        @return: output of upload, download or clone
+        """
+        return self._future.result(timeout)
+
+
+class DriveProcessPool:
+    """
+    Run DriveUpload, DriveDownload and DriveCloner jobs in worker processes,
+    progress and cancellation are relayed over IPC
+    example_usage: pool = DriveProcessPool(gdrive, max_workers=4)
+                   job = pool.upload('/path/to/folder')
+                   job.on_progress()
+    Note: workers are spawned, so the caller must be guarded by
+          if __name__ == '__main__'
+    Note: transfer options are pickled to the worker, :class DriveFilter and
+          plain values are sent as they are, :class GoogleDrive (source,
+          mirrors) is rebuilt on the worker from its constructor options,
+          anything else such as a lambda or an open file can't be sent
+    """
+
+    def __init__(self, gdrive, max_workers=None, interval=1,
+                 mp_context='spawn'):
+        """
+        @param gdrive: pass :class GoogleDrive, used as template for workers
+        @param max_workers: Number of processes, default is the CPU count
+        @param interval: Minimum interval between relayed progress events
+        @param mp_context: multiprocessing start method
+        """
+        self.gdrive: GoogleDrive = gdrive
+        self.interval = interval
+        self._mp_context = multiprocessing.get_context(mp_context)
+        self._manager = self._mp_context.Manager()
+        self._progress_queue = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=self._mp_context)
+        self._jobs: Dict[str, DriveJob] = {}
+        self._relay_thread = threading.Thread(target=self._relay_progress,
+                                              daemon=True)
+        self._relay_thread.start()
+
+    @staticmethod
+    def _drive_kwargs(gdrive) -> dict:
+        """
+        @param gdrive: pass :class GoogleDrive
+        @return: picklable constructor options of the drive
+        """
+        return {
+            'scope': gdrive.scope,
+            'drive_id': gdrive.parent_id,
+            'use_sa': gdrive.use_sa,
+            'is_td': gdrive.is_td,
+            'stop_duplicate': gdrive.stop_duplicate,
+        }
+
+    def _drive_options(self) -> dict:
+        """@return: picklable options to rebuild the drive on workers"""
+        return {
+            'import_name': self.gdrive.context.import_name,
+            'config_path': self.gdrive.context._env_path,
+            'drive': self._drive_kwargs(self.gdrive),
+        }
+
+    def _pack(self, value):
+        """
+        @param value: transfer option
+        @return: value with every :class GoogleDrive replaced by a reference
+                 rebuilt on the worker
+        """
+        if isinstance(value, GoogleDrive):
+            return _DriveRef(self._drive_kwargs(value))
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._pack(item) for item in value)
+        return value
+
+    def _relay_progress(self):
+        """Drain the progress queue and update the job handles"""
+        while True:
+            message = self._progress_queue.get()
+            if message is None:
+                break
+            job_id, progress = message
+            if job := self._jobs.get(job_id):
+                job._dispatch(progress, self.gdrive.context.logger)
+
+    def _submit(self, kind, source, options, **kwargs) -> DriveJob:
+        """
+        @param kind: upload, download or clone
+        @param source: local path or drive link
+        @param options: passed to the Upload, Download or Clone factory
+        @param kwargs: passed to the transfer method
+        @return: :class DriveJob
+        """
+        job_id = str(uuid.uuid4())
+        job = DriveJob(job_id, kind, source, self._manager.Event())
+        self._jobs[job_id] = job
+        job._future = self._executor.submit(_run_transfer,
+                                            self._drive_options(),
+                                            kind,
+                                            source,
+                                            {key: self._pack(value)
+                                             for key, value in options.items()},
+                                            kwargs,
+                                            job_id,
+                                            self._progress_queue,
+                                            job._cancel_event,
+                                            self.interval)
+        self.gdrive.context.logger.info(
+            f"Queued {kind.title()} Job: {job_id} Source: {source}")
+        return job
+
+    def upload(self, directory_path, **options) -> DriveJob:
+        """
+        @param directory_path: local file or folder to upload
+        @param options: see :meth GoogleDrive.Upload, e.g. extract_archive,
+                        bundle_threshold, mirrors or defer_permissions
+        @return: :class DriveJob
+        """
+        return self._submit('upload', directory_path, options)
+
+    def download(self, drive_link, unique=True, **options) -> DriveJob:
+        """
+        @param drive_link: drive file or folder link
+        @param unique: see :meth DriveDownload.download
+        @param options: see :meth GoogleDrive.Download, e.g. item_filter,
+                        export_workers or export_cache
+        @return: :class DriveJob
+        """
+        return self._submit('download', drive_link, options, unique=unique)
+
+    def clone(self, drive_link, **options) -> DriveJob:
+        """
+        @param drive_link: drive file or folder link
+        @param options: see :meth GoogleDrive.Clone, e.g. item_filter, source
+                        or defer_permissions
+        @return: :class DriveJob
+        """
+        return self._submit('clone', drive_link, options)
+
+    @property
+    def jobs(self) -> Dict[str, DriveJob]:
+        """@return: all the submitted jobs"""
+        return self._jobs
+
+    def shutdown(self, wait=True, cancel=False):
+        """
+        @param wait: 'True' to wait for running jobs
+        @param cancel: 'True' to cancel every running job before shutting down
+        """
+        if cancel:
+            for job in self._jobs.values():
+                job.cancel()
+        self._executor.shutdown(wait=wait)
+        self._progress_queue.put(None)
+        self._relay_thread.join()
+        self._manager.shutdown()
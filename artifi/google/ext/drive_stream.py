@@ -0,0 +1,461 @@
+"""Google Drive Streaming Over Artifi.fsapi"""
+import hmac
+import os
+import posixpath
+import shutil
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, Tuple
+from urllib.parse import quote
+
+from cachetools import TTLCache
+from flask import Response, jsonify, request
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload
+
+from artifi.google.ext.drive import GoogleDrive, export_mime
+from artifi.utils import sanitize_name
+
+
+class _ZipSink:
+    """
+    Write only sink for zipfile, since it can't seek zipfile writes the
+    sizes and CRC in data descriptors after each member, so nothing has to be
+    buffered beyond the chunk currently downloaded
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        """@param data: bytes written by zipfile"""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        """Nothing to flush, data leaves through :meth drain"""
+
+    def drain(self) -> bytes:
+        """@return: bytes written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class DriveChunkCache:
+    """
+    On disk LRU cache of fixed size chunks of drive files, concurrent readers
+    of a missing chunk wait on the same upstream fetch
+    """
+
+    def __init__(self, directory, chunk_size=8 * 1024 * 1024,
+                 max_bytes=2 * 1024 ** 3):
+        """
+        @param directory: cache folder
+        @param chunk_size: size of every cached chunk, except the last one
+        @param max_bytes: size cap, least recently used chunks are evicted
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], Future] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Rebuild the LRU order from the chunks left by the previous run"""
+        found = []
+        for key in os.listdir(self.directory):
+            key_dir = os.path.join(self.directory, key)
+            if not os.path.isdir(key_dir):
+                continue
+            for name in os.listdir(key_dir):
+                if not name.endswith('.chunk'):
+                    continue
+                stat = os.stat(os.path.join(key_dir, name))
+                found.append((stat.st_atime, (key, int(name[:-6])), stat.st_size))
+        for _, entry, size in sorted(found):
+            self._entries[entry] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _path(self, key, index) -> str:
+        """
+        @param key: file key, ID and version of the drive file
+        @param index: chunk index
+        @return: chunk path
+        """
+        return os.path.join(self.directory, key, f"{index}.chunk")
+
+    def _evict(self):
+        """Drop least recently used chunks until the cache fits, lock held"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            (key, index), size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key, index))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key, index, fetch) -> bytes:
+        """
+        @param key: file key, ID and version of the drive file
+        @param index: chunk index
+        @param fetch: callable returning the chunk bytes from upstream
+        @return: chunk bytes
+        """
+        entry = (key, index)
+        with self._lock:
+            cached = entry in self._entries
+            if cached:
+                self._entries.move_to_end(entry)
+            future = self._inflight.get(entry)
+            owner = future is None and not cached
+            if owner:
+                future = self._inflight[entry] = Future()
+        if cached:
+            try:
+                with open(self._path(key, index), 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                with self._lock:
+                    self._total_bytes -= self._entries.pop(entry, 0)
+                return self.get(key, index, fetch)
+        if not owner:
+            return future.result()
+        try:
+            data = fetch()
+            path = self._path(key, index)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.part", 'wb') as f:
+                f.write(data)
+            os.replace(f"{path}.part", path)
+            with self._lock:
+                self._entries[entry] = len(data)
+                self._total_bytes += len(data)
+                self._evict()
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(entry, None)
+
+    def invalidate(self, *file_ids):
+        """
+        Drop every cached version of the drive files
+        @param file_ids: drive file IDs
+        """
+        file_ids = set(file_ids)
+        with self._lock:
+            for key, index in [entry for entry in self._entries
+                               if entry[0].split('.', 1)[0] in file_ids]:
+                self._total_bytes -= self._entries.pop((key, index))
+            for key in os.listdir(self.directory):
+                if key.split('.', 1)[0] in file_ids:
+                    shutil.rmtree(os.path.join(self.directory, key),
+                                  ignore_errors=True)
+
+
+class DriveStreamServer:
+    """
+    Serve drive content over Artifi.fsapi without touching the local disk
+    example_usage: DriveStreamServer(gdrive)
+                   GET /drive/archive/<folder_id>
+                   GET /drive/stream/<file_id>
+    Note: requests must carry API_SECRET_KEY as 'X-Api-Key' header or 'key'
+          query param when it is configured
+    """
+
+    # retries of a failed archive chunk, 5xx and 429 are retried with backoff
+    chunk_retries = 5
+
+    def __init__(self, gdrive, url_prefix='/drive', chunk_size=4 * 1024 * 1024,
+                 cache_size=2 * 1024 ** 3, cache_chunk_size=8 * 1024 * 1024):
+        """
+        @param gdrive: pass :class GoogleDrive
+        @param url_prefix: prefix of the registered routes
+        @param chunk_size: download chunk size, bounds the memory per request
+        @param cache_size: size cap of the stream chunk cache in bytes
+        @param cache_chunk_size: size of the cached stream chunks
+        """
+        self.gdrive: GoogleDrive = gdrive
+        self.chunk_size = chunk_size
+        self.cache = DriveChunkCache(
+            os.path.join(self.gdrive.context.directory, '.drive_cache'),
+            chunk_size=cache_chunk_size,
+            max_bytes=cache_size)
+        self._metadata: TTLCache = TTLCache(maxsize=1024, ttl=60)
+        self._metadata_lock = threading.Lock()
+        self._secret = self.gdrive.context.API_SECRET_KEY
+        if not self._secret:
+            self.gdrive.context.logger.warning(
+                "API_SECRET_KEY Is Not Set, Drive Routes Are Open To Everyone...!")
+        self.gdrive.context.fsapi.add_url_rule(
+            f"{url_prefix}/archive/<file_id>",
+            "drive_archive",
+            self._archive_route,
+            methods=["GET"],
+        )
+        self.gdrive.context.fsapi.add_url_rule(
+            f"{url_prefix}/stream/<file_id>",
+            "drive_stream",
+            self._stream_route,
+            methods=["GET", "HEAD"],
+        )
+
+    def _authorized(self) -> bool:
+        """@return: 'True' if the request carries the API secret"""
+        if not self._secret:
+            return True
+        key = request.headers.get('X-Api-Key') or request.args.get('key')
+        # compared as bytes, a non ASCII str makes compare_digest raise
+        return bool(key) and hmac.compare_digest(key.encode('utf-8'),
+                                                 self._secret.encode('utf-8'))
+
+    def _list_children(self, service, folder_id) -> list:
+        """
+        @param service: drive service of the current thread
+        @param folder_id: ID of the folder
+        @return: children of the folder
+        """
+        page_token = None
+        files = []
+        while True:
+            response = service.files().list(
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                q=f"'{folder_id}' in parents and trashed = false",
+                fields='nextPageToken, files(id, name, mimeType, size, modifiedTime, shortcutDetails)',
+                orderBy='folder, name',
+                pageSize=1000,
+                pageToken=page_token).execute()
+            files.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return files
+
+    def _walk(self, service, folder_id, prefix):
+        """
+        @param service: drive service of the current thread
+        @param folder_id: ID of the folder to be archived
+        @param prefix: path of the folder inside the archive
+        @return: generator of (archive path, drive file resource)
+        """
+        used_names = set()
+        for item in self._list_children(service, folder_id):
+            if shortcut := item.get('shortcutDetails'):
+                item = dict(item, id=shortcut['targetId'],
+                            mimeType=shortcut['targetMimeType'])
+            name = sanitize_name(item['name'])
+            if crm := export_mime.get(item['mimeType']):
+                name += crm[1]
+            stem, ext = posixpath.splitext(name)
+            count = 1
+            while name in used_names:
+                name = f"{stem} ({count}){ext}"
+                count += 1
+            used_names.add(name)
+            path = posixpath.join(prefix, name)
+            if item['mimeType'] == self.gdrive.drive_folder_mime:
+                yield f"{path}/", item
+                yield from self._walk(service, item['id'], path)
+            else:
+                yield path, item
+
+    @staticmethod
+    def _zip_info(path, item) -> zipfile.ZipInfo:
+        """
+        @param path: path inside the archive
+        @param item: drive file resource
+        @return: stored member info
+        """
+        date_time = (1980, 1, 1, 0, 0, 0)
+        if modified := item.get('modifiedTime'):
+            stamp = datetime.fromisoformat(modified.replace('Z', '+00:00'))
+            date_time = max(stamp.timetuple()[:6], date_time)
+        zinfo = zipfile.ZipInfo(path, date_time=date_time)
+        zinfo.compress_type = zipfile.ZIP_STORED
+        zinfo.external_attr = (0o40755 << 16 | 0x10) if path.endswith('/') else (
+                0o644 << 16)
+        return zinfo
+
+    def zip_stream(self, folder):
+        """
+        Archive a drive folder as it downloads
+        @param folder: drive folder resource with id and name
+        @return: generator of zip bytes
+        """
+        service = self.gdrive.thread_service()
+        sink = _ZipSink()
+        root = sanitize_name(folder['name'])
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED,
+                             allowZip64=True) as archive:
+            for path, item in self._walk(service, folder['id'], root):
+                zinfo = self._zip_info(path, item)
+                if zinfo.is_dir():
+                    archive.writestr(zinfo, b'')
+                    yield sink.drain()
+                    continue
+                if crm := export_mime.get(item['mimeType']):
+                    media = service.files().export(fileId=item['id'],
+                                                   mimeType=crm[0])
+                else:
+                    media = service.files().get_media(fileId=item['id'],
+                                                      supportsAllDrives=True)
+                force_zip64 = int(item.get('size', 0)) >= zipfile.ZIP64_LIMIT
+                with archive.open(zinfo, 'w', force_zip64=force_zip64) as entry:
+                    downloader = MediaIoBaseDownload(entry, media,
+                                                     chunksize=self.chunk_size)
+                    done = False
+                    while not done:
+                        try:
+                            _, done = downloader.next_chunk(
+                                num_retries=self.chunk_retries)
+                        except HttpError as err:
+                            # abort before the central directory is written,
+                            # the client sees a failed download instead of a
+                            # valid zip with a truncated member
+                            self.gdrive.context.logger.error(
+                                f"Failed To Archive FileName: {path} Reason: {err}")
+                            raise
+                        yield sink.drain()
+                yield sink.drain()
+        yield sink.drain()
+
+    def _archive_route(self, file_id):
+        """
+        Stream a ZIP of the drive folder
+        @param file_id: drive folder ID
+        @return: flask response
+        """
+        if not self._authorized():
+            return jsonify("Unauthorized"), 403
+        try:
+            folder = self.gdrive.thread_service().files().get(
+                fileId=file_id,
+                fields="id, name, mimeType",
+                supportsAllDrives=True).execute()
+        except HttpError as err:
+            return jsonify(f"Unable To Get Folder: {err.reason}"), err.status_code
+        if folder['mimeType'] != self.gdrive.drive_folder_mime:
+            return jsonify("Only Folders Can Be Archived"), 400
+        self.gdrive.context.logger.info(f"Streaming Archive: {folder['name']}")
+        filename = quote(f"{folder['name']}.zip")
+        return Response(
+            self.zip_stream(folder),
+            mimetype='application/zip',
+            headers={
+                'Content-Disposition': f"attachment; filename*=UTF-8''{filename}"
+            },
+        )
+
+    def apply_changes(self, changes):
+        """
+        Listener of :class DriveWatcher, drops the stale metadata and chunks
+        @param changes: drive changes resources
+        """
+        file_ids = {change['fileId'] for change in changes if change.get('fileId')}
+        with self._metadata_lock:
+            for file_id in file_ids:
+                self._metadata.pop(file_id, None)
+        self.cache.invalidate(*file_ids)
+
+    def _file_metadata(self, file_id) -> dict:
+        """
+        Metadata is cached briefly so player seeks don't pay for it
+        @param file_id: drive file ID
+        @return: drive file resource
+        """
+        with self._metadata_lock:
+            if metadata := self._metadata.get(file_id):
+                return metadata
+        metadata = self.gdrive.thread_service().files().get(
+            fileId=file_id,
+            fields="id, name, mimeType, size, md5Checksum, modifiedTime",
+            supportsAllDrives=True).execute()
+        with self._metadata_lock:
+            self._metadata[file_id] = metadata
+        return metadata
+
+    def _fetch_chunk(self, file_id, index, size):
+        """
+        @param file_id: drive file ID
+        @param index: chunk index
+        @param size: file size
+        @return: callable downloading the chunk with a range request
+        """
+        start = index * self.cache.chunk_size
+        end = min(start + self.cache.chunk_size, size) - 1
+
+        def fetch():
+            media = self.gdrive.thread_service().files().get_media(
+                fileId=file_id, supportsAllDrives=True)
+            media.headers['Range'] = f"bytes={start}-{end}"
+            return media.execute()
+
+        return fetch
+
+    def range_stream(self, metadata, start, stop):
+        """
+        @param metadata: drive file resource
+        @param start: first byte
+        @param stop: last byte, exclusive
+        @return: generator of file bytes
+        """
+        size = int(metadata['size'])
+        version = metadata.get('md5Checksum') or metadata.get('modifiedTime', '')
+        key = f"{metadata['id']}.{version.replace(':', '')}"
+        chunk_size = self.cache.chunk_size
+        for index in range(start // chunk_size, (stop - 1) // chunk_size + 1):
+            data = self.cache.get(key, index,
+                                  self._fetch_chunk(metadata['id'], index, size))
+            offset = index * chunk_size
+            yield data[max(start - offset, 0):stop - offset]
+
+    def _stream_route(self, file_id):
+        """
+        Proxy drive file content with HTTP range support
+        @param file_id: drive file ID
+        @return: flask response
+        """
+        if not self._authorized():
+            return jsonify("Unauthorized"), 403
+        try:
+            metadata = self._file_metadata(file_id)
+        except HttpError as err:
+            return jsonify(f"Unable To Get File: {err.reason}"), err.status_code
+        if 'size' not in metadata:
+            return jsonify("Google Docs Can't Be Streamed"), 400
+        size = int(metadata['size'])
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'Content-Disposition': f"inline; filename*=UTF-8''{quote(metadata['name'])}",
+        }
+        start, stop, status = 0, size, 200
+        if request.range:
+            byte_range = request.range.range_for_length(size)
+            # multi-range and non-byte units get the full response instead
+            if byte_range is None and request.range.units == 'bytes' and len(
+                    request.range.ranges) == 1:
+                headers['Content-Range'] = f"bytes */{size}"
+                return Response(status=416, headers=headers)
+            if byte_range is not None:
+                start, stop = byte_range
+                status = 206
+                headers['Content-Range'] = f"bytes {start}-{stop - 1}/{size}"
+        headers['Content-Length'] = str(stop - start)
+        body = [] if request.method == 'HEAD' or start >= stop else (
+            self.range_stream(metadata, start, stop))
+        return Response(body, status=status, headers=headers,
+                        mimetype=metadata['mimeType'])
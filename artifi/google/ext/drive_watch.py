@@ -0,0 +1,293 @@
+"""Google Drive Push Notifications Over Artifi.fsapi"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from flask import jsonify, request
+from googleapiclient.errors import HttpError
+from sqlalchemy import and_
+
+from artifi.google.ext.drive import GoogleDrive
+from artifi.google.ext.drive_model import DriveChangeTokenModel, \
+    DriveChannelModel
+
+
+class DriveWatcher:
+    """
+    Receive drive push notifications and pull the changed items from the
+    changes feed, every page of changes is handed to the listeners
+    example_usage: watcher = DriveWatcher(gdrive, 'https://host/callback/drive-webhook')
+                   watcher.add_listener(stream_server.apply_changes)
+                   watcher.watch()
+                   gdrive.context.start_scheduler()
+    Note: channels are renewed by the Artifi scheduler, so it must be running
+    """
+
+    change_fields = ('nextPageToken, newStartPageToken, changes(fileId, removed, '
+                     'time, file(id, name, mimeType, size, md5Checksum, parents, '
+                     'trashed, modifiedTime))')
+
+    def __init__(self, gdrive, webhook_uri, route='/callback/drive-webhook',
+                 channel_ttl=24 * 60, renew_before=60, renew_interval=30):
+        """
+        @param gdrive: pass :class GoogleDrive
+        @param webhook_uri: public https url of the route
+        @param route: route registered on Artifi.fsapi
+        @param channel_ttl: requested channel lifetime in minutes
+        @param renew_before: minutes before expiry a channel is replaced
+        @param renew_interval: minutes between renewal checks
+        """
+        self.gdrive: GoogleDrive = gdrive
+        self.webhook_uri = webhook_uri
+        self.channel_ttl = channel_ttl
+        self.renew_before = renew_before
+        self.renew_interval = renew_interval
+        # scopes the route, the channels and the renewal jobs of this watcher
+        self._watch_id = hashlib.sha1(webhook_uri.encode('utf-8')).hexdigest()[:8]
+        self._renewing = set()
+        self._listeners: List[Callable] = []
+        self._lock = threading.Lock()
+        self._syncing = set()
+        self._dirty = set()
+
+        self.gdrive.context.create_db_table([DriveChangeTokenModel,
+                                             DriveChannelModel])
+        self.gdrive.context.fsapi.add_url_rule(
+            route,
+            f"drive_webhook_{self._watch_id}",
+            self._webhook_route,
+            methods=["POST"],
+        )
+
+    def add_listener(self, callback):
+        """
+        @param callback: called with a list of changes resources
+        @return: callback
+        """
+        self._listeners.append(callback)
+        return callback
+
+    @staticmethod
+    def _drive_kwargs(drive_key) -> dict:
+        """
+        @param drive_key: 'root' or shared drive ID
+        @return: changes API arguments of the drive
+        """
+        kwargs = {'supportsAllDrives': True, 'includeItemsFromAllDrives': True}
+        if drive_key != 'root':
+            kwargs['driveId'] = drive_key
+        return kwargs
+
+    def _page_token(self, drive_key) -> Optional[str]:
+        """
+        @param drive_key: 'root' or shared drive ID
+        @return: stored page token of the drive
+        """
+        with self.gdrive.context.db_session() as session:
+            token = session.query(DriveChangeTokenModel).filter(
+                DriveChangeTokenModel.drive_token_drive_id == drive_key).first()
+            return token.drive_token_page_token if token else None
+
+    def _save_page_token(self, drive_key, page_token):
+        """
+        @param drive_key: 'root' or shared drive ID
+        @param page_token: next page token of the changes feed
+        """
+        with self.gdrive.context.db_session() as session:
+            token = session.query(DriveChangeTokenModel).filter(
+                DriveChangeTokenModel.drive_token_drive_id == drive_key).first()
+            if not token:
+                token = DriveChangeTokenModel(self.gdrive.context)
+                token.drive_token_drive_id = drive_key
+                token.drive_token_created_at = datetime.now()
+            token.drive_token_page_token = page_token
+            token.drive_token_updated_at = datetime.now()
+            session.add(token)
+            session.commit()
+
+    def watch(self, drive_id=None) -> dict:
+        """
+        Register a channel on the changes feed
+        @param drive_id: shared drive ID, None for My Drive
+        @return: channel resource
+        """
+        drive_key = drive_id or 'root'
+        service = self.gdrive.thread_service()
+        kwargs = self._drive_kwargs(drive_key)
+        if not (page_token := self._page_token(drive_key)):
+            kwargs.pop('includeItemsFromAllDrives')
+            page_token = service.changes().getStartPageToken(
+                **kwargs).execute()['startPageToken']
+            self._save_page_token(drive_key, page_token)
+            kwargs = self._drive_kwargs(drive_key)
+        secret = secrets.token_urlsafe(24)
+        body = {
+            'id': str(uuid.uuid4()),
+            'type': 'web_hook',
+            'address': self.webhook_uri,
+            'token': secret,
+            'expiration': int((time.time() + self.channel_ttl * 60) * 1000),
+        }
+        response = service.changes().watch(pageToken=page_token, body=body,
+                                           **kwargs).execute()
+        with self.gdrive.context.db_session() as session:
+            channel = DriveChannelModel(self.gdrive.context)
+            channel.drive_channel_id = response['id']
+            channel.drive_channel_resource_id = response['resourceId']
+            channel.drive_channel_token = secret
+            channel.drive_channel_drive_id = drive_key
+            channel.drive_channel_address = self.webhook_uri
+            channel.drive_channel_expiration = datetime.fromtimestamp(
+                int(response.get('expiration', body['expiration'])) / 1000)
+            channel.drive_channel_created_at = datetime.now()
+            channel.drive_channel_updated_at = datetime.now()
+            session.add(channel)
+            session.commit()
+        self.gdrive.context.logger.info(
+            f"Watching Drive: {drive_key} Channel: {response['id']}")
+        self._schedule_renew(drive_id)
+        return response
+
+    def _schedule_renew(self, drive_id):
+        """
+        Add the renewal job of the drive once per watcher
+        @param drive_id: shared drive ID, None for My Drive
+        """
+        drive_key = drive_id or 'root'
+        with self._lock:
+            if drive_key in self._renewing:
+                return
+            self._renewing.add(drive_key)
+        self.gdrive.context.add_scheduler(
+            self.renew,
+            args=[drive_id],
+            job_id=f"drive_watch_renew_{self._watch_id}_{drive_key}",
+            interval=self.renew_interval,
+            no_end=True,
+        )
+
+    def stop(self, channel_id):
+        """
+        @param channel_id: ID of a channel created by :meth watch
+        """
+        with self.gdrive.context.db_session() as session:
+            channel = session.query(DriveChannelModel).filter(
+                DriveChannelModel.drive_channel_id == channel_id).first()
+            if not channel:
+                return False
+            try:
+                self.gdrive.thread_service().channels().stop(body={
+                    'id': channel.drive_channel_id,
+                    'resourceId': channel.drive_channel_resource_id,
+                }).execute()
+            except HttpError as err:
+                self.gdrive.context.logger.error(
+                    f"Failed To Stop Channel: {channel_id} Reason: {err}")
+            session.delete(channel)
+            session.commit()
+        return True
+
+    def renew(self, drive_id=None):
+        """
+        Replace the channels of the drive which are about to expire
+        @param drive_id: shared drive ID, None for My Drive
+        """
+        deadline = datetime.now() + timedelta(minutes=self.renew_before)
+        with self.gdrive.context.db_session() as session:
+            expiring = [channel.drive_channel_id for channel in
+                        session.query(DriveChannelModel).filter(and_(
+                            DriveChannelModel.drive_channel_drive_id == (
+                                drive_id or 'root'),
+                            DriveChannelModel.drive_channel_address == self.webhook_uri,
+                            DriveChannelModel.drive_channel_expiration < deadline))]
+        for channel_id in expiring:
+            try:
+                self.watch(drive_id)
+            except HttpError as err:
+                self.gdrive.context.logger.error(
+                    f"Failed To Renew Channel: {channel_id} Reason: {err}")
+                continue
+            self.stop(channel_id)
+
+    def sync(self, drive_id=None) -> int:
+        """
+        Pull the changes since the stored page token
+        @param drive_id: shared drive ID, None for My Drive
+        @return: number of changes handed to the listeners
+        """
+        drive_key = drive_id or 'root'
+        if not (page_token := self._page_token(drive_key)):
+            return 0
+        service = self.gdrive.thread_service()
+        total = 0
+        while page_token:
+            response = service.changes().list(pageToken=page_token,
+                                              spaces='drive',
+                                              pageSize=1000,
+                                              fields=self.change_fields,
+                                              **self._drive_kwargs(drive_key)).execute()
+            if changes := response.get('changes', []):
+                for callback in list(self._listeners):
+                    try:
+                        callback(changes)
+                    except Exception as e:
+                        self.gdrive.context.logger.error(
+                            f"Drive Change Listener Failed: {e}")
+                total += len(changes)
+            page_token = response.get('nextPageToken')
+            self._save_page_token(drive_key,
+                                  page_token or response['newStartPageToken'])
+        return total
+
+    def _sync_loop(self, drive_key):
+        """
+        Runs on a background thread, notifications arriving while a sync is
+        running are coalesced into one more pass
+        @param drive_key: 'root' or shared drive ID
+        """
+        while True:
+            try:
+                self.sync(None if drive_key == 'root' else drive_key)
+            except Exception as e:
+                self.gdrive.context.logger.error(
+                    f"Failed To Sync Drive: {drive_key} Reason: {e}")
+            with self._lock:
+                if drive_key not in self._dirty:
+                    self._syncing.discard(drive_key)
+                    return
+                self._dirty.discard(drive_key)
+
+    def _schedule_sync(self, drive_key):
+        """@param drive_key: 'root' or shared drive ID"""
+        with self._lock:
+            if drive_key in self._syncing:
+                self._dirty.add(drive_key)
+                return
+            self._syncing.add(drive_key)
+        threading.Thread(target=self._sync_loop, args=(drive_key,),
+                         daemon=True).start()
+
+    def _webhook_route(self):
+        """@return: acknowledged as soon as the notification is validated"""
+        channel_id = request.headers.get('X-Goog-Channel-ID', '')
+        resource_id = request.headers.get('X-Goog-Resource-ID', '')
+        token = request.headers.get('X-Goog-Channel-Token')
+        with self.gdrive.context.db_session() as session:
+            channel = session.query(DriveChannelModel).filter(and_(
+                DriveChannelModel.drive_channel_id == channel_id,
+                DriveChannelModel.drive_channel_resource_id == resource_id,
+            )).first()
+            drive_key = channel.drive_channel_drive_id if channel else None
+            secret = channel.drive_channel_token if channel else ''
+        # compared as bytes, a non ASCII str makes compare_digest raise
+        if not (channel and secret and token) or not hmac.compare_digest(
+                secret.encode('utf-8'), token.encode('utf-8')):
+            return jsonify("Unknown Channel"), 404
+        if request.headers.get('X-Goog-Resource-State') != 'sync':
+            self._schedule_sync(drive_key)
+        return jsonify("Request Processed Successfully...!"), 200
@@ -1,109 +1,100 @@
 """YouTube Studio API Unofficial"""
-import asyncio
 import hashlib
+import itertools
+import threading
 import time
-from typing import Generator, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Generator, Iterable, List, Optional, Tuple
 
+from cachetools import TTLCache
 from requests import Session
+from requests.adapters import HTTPAdapter
 
 from artifi.google.ext import GoogleWebSession
 from artifi.utils import get_nested_key
 
 
 class StudioVideoObj:
-    """Video Details"""
+    """
+    Video Details, only the keys of payload_keys are kept and the enums are
+    mapped when read, so thousands of videos stay small in memory
+    """
+
+    __slots__ = ("_video_id", "_channel_id", "_video_title", "_video_length",
+                 "_description", "_download_url", "_restrictions", "_privacy",
+                 "_draft_status", "_metrics", "_edit_processing", "_status",
+                 "_time_created", "_time_published")
+
+    # keys of the video resource read by this object, same order as __slots__
+    payload_keys = ("videoId", "channelId", "title", "lengthSeconds",
+                    "description", "downloadUrl", "allRestrictions", "privacy",
+                    "draftStatus", "metrics", "inlineEditProcessingStatus",
+                    "status", "timeCreatedSeconds", "timePublishedSeconds")
+
+    # keys holding a message, masked with {"all": True}
+    _message_keys = ("allRestrictions", "metrics")
+
+    # subsets of payload_keys requested by list_videos
+    mask_profiles = {
+        "minimal": ("videoId", "channelId", "title", "lengthSeconds",
+                    "privacy", "draftStatus", "timeCreatedSeconds",
+                    "timePublishedSeconds"),
+        "claims": ("videoId", "channelId", "title", "lengthSeconds",
+                   "privacy", "draftStatus", "timeCreatedSeconds",
+                   "timePublishedSeconds",
+                   "allRestrictions", "inlineEditProcessingStatus", "status"),
+        "full": payload_keys,
+    }
+
+    _restriction_mapping = {
+        "VIDEO_RESTRICTION_REASON_COPYRIGHT": "COPYRIGHT",
+    }
+    _edit_processing_mapping = {
+        "VIDEO_PROCESSING_STATUS_EDITED": "EDITED",
+        "VIDEO_PROCESSING_STATUS_UNEDITED": "UNEDITED",
+        "VIDEO_PROCESSING_STATUS_PROCESSING": "PROCESSING",
+    }
+    _status_mapping = {
+        "VIDEO_STATUS_UPLOADED": "UPLOADED_CHECKING",
+        "VIDEO_STATUS_PROCESSED": "PROCESSED",
+    }
+
+    @classmethod
+    def mask(cls, profile="full") -> dict:
+        """
+        @param profile: minimal, claims or full, a dict is returned as it is
+        @return: Studio field mask of the profile
+        """
+        if isinstance(profile, dict):
+            return profile
+        return {key: {"all": True} if key in cls._message_keys else True
+                for key in cls.mask_profiles[profile]}
 
     def __init__(self, video: dict):
-        """@param video:"""
-        self._video = video
-        self._video_id: Optional[str] = None
-        self._channel_id: Optional[str] = None
-        self._video_title: Optional[str] = None
-        self._video_length: Optional[str] = None
-        self._description: Optional[str] = None
-        self._download_url: Optional[str] = None
-        self._restriction: Optional[list] = None
-        self._is_private: Optional[bool] = None
-        self._is_drafted: bool = False
-        self._edit_processing_status: Optional[str] = None
-        self._video_status: Optional[str] = None
-        self._insights: Optional[dict] = None
-        self.__call__()
+        """@param video: video resource, it is not kept"""
+        get = video.get
+        self._video_id: Optional[str] = get("videoId")
+        self._channel_id: Optional[str] = get("channelId")
+        self._video_title: Optional[str] = get("title")
+        self._video_length: Optional[str] = get("lengthSeconds")
+        self._description: Optional[str] = get("description")
+        self._download_url: Optional[str] = get("downloadUrl")
+        self._restrictions: Optional[list] = get("allRestrictions")
+        self._privacy: Optional[str] = get("privacy")
+        self._draft_status: Optional[str] = get("draftStatus")
+        self._metrics: Optional[dict] = get("metrics")
+        self._edit_processing: Optional[str] = get("inlineEditProcessingStatus")
+        self._status: Optional[str] = get("status")
+        self._time_created: Optional[str] = get("timeCreatedSeconds")
+        self._time_published: Optional[str] = get("timePublishedSeconds")
 
     def __call__(self, *args, **kwargs):
         """
-
-        @param args:
-        @param kwargs:
-        @return:
+        Kept for compatibility, the fields are read on construction
+        @return: self
         """
-        if self._video:
-            self._video_id = self._video.get("videoId")
-            self._channel_id = self._video.get("channelId")
-            self._video_title = self._video.get("title")
-            self._video_length = self._video.get("lengthSeconds")
-            self._description = self._video.get("description")
-            self._download_url = self._video.get("downloadUrl")
-            self._restriction = self._restriction_state(
-                get_nested_key(self._video.get("allRestrictions"), "reason")
-            )
-            self._is_private = self._video.get("privacy") == "VIDEO_PRIVACY_PRIVATE"
-            self._is_drafted = self._video.get("draftStatus") == "DRAFT_STATUS_NONE"
-            self._insights = {
-                "total_comments": self._video.get("metrics").get("commentCount"),
-                "total_dislike": self._video.get("metrics").get("dislikeCount"),
-                "total_like": self._video.get("metrics").get("likeCount"),
-                "total_view": self._video.get("metrics").get("viewCount"),
-            }
-            self._edit_processing_status = self._edit_processing_state(
-                self._video.get("inlineEditProcessingStatus")
-            )
-            self._video_status = self._video_state(self._video.get("status"))
-
         return self
 
-    @staticmethod
-    def _restriction_state(option: str):
-        """
-
-        @param option:
-        @return:
-        """
-        mapping = {
-            "VIDEO_RESTRICTION_REASON_COPYRIGHT": "COPYRIGHT",
-        }
-
-        return mapping.get(option, "NO_RESTRICTION")
-
-    @staticmethod
-    def _edit_processing_state(option: str):
-        """
-
-        @param option:
-        @return:
-        """
-        mapping = {
-            "VIDEO_PROCESSING_STATUS_EDITED": "EDITED",
-            "VIDEO_PROCESSING_STATUS_UNEDITED": "UNEDITED",
-            "VIDEO_PROCESSING_STATUS_PROCESSING": "PROCESSING",
-        }
-
-        return mapping.get(option, "UNKNOWN")
-
-    @staticmethod
-    def _video_state(option: str):
-        """
-
-        @param option:
-        @return:
-        """
-        mapping = {
-            "VIDEO_STATUS_UPLOADED": "UPLOADED_CHECKING",
-            "VIDEO_STATUS_PROCESSED": "PROCESSED",
-        }
-
-        return mapping.get(option, "UNKNOWN")
-
     @property
     def video_id(self) -> Optional[str]:
         """
@@ -145,20 +136,27 @@ class StudioVideoObj:
         return self._download_url
 
     @property
-    def restriction(self) -> Optional[list]:
+    def restriction(self) -> str:
         """
         Video restriction Status
-        @return:
+        @return: COPYRIGHT when any restriction is a copyright one
         """
-        return self._restriction
+        restrictions = self._restrictions or ()
+        if isinstance(restrictions, dict):
+            restrictions = (restrictions,)
+        for restriction in restrictions:
+            if reason := self._restriction_mapping.get(
+                    isinstance(restriction, dict) and restriction.get("reason")):
+                return reason
+        return "NO_RESTRICTION"
 
     @property
-    def is_private(self) -> Optional[bool]:
+    def is_private(self) -> bool:
         """
         Video Visibility
         @return:
         """
-        return self._is_private
+        return self._privacy == "VIDEO_PRIVACY_PRIVATE"
 
     @property
     def is_drafted(self) -> bool:
@@ -166,31 +164,37 @@ class StudioVideoObj:
         Video Visibility
         @return:
         """
-        return self._is_drafted
+        return self._draft_status == "DRAFT_STATUS_NONE"
 
     @property
-    def insights(self) -> Optional[dict]:
+    def insights(self) -> dict:
         """
         video insights
         @return:
         """
-        return self._insights
+        metrics = self._metrics or {}
+        return {
+            "total_comments": metrics.get("commentCount"),
+            "total_dislike": metrics.get("dislikeCount"),
+            "total_like": metrics.get("likeCount"),
+            "total_view": metrics.get("viewCount"),
+        }
 
     @property
-    def edit_processing_status(self) -> Optional[str]:
+    def edit_processing_status(self) -> str:
         """
         Editing status of video
         @return:
         """
-        return self._edit_processing_status
+        return self._edit_processing_mapping.get(self._edit_processing, "UNKNOWN")
 
     @property
-    def video_status(self) -> Optional[str]:
+    def video_status(self) -> str:
         """
         Video current status
         @return:
         """
-        return self._video_status
+        return self._status_mapping.get(self._status, "UNKNOWN")
 
     @property
     def video_length(self) -> Optional[str]:
@@ -200,76 +204,84 @@ class StudioVideoObj:
         """
         return self._video_length
 
+    @property
+    def time_created(self) -> Optional[int]:
+        """
+        Upload time of the video in epoch seconds
+        @return:
+        """
+        return int(self._time_created or 0) or None
 
-class StudioVideoClaimsObj:
-    """Video Copyright Claims Details"""
-
-    def __init__(self, claim: dict):
-        """@param claim:"""
-        self._claim = claim
-        self._claim_id: Optional[str] = None
-        self._video_id: Optional[str] = None
-        self._type: Optional[str] = None
-        self._duration: Optional[str] = None
-        self._resolve_option: Optional[List[str]] = None
-        self._claim_title: Optional[str] = None
-        self._status: Optional[str] = None
-        self._artists: Optional[List[str]] = None
-        self.__call__()
+    @property
+    def time_published(self) -> Optional[int]:
+        """
+        Publish time of the video in epoch seconds, None until published
+        @return:
+        """
+        return int(self._time_published or 0) or None
 
-    def __call__(self, *args, **kwargs):
+    @property
+    def display_time(self) -> Optional[int]:
+        """
+        Time Studio sorts the video list by, publish time or else upload time
+        @return:
         """
+        return self.time_published or self.time_created
 
-        @param args:
-        @param kwargs:
+    @property
+    def raw(self) -> dict:
+        """
+        Video resource rebuilt from the kept keys, built on every access
         @return:
         """
-        self._claim_id = self._claim.get("claimId")
-        self._video_id = self._claim.get("videoId")
-        self._type = self._claim.get("type")
+        return {key: value for key, value in
+                zip(self.payload_keys, (getattr(self, slot) for slot in self.__slots__))
+                if value is not None}
 
-        start_time_seconds = int(
-            self._claim.get("matchDetails", {}).get("longestMatchStartTimeSeconds", 0)
-        )
-        duration_seconds = int(
-            self._claim.get("matchDetails", {}).get("longestMatchDurationSeconds", 0)
-        )
-        end_time_seconds = start_time_seconds + duration_seconds
 
-        start_time_minutes, start_time_seconds = divmod(start_time_seconds, 60)
-        end_time_minutes, end_time_seconds = divmod(end_time_seconds, 60)
-        self._duration = f"{start_time_minutes:02d}:{start_time_seconds:02d} -\
-                            {end_time_minutes:02d}:{end_time_seconds:02d}"
+class StudioVideoClaimsObj:
+    """Video Copyright Claims Details, keeps only the fields it reads"""
 
-        self._resolve_option = self._available_option(
-            self._claim.get("nontakedownClaimActions", {}).get("options")
-        )
+    __slots__ = ("_claim_id", "_video_id", "_type", "_match_start",
+                 "_match_duration", "_options", "_metadata", "_status")
 
-        meta_data = self._claim.get("asset", {}).get("srMetadata") or self._claim.get(
-            "asset", {}
-        ).get("metadata", {})
-        self._claim_title = get_nested_key(meta_data, "title")
-        self._status = self._claim.get("status")
-        self._artists = get_nested_key(meta_data, "artists")
+    _option_mapping = {
+        "NON_TAKEDOWN_CLAIM_OPTION_ERASE_SONG": "MUTE_SONG",
+        "NON_TAKEDOWN_CLAIM_OPTION_TRIM": "TRIM_SEGMENT",
+    }
+
+    def __init__(self, claim: dict):
+        """@param claim: claim resource, it is not kept"""
+        get = claim.get
+        match_details = get("matchDetails") or {}
+        asset = get("asset") or {}
+        self._claim_id: Optional[str] = get("claimId")
+        self._video_id: Optional[str] = get("videoId")
+        self._type: Optional[str] = get("type")
+        self._match_start = int(match_details.get("longestMatchStartTimeSeconds", 0))
+        self._match_duration = int(match_details.get("longestMatchDurationSeconds", 0))
+        self._options: list = (get("nontakedownClaimActions") or {}).get("options") or []
+        self._metadata: dict = asset.get("srMetadata") or asset.get("metadata") or {}
+        self._status: Optional[str] = get("status")
 
+    def __call__(self, *args, **kwargs):
+        """
+        Kept for compatibility, the fields are read on construction
+        @return: self
+        """
         return self
 
-    @staticmethod
-    def _available_option(options: list):
+    @classmethod
+    def _available_option(cls, options: list):
         """
 
         @param options:
         @return:
         """
-        mapping = {
-            "NON_TAKEDOWN_CLAIM_OPTION_ERASE_SONG": "MUTE_SONG",
-            "NON_TAKEDOWN_CLAIM_OPTION_TRIM": "TRIM_SEGMENT",
-        }
-
         return [
-            mapping.get(option, "UNAVAILABLE")
+            cls._option_mapping[option]
             for option in options
-            if option in mapping
+            if option in cls._option_mapping
         ] or ["UNAVAILABLE"]
 
     @property
@@ -297,20 +309,24 @@ class StudioVideoClaimsObj:
         return self._type
 
     @property
-    def duration(self) -> Optional[str]:
+    def duration(self) -> str:
         """
         Timeline of Segment
         @return:
         """
-        return self._duration
+        start_time_minutes, start_time_seconds = divmod(self._match_start, 60)
+        end_time_minutes, end_time_seconds = divmod(
+            self._match_start + self._match_duration, 60)
+        return f"{start_time_minutes:02d}:{start_time_seconds:02d} -\
+                            {end_time_minutes:02d}:{end_time_seconds:02d}"
 
     @property
-    def resolve_option(self) -> Optional[List[str]]:
+    def resolve_option(self) -> List[str]:
         """
         Option available to solve copyright segment
         @return:
         """
-        return self._resolve_option
+        return self._available_option(self._options)
 
     @property
     def claim_title(self) -> Optional[str]:
@@ -318,7 +334,9 @@ class StudioVideoClaimsObj:
         Segment Title
         @return:
         """
-        return self._claim_title
+        if "title" in self._metadata:
+            return self._metadata["title"]
+        return get_nested_key(self._metadata, "title")
 
     @property
     def status(self) -> Optional[str]:
@@ -334,7 +352,28 @@ class StudioVideoClaimsObj:
         Artists who own the content
         @return:
         """
-        return self._artists
+        if "artists" in self._metadata:
+            return self._metadata["artists"]
+        return get_nested_key(self._metadata, "artists")
+
+    @property
+    def raw(self) -> dict:
+        """
+        Claim resource rebuilt from the kept fields, built on every access
+        @return:
+        """
+        return {
+            "claimId": self._claim_id,
+            "videoId": self._video_id,
+            "type": self._type,
+            "matchDetails": {
+                "longestMatchStartTimeSeconds": self._match_start,
+                "longestMatchDurationSeconds": self._match_duration,
+            },
+            "nontakedownClaimActions": {"options": self._options},
+            "asset": {"metadata": self._metadata},
+            "status": self._status,
+        }
 
 
 class GoogleYouTubeStudio(GoogleWebSession):
@@ -370,9 +409,14 @@ class GoogleYouTubeStudio(GoogleWebSession):
         self.auth_key: str = param_key
         self._session_token: str = Optional[str]
         self._channel_id: str = Optional[str]
+        self._pool_size: int = 10
+        self._refresh_lock = threading.Lock()
+        # claim matches by video_id then claim_id, with the claim status seen
+        self._claim_matches: TTLCache = TTLCache(maxsize=4096, ttl=60 * 60)
+        self._claim_matches_lock = threading.Lock()
         self._session = self._web_request()
 
-    async def _sapisid_hash(self, sapisid):
+    def _sapisid_hash(self, sapisid):
         """
         To create encrypted string using SAPISID on cookies
         @param sapisid: cookie SAPISID
@@ -381,10 +425,9 @@ class GoogleYouTubeStudio(GoogleWebSession):
         timestamp_ms = int(time.time() * 1000)
         data_to_hash = f"{timestamp_ms} {sapisid} {self._base_url}"
         encoded_str = data_to_hash.encode("utf-8")
-        digest = await asyncio.to_thread(hashlib.sha1, encoded_str)
-        return f"{timestamp_ms}_{digest.hexdigest()}"
+        return f"{timestamp_ms}_{hashlib.sha1(encoded_str).hexdigest()}"
 
-    def _intercept_response(self, response):
+    async def _intercept_response(self, response):
         """
         To Get Session-ID
         @param response:
@@ -393,7 +436,7 @@ class GoogleYouTubeStudio(GoogleWebSession):
         session_token_url = (f"{self._base_url}/{self._service}/{self._version}"
                              f"/ars/grst?alt=json&key={self.auth_key}")
         if session_token_url in response.url:
-            data = response.json()
+            data = await response.json()
             self._session_token = data.get("sessionToken")
 
     def _cookie_field(self):
@@ -416,23 +459,20 @@ class GoogleYouTubeStudio(GoogleWebSession):
                 sapid_value = data["value"]
         return "; ".join(set(cookie_field)), sapid_value
 
-    def _web_request(self) -> Session:
+    def _new_session(self) -> Session:
         """
-        Make requests session and set default cookie to make web api request
-        @return:
+        Build requests session from the stored cookies with a fresh SAPISIDHASH,
+        the hash is timestamped so it is computed on every refresh
+        @return: requests session
         """
-        cp_url = self.fetch_save_gsession(
-            self._base_url, self._intercept_response
-        )
-        self._channel_id = cp_url.split("/")[-1]
-        default_session = Session()
         header_cookie, sapid_value = self._cookie_field()
         if not isinstance(header_cookie or sapid_value, str):
             raise ValueError("Failed To Get Valid Cookies")
+        default_session = Session()
         default_session.headers = {
             "authority": "api.youtube.com",
-            "authorization": ("SAPISIDHASH "
-                              f"{asyncio.run(self._sapisid_hash(sapid_value))}"),
+            # sync, a refresh may run inside the caller's event loop
+            "authorization": f"SAPISIDHASH {self._sapisid_hash(sapid_value)}",
             "studio-type": "application/json",
             "cookie": header_cookie.strip(),
             "user-agent": self._user_agent,
@@ -440,12 +480,101 @@ class GoogleYouTubeStudio(GoogleWebSession):
             "x-origin": self._base_url,
         }
         default_session.params = {"alt": "json", "key": self.auth_key}
+        default_session.mount("https://", HTTPAdapter(pool_maxsize=self._pool_size))
         return default_session
 
-    def list_videos(self) -> Optional[Generator[StudioVideoObj, None, None]]:
+    def _web_request(self) -> Session:
         """
-        Show List of Videos in the YouTube studio
-        @return: list of object of :class StudioVideoObj
+        Make requests session and set default cookie to make web api request
+        @return:
+        """
+        cp_url = self.fetch_save_gsession(
+            self._base_url, self._intercept_response, wait_for="/ars/grst"
+        )
+        self._channel_id = cp_url.split("/")[-1]
+        return self._new_session()
+
+    def _cookie_request(self) -> Optional[Session]:
+        """
+        Renew the session over plain HTTP, the stored cookies sign a new
+        SAPISIDHASH and the session token is fetched again from ars/grst
+        @return: requests session, None when the cookies are no longer valid
+        """
+        try:
+            session = self._new_session()
+            response = session.post(self._endpoint("ars/grst"),
+                                    json={"context": self._claims_payload(
+                                        None)["context"]},
+                                    timeout=30)
+        except Exception as e:
+            self.context.logger.error(f"Cookie Session Refresh Failed: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        if not (session_token := response.json().get("sessionToken")):
+            return None
+        self._session_token = session_token
+        return session
+
+    def refresh_session(self, stale: Optional[Session] = None) -> Session:
+        """
+        Renew the expired session, the browser login is used only when the
+        stored cookies are rejected
+        @param stale: session the expired request was sent with, a refresh
+                      already done by another thread is reused
+        @return: current requests session
+        """
+        with self._refresh_lock:
+            if stale is not None and stale is not self._session:
+                return self._session
+            self.context.logger.info(
+                "Google Session Expired, Trying Again Please Wait...!"
+            )
+            if not (session := self._cookie_request()):
+                self.context.logger.info(
+                    "Stored Cookies Rejected, Logging In Again Please Wait...!")
+                session = self._web_request()
+            self._session = session
+            return session
+
+    def _post(self, path: str, payload: dict):
+        """
+        Post to the Studio endpoint, the session is renewed once on 402
+        @param path: path below the youtubei service
+        @param payload: request body
+        @return: response
+        """
+        session = self._session
+        response = session.post(self._endpoint(path), json=payload)
+        if response.status_code == 402:
+            session = self.refresh_session(session)
+            self._renew_session_info(payload)
+            response = session.post(self._endpoint(path), json=payload)
+        return response
+
+    def _renew_session_info(self, payload: dict):
+        """
+        Edit payloads carry the session token, swap it after a refresh
+        @param payload: request body
+        """
+        if session_info := payload.get("context", {}).get(
+                "request", {}).get("sessionInfo"):
+            session_info["token"] = self._session_token
+
+    def _endpoint(self, path: str) -> str:
+        """
+        @param path: path below the youtubei service
+        @return: absolute url of the Studio endpoint
+        """
+        return f"{self._base_url}/{self._service}/{self._version}/{path}"
+
+    def _videos_payload(self, page_token: Optional[str] = None,
+                        mask="full", page_size: int = 30) -> dict:
+        """
+        @param page_token: next page token of the previous response
+        @param mask: profile of :meth StudioVideoObj.mask or a mask dict
+        @param page_size: videos per page
+        @return: list_creator_videos payload
         """
         payload = {
             "filter": {
@@ -456,59 +585,8 @@ class GoogleYouTubeStudio(GoogleWebSession):
                 }
             },
             "order": "VIDEO_ORDER_DISPLAY_TIME_DESC",
-            "pageSize": 30,
-            "mask": {
-                "channelId": True,
-                "videoId": True,
-                "lengthSeconds": True,
-                "livestream": {"all": True},
-                "publicLivestream": {"all": True},
-                "origin": True,
-                "premiere": {"all": True},
-                "publicPremiere": {"all": True},
-                "status": True,
-                "thumbnailDetails": {"all": True},
-                "title": True,
-                "draftStatus": True,
-                "downloadUrl": True,
-                "watchUrl": True,
-                "shareUrl": True,
-                "permissions": {"all": True},
-                "features": {"all": True},
-                "timeCreatedSeconds": True,
-                "timePublishedSeconds": True,
-                "privacy": True,
-                "contentOwnershipModelSettings": {"all": True},
-                "contentType": True,
-                "publicShorts": {"all": True},
-                "podcastRssMetadata": {"all": True},
-                "videoLinkageShortsAttribution": {"all": True},
-                "responseStatus": {"all": True},
-                "statusDetails": {"all": True},
-                "description": True,
-                "metrics": {"all": True},
-                "thumbnailEditorState": {"all": True},
-                "titleFormattedString": {"all": True},
-                "descriptionFormattedString": {"all": True},
-                "titleDetails": {"all": True},
-                "descriptionDetails": {"all": True},
-                "audienceRestriction": {"all": True},
-                "releaseInfo": {"all": True},
-                "allRestrictions": {"all": True},
-                "inlineEditProcessingStatus": True,
-                "videoPrechecks": {"all": True},
-                "shorts": {"all": True},
-                "selfCertification": {"all": True},
-                "videoResolutions": {"all": True},
-                "scheduledPublishingDetails": {"all": True},
-                "visibility": {"all": True},
-                "privateShare": {"all": True},
-                "sponsorsOnly": {"all": True},
-                "unlistedExpired": True,
-                "videoTrailers": {"all": True},
-                "remix": {"isSource": True},
-                "isPaygated": True,
-            },
+            "pageSize": page_size,
+            "mask": StudioVideoObj.mask(mask),
             "context": {
                 "client": {
                     "clientName": 62,
@@ -530,34 +608,50 @@ class GoogleYouTubeStudio(GoogleWebSession):
                 },
             },
         }
-        _url = (f"{self._base_url}/{self._service}/{self._version}"
-                f"/creator/list_creator_videos")
-        all_set = True
-        while all_set:
-            response = self._session.post(_url, json=payload)
+        if page_token:
+            payload["pageToken"] = page_token
+        return payload
+
+    def list_video_pages(
+            self, mask="full", page_size: int = 30, page_token: Optional[str] = None
+    ) -> Generator[Tuple[List[StudioVideoObj], Optional[str]], None, None]:
+        """
+        Pages of the videos in the YouTube studio, newest display time first
+        @param mask: minimal, claims or full, see :meth StudioVideoObj.mask
+        @param page_size: videos per page
+        @param page_token: next page token of an earlier page to start from
+        @return: videos of :class StudioVideoObj and the next page token, None
+                 on the last page
+        """
+        payload = self._videos_payload(page_token, mask, page_size)
+        while True:
+            response = self._post("creator/list_creator_videos", payload)
             response.raise_for_status()
             data = response.json()
-            if response.status_code == 402:
-                self.context.logger.info(
-                    "Google Session Expired, Trying Again Please Wait...!"
-                )
-                self._session = self._web_request()
-                return self.list_videos()
-            if page_token := data.get("nextPageToken"):
-                payload["pageToken"] = page_token
-            else:
-                all_set = False
-            content_videos = data.get("videos", [])
-            for video_data in content_videos:
-                yield StudioVideoObj(video_data)
+            next_token = data.get("nextPageToken")
+            yield [StudioVideoObj(video_data)
+                   for video_data in data.get("videos", [])], next_token
+            if not next_token:
+                break
+            payload["pageToken"] = next_token
 
-    def list_video_claims(
-            self, video: StudioVideoObj
-    ) -> Optional[Generator[StudioVideoClaimsObj, None, None]]:
+    def list_videos(
+            self, mask="full", page_size: int = 30, page_token: Optional[str] = None
+    ) -> Optional[Generator[StudioVideoObj, None, None]]:
         """
-        Show list claims on videos
-        @param video: pass :class StudioVideoObj
-        @return: list of object of :class StudioVideoClaimsObj
+        Show List of Videos in the YouTube studio
+        @param mask: minimal, claims or full, see :meth StudioVideoObj.mask
+        @param page_size: videos per page
+        @param page_token: next page token of an earlier page to start from
+        @return: list of object of :class StudioVideoObj
+        """
+        for videos, _ in self.list_video_pages(mask, page_size, page_token):
+            yield from videos
+
+    def _claims_payload(self, video_id: str) -> dict:
+        """
+        @param video_id: Video unique ID
+        @return: list_creator_received_claims payload
         """
         payload = {
             "context": {
@@ -588,33 +682,115 @@ class GoogleYouTubeStudio(GoogleWebSession):
                     }
                 },
             },
-            "videoId": video.video_id,
+            "videoId": video_id,
             "criticalRead": False,
             "includeLicensingOptions": False,
         }
-        _url = (f"{self._base_url}/{self._service}/{self._version}"
-                f"/creator/list_creator_received_claims?alt=json&key={self.auth_key}")
+        return payload
+
+    def get_videos(
+            self, video_ids: List[str], mask="full"
+    ) -> Generator[StudioVideoObj, None, None]:
+        """
+        Fetch selected videos, 50 per request
+        @param video_ids: Video unique IDs
+        @param mask: profile of :meth StudioVideoObj.mask or a mask dict
+        @return: list of object of :class StudioVideoObj
+        """
+        base_payload = self._videos_payload(mask=mask)
+        for start in range(0, len(video_ids), 50):
+            payload = {
+                "videoIds": video_ids[start:start + 50],
+                "mask": base_payload["mask"],
+                "context": base_payload["context"],
+            }
+            response = self._post("creator/get_creator_videos", payload)
+            response.raise_for_status()
+            for video_data in response.json().get("videos", []):
+                yield StudioVideoObj(video_data)
 
-        response = self._session.post(_url, json=payload)
+    def list_video_claims(
+            self, video: StudioVideoObj
+    ) -> Optional[Generator[StudioVideoClaimsObj, None, None]]:
+        """
+        Show list claims on videos
+        @param video: pass :class StudioVideoObj
+        @return: list of object of :class StudioVideoClaimsObj
+        """
+        payload = self._claims_payload(video.video_id)
+        response = self._post("creator/list_creator_received_claims", payload)
         response.raise_for_status()
-        if response.status_code == 402:
-            self.context.logger.info(
-                "Google Session Expired, Trying Again Please Wait...!"
-            )
-            self._session = self._web_request()
-            return self.list_video_claims(video)
         data = response.json().get("receivedClaims", [])
         for claim in data:
             yield StudioVideoClaimsObj(claim)
 
-    def _get_claimed_duration(self, claim: StudioVideoClaimsObj):
+    def _grow_pool(self, size: int):
         """
+        Remount the session adapter when more connections are used at the same
+        time than the pool keeps, a smaller size keeps the current pool
+        @param size: Number of requests in flight
+        """
+        if size > self._pool_size:
+            self._pool_size = size
+            self._session.mount("https://", HTTPAdapter(pool_maxsize=size))
 
-        @param claim:
-        @return:
+    def _video_claims(self, video: StudioVideoObj,
+                      preload_matches: bool = False) -> List[StudioVideoClaimsObj]:
+        """
+        @param video: pass :class StudioVideoObj
+        @param preload_matches: 'True' to cache the matches of editable claims
+        @return: claims of the video
+        """
+        claims = list(self.list_video_claims(video))
+        if preload_matches:
+            for claim in claims:
+                if claim.resolve_option != ["UNAVAILABLE"]:
+                    self._get_claimed_duration(claim)
+        return claims
+
+    def scan_claims(
+            self, videos: Optional[Iterable[StudioVideoObj]] = None,
+            concurrency: int = 8, preload_matches: bool = False
+    ) -> Generator[StudioVideoClaimsObj, None, None]:
+        """
+        Fetch the claims of many videos concurrently over the shared session
+        @param videos: :class StudioVideoObj to scan, default is every video
+        @param concurrency: Maximum number of requests in flight
+        @param preload_matches: 'True' to fetch the matches of every editable
+                                claim in the same workers, so trim and mute
+                                find them cached
+        @return: claims of :class StudioVideoClaimsObj as they arrive
+        """
+        videos = iter(self.list_videos("claims") if videos is None else videos)
+        self._grow_pool(concurrency)
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {pool.submit(self._video_claims, video, preload_matches): video
+                   for video in itertools.islice(videos, concurrency * 2)}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for job in done:
+                    video = pending.pop(job)
+                    if next_video := next(videos, None):
+                        pending[pool.submit(self._video_claims, next_video,
+                                            preload_matches)] = next_video
+                    try:
+                        claims = job.result()
+                    except Exception as e:
+                        self.context.logger.error(
+                            f"Failed To Fetch Claims Of Video: {video.video_id} Reason: {e}")
+                        continue
+                    yield from claims
+        finally:
+            for job in pending:
+                job.cancel()
+            pool.shutdown(wait=True)
+
+    def _claim_matches_payload(self, claim: StudioVideoClaimsObj) -> dict:
+        """
+        @param claim: Pass :class StudioVideoClaimsObj
+        @return: get_creator_received_claim_matches payload
         """
-        _url = (f"{self._base_url}/{self._service}/{self._version}"
-                f"/copyright/get_creator_received_claim_matches")
         payload = {
             "videoId": claim.video_id,
             "claimId": claim.claim_id,
@@ -644,42 +820,93 @@ class GoogleYouTubeStudio(GoogleWebSession):
                 },
             },
         }
+        return payload
 
-        response = self._session.post(_url, json=payload)
-        response.raise_for_status()
-        if response.status_code == 402:
-            self.context.logger.info(
-                "Google Session Expired, Trying Again Please Wait...!"
-            )
-            self._session = self._web_request()
-            return self._get_claimed_duration(claim)
-        res_data = response.json()
-        claim_matches = res_data.get("matches").get("claimMatches")
-        data = []
+    @staticmethod
+    def _claim_segments(data: dict) -> list:
+        """
+        @param data: get_creator_received_claim_matches response
+        @return: video segments of the claim matches
+        """
+        claim_matches = data.get("matches").get("claimMatches")
+        segments = []
         for item in claim_matches:
-            data.append(item.get("videoSegment"))
-        return data
+            segments.append(item.get("videoSegment"))
+        return segments
 
-    def trim_out(self, claim: StudioVideoClaimsObj):
+    def _cached_matches(self, claim: StudioVideoClaimsObj) -> Optional[list]:
         """
-        Trim out copyright segment
         @param claim: Pass :class StudioVideoClaimsObj
-        @return:
+        @return: cached segments, None when missing or the claim status changed
         """
-        if "TRIM_SEGMENT" not in claim.resolve_option:
-            return {"status": "Trim Segment option is unavailable for this claims",
-                    "code": "INELIGIBLE_FOR_TRIM_OUT"}
-        _url = (f"{self._base_url}/{self._service}/{self._version}"
-                "/video_editor/edit_video")
+        with self._claim_matches_lock:
+            video_matches = self._claim_matches.get(claim.video_id) or {}
+            if cached := video_matches.get(claim.claim_id):
+                status, segments = cached
+                if status == claim.status:
+                    return segments
+                video_matches.pop(claim.claim_id, None)
+        return None
+
+    def _cache_matches(self, claim: StudioVideoClaimsObj, segments: list):
+        """
+        @param claim: Pass :class StudioVideoClaimsObj
+        @param segments: video segments of the claim matches
+        """
+        with self._claim_matches_lock:
+            video_matches = self._claim_matches.get(claim.video_id)
+            if video_matches is None:
+                video_matches = self._claim_matches[claim.video_id] = {}
+            video_matches[claim.claim_id] = (claim.status, segments)
+
+    def invalidate_video_matches(self, *video_ids: str):
+        """
+        Drop cached matches of every claim of the videos, an edit shifts the
+        matches of the other claims too, everything is dropped when no video
+        is given
+        @param video_ids: Video unique ID
+        """
+        with self._claim_matches_lock:
+            if not video_ids:
+                self._claim_matches.clear()
+            for video_id in video_ids:
+                self._claim_matches.pop(video_id, None)
 
+    def _get_claimed_duration(self, claim: StudioVideoClaimsObj):
+        """
+        Matches are cached by video and claim until the claim status changes
+        or the video is edited
+        @param claim: Pass :class StudioVideoClaimsObj
+        @return: video segments of the claim matches
+        """
+        if (segments := self._cached_matches(claim)) is not None:
+            return segments
+        payload = self._claim_matches_payload(claim)
+        response = self._post("copyright/get_creator_received_claim_matches",
+                              payload)
+        response.raise_for_status()
+        segments = self._claim_segments(response.json())
+        self._cache_matches(claim, segments)
+        return segments
+
+    def _edit_payload(self, claim: StudioVideoClaimsObj, method: str,
+                      mute_segments: list,
+                      all_known_matches_covered: bool) -> dict:
+        """
+        @param claim: Pass :class StudioVideoClaimsObj
+        @param method: REMOVE_SONG_METHOD_*
+        @param mute_segments: output of :meth _get_claimed_duration
+        @param all_known_matches_covered: 'True' when every match is edited
+        @return: edit_video payload
+        """
         payload = {
             "externalVideoId": claim.video_id,
             "claimEditChange": {
                 "addRemoveSongEdit": {
                     "claimId": claim.claim_id,
-                    "method": "REMOVE_SONG_METHOD_TRIM",
-                    "muteSegments": self._get_claimed_duration(claim),
-                    "allKnownMatchesCovered": False,
+                    "method": method,
+                    "muteSegments": mute_segments,
+                    "allKnownMatchesCovered": all_known_matches_covered,
                 }
             },
             "context": {
@@ -712,95 +939,85 @@ class GoogleYouTubeStudio(GoogleWebSession):
                 },
             },
         }
+        return payload
 
-        response = self._session.post(_url, json=payload)
-        if response.status_code == 409:
+    @staticmethod
+    def _edit_ineligible(claim: StudioVideoClaimsObj, option: str) -> Optional[dict]:
+        """
+        @param claim: Pass :class StudioVideoClaimsObj
+        @param option: TRIM_SEGMENT or MUTE_SONG
+        @return: status and code when the option is unavailable, else None
+        """
+        if option in claim.resolve_option:
+            return None
+        if option == "TRIM_SEGMENT":
+            return {"status": "Trim Segment option is unavailable for this claims",
+                    "code": "INELIGIBLE_FOR_TRIM_OUT"}
+        return {"status": "Mute song is unavailable for this claim",
+                "code": "INELIGIBLE_TO_MUTE"}
+
+    @staticmethod
+    def _edit_result(status_code: int, data: Optional[dict]) -> dict:
+        """
+        @param status_code: edit_video response status
+        @param data: edit_video response
+        @return: edit status and code
+        """
+        if status_code == 409:
             return {
                 "status": "wait till existing edit process to complete...!",
                 "code": "WAITING_FOR_COMPLETE",
             }
-        if response.status_code == 402:
-            self.context.logger.info(
-                "Google Session Expired, Trying Again Please Wait...!"
-            )
-            self._session = self._web_request()
-            return self.trim_out(claim)
-        response.raise_for_status()
-        res_data = response.json()
-        return {"status": res_data.get("executionStatus"),
+        return {"status": data.get("executionStatus"),
                 "code": "INITIATED_FOR_EDIT"}
 
-    def mute_segment_songs(self, claim: StudioVideoClaimsObj, song_only=True):
+    def trim_out(self, claim: StudioVideoClaimsObj,
+                 segments: Optional[list] = None):
+        """
+        Trim out copyright segment
+        @param claim: Pass :class StudioVideoClaimsObj
+        @param segments: claimed segments when already known, else fetched
+        @return:
+        """
+        if ineligible := self._edit_ineligible(claim, "TRIM_SEGMENT"):
+            return ineligible
+        if segments is None:
+            segments = self._get_claimed_duration(claim)
+        payload = self._edit_payload(claim, "REMOVE_SONG_METHOD_TRIM",
+                                     segments, False)
+
+        response = self._post("video_editor/edit_video", payload)
+        if response.status_code == 409:
+            return self._edit_result(response.status_code, None)
+        response.raise_for_status()
+        self.invalidate_video_matches(claim.video_id)
+        return self._edit_result(response.status_code, response.json())
+
+    def mute_segment_songs(self, claim: StudioVideoClaimsObj, song_only=True,
+                           segments: Optional[list] = None):
         """
         To mute the songs of the segment or mute entire segment sound
         @param claim: Pass :class StudioVideoClaimsObj
         @param song_only: "True" to mute cpr song only, "False" to mute entire sound
+        @param segments: claimed segments when already known, else fetched
         @return:
         """
-        if "MUTE_SONG" not in claim.resolve_option:
-            return {"status": "Mute song is unavailable for this claim",
-                    "code": "INELIGIBLE_TO_MUTE"}
+        if ineligible := self._edit_ineligible(claim, "MUTE_SONG"):
+            return ineligible
+        if segments is None:
+            segments = self._get_claimed_duration(claim)
 
-        _url = (f"{self._base_url}/{self._service}/{self._version}"
-                "/video_editor/edit_video")
+        payload = self._edit_payload(
+            claim,
+            "REMOVE_SONG_METHOD_WAVEFORM_ERASE" if song_only
+            else "REMOVE_SONG_METHOD_MUTE",
+            segments,
+            True)
 
-        payload = {
-            "externalVideoId": claim.video_id,
-            "claimEditChange": {
-                "addRemoveSongEdit": {
-                    "claimId": claim.claim_id,
-                    "method": "REMOVE_SONG_METHOD_WAVEFORM_ERASE"
-                    if song_only
-                    else "REMOVE_SONG_METHOD_MUTE",
-                    "muteSegments": self._get_claimed_duration(claim),
-                    "allKnownMatchesCovered": True,
-                }
-            },
-            "context": {
-                "client": {
-                    "clientName": 62,
-                    "clientVersion": "1.20231128.04.00",
-                    "hl": "en",
-                    "gl": "IN",
-                    "experimentsToken": "",
-                    "utcOffsetMinutes": 330,
-                    "userInterfaceTheme": "USER_INTERFACE_THEME_DARK",
-                    "screenWidthPoints": 811,
-                    "screenHeightPoints": 629,
-                    "screenPixelDensity": 1,
-                    "screenDensityFloat": 1,
-                },
-                "request": {
-                    "returnLogEntry": True,
-                    "internalExperimentFlags": [],
-                    "sessionInfo": {"token": self._session_token},
-                    "consistencyTokenJars": [],
-                },
-                "user": {
-                    "delegationContext": {
-                        "externalChannelId": self._channel_id,
-                        "roleType": {
-                            "channelRoleType": "CREATOR_CHANNEL_ROLE_TYPE_OWNER"
-                        },
-                    }
-                },
-            },
-        }
-
-        response = self._session.post(_url, json=payload)
+        response = self._post("video_editor/edit_video", payload)
         if response.status_code == 409:
-            return {
-                "status": "wait until existing edit process to complete...!",
-                "code": "WAITING_FOR_COMPLETE",
-            }
-        if response.status_code == 402:
-            self.context.logger.info(
-                "Google Session Expired, Trying Again Please Wait...!"
-            )
-            self._session = self._web_request()
-            return self.mute_segment_songs(claim, song_only)
+            return self._edit_result(response.status_code, None)
 
         response.raise_for_status()
-        res_data = response.json()
-        return {"status": res_data.get("executionStatus"),
-                "code": "INITIATED_FOR_EDIT"}
+        self.invalidate_video_matches(claim.video_id)
+        return self._edit_result(response.status_code, response.json())
@@ -0,0 +1,246 @@
+"""YouTube Studio API Unofficial, Async Transport"""
+import asyncio
+from typing import AsyncGenerator, AsyncIterable, Iterable, Optional, Tuple, \
+    Union
+
+import aiohttp
+
+from artifi.google.ext.youtube import GoogleYouTubeStudio, StudioVideoClaimsObj, \
+    StudioVideoObj
+
+
+class AsyncGoogleYouTubeStudio:
+    """
+    Async variant of :class GoogleYouTubeStudio built on aiohttp, the login,
+    payloads and result objects are shared with the sync client
+    example_usage: studio = GoogleYouTubeStudio(context, email, password)
+                   async with AsyncGoogleYouTubeStudio(studio) as client:
+                       async for claim in client.scan_claims():
+                           ...
+    """
+
+    def __init__(self, studio: GoogleYouTubeStudio, concurrency: int = 100):
+        """
+        @param studio: logged in :class GoogleYouTubeStudio
+        @param concurrency: Maximum number of requests in flight
+        """
+        self.studio = studio
+        self.context = studio.context
+        self.concurrency = concurrency
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    def _client(self) -> aiohttp.ClientSession:
+        """@return: pooled session, created inside the running loop"""
+        if self._http is None:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(total=60))
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._refresh_lock = asyncio.Lock()
+        return self._http
+
+    async def _refresh(self, stale):
+        """
+        Renew the sync client session once for every request which saw it expire
+        @param stale: requests session the expired request was sent with
+        """
+        async with self._refresh_lock:
+            await asyncio.to_thread(self.studio.refresh_session, stale)
+
+    async def _post(self, path: str, payload: dict) -> Tuple[int, Optional[dict]]:
+        """
+        @param path: path below the youtubei service
+        @param payload: request body
+        @return: status code and response, None for 409
+        """
+        http = self._client()
+        # like the sync client, the session is renewed once per request
+        for attempt in range(2):
+            session = self.studio._session
+            async with self._semaphore:
+                async with http.post(self.studio._endpoint(path), json=payload,
+                                     headers=dict(session.headers),
+                                     params=session.params) as response:
+                    if response.status == 409:
+                        return response.status, None
+                    if response.status != 402 or attempt:
+                        response.raise_for_status()
+                        return response.status, await response.json(content_type=None)
+            await self._refresh(session)
+            self.studio._renew_session_info(payload)
+
+    async def list_videos(self, mask="full",
+                          page_size: int = 30) -> AsyncGenerator[StudioVideoObj, None]:
+        """
+        Show List of Videos in the YouTube studio
+        @param mask: minimal, claims or full, see :meth StudioVideoObj.mask
+        @param page_size: videos per page
+        @return: async generator of :class StudioVideoObj
+        """
+        page_token = None
+        while True:
+            _, data = await self._post("creator/list_creator_videos",
+                                       self.studio._videos_payload(
+                                           page_token, mask, page_size))
+            for video_data in data.get("videos", []):
+                yield StudioVideoObj(video_data)
+            if not (page_token := data.get("nextPageToken")):
+                break
+
+    async def list_video_claims(
+            self, video: StudioVideoObj
+    ) -> AsyncGenerator[StudioVideoClaimsObj, None]:
+        """
+        Show list claims on videos
+        @param video: pass :class StudioVideoObj
+        @return: async generator of :class StudioVideoClaimsObj
+        """
+        _, data = await self._post("creator/list_creator_received_claims",
+                                   self.studio._claims_payload(video.video_id))
+        for claim in data.get("receivedClaims", []):
+            yield StudioVideoClaimsObj(claim)
+
+    async def _video_claims(self, video: StudioVideoObj,
+                            preload_matches: bool = False) -> list:
+        """
+        @param video: pass :class StudioVideoObj
+        @param preload_matches: 'True' to cache the matches of editable claims
+        @return: claims of the video
+        """
+        claims = [claim async for claim in self.list_video_claims(video)]
+        if preload_matches:
+            await asyncio.gather(*(self.get_claimed_duration(claim)
+                                   for claim in claims
+                                   if claim.resolve_option != ["UNAVAILABLE"]))
+        return claims
+
+    async def scan_claims(
+            self,
+            videos: Union[Iterable[StudioVideoObj],
+                          AsyncIterable[StudioVideoObj], None] = None,
+            preload_matches: bool = False
+    ) -> AsyncGenerator[StudioVideoClaimsObj, None]:
+        """
+        Fetch the claims of many videos concurrently, bounded by concurrency
+        @param videos: :class StudioVideoObj to scan, sync or async iterable,
+                       default is every video
+        @param preload_matches: 'True' to fetch the matches of every editable
+                                claim, so trim and mute find them cached
+        @return: claims of :class StudioVideoClaimsObj as they arrive
+        """
+        source = self.list_videos("claims") if videos is None else videos
+        if hasattr(source, "__aiter__"):
+            source = source.__aiter__()
+
+            async def next_video():
+                try:
+                    return await source.__anext__()
+                except StopAsyncIteration:
+                    return None
+        else:
+            source = iter(source)
+
+            async def next_video():
+                return next(source, None)
+
+        pending = {}
+
+        async def submit():
+            if (video := await next_video()) is not None:
+                pending[asyncio.ensure_future(self._video_claims(
+                    video, preload_matches))] = video
+                return True
+            return False
+
+        while len(pending) < self.concurrency * 2 and await submit():
+            pass
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for job in done:
+                    video = pending.pop(job)
+                    await submit()
+                    try:
+                        claims = job.result()
+                    except Exception as e:
+                        self.context.logger.error(
+                            f"Failed To Fetch Claims Of Video: {video.video_id} Reason: {e}")
+                        continue
+                    for claim in claims:
+                        yield claim
+        finally:
+            for job in pending:
+                job.cancel()
+
+    async def get_claimed_duration(self, claim: StudioVideoClaimsObj) -> list:
+        """
+        @param claim: Pass :class StudioVideoClaimsObj
+        @return: video segments of the claim matches
+        """
+        if (segments := self.studio._cached_matches(claim)) is not None:
+            return segments
+        _, data = await self._post("copyright/get_creator_received_claim_matches",
+                                   self.studio._claim_matches_payload(claim))
+        segments = self.studio._claim_segments(data)
+        self.studio._cache_matches(claim, segments)
+        return segments
+
+    def _edit_result(self, claim: StudioVideoClaimsObj, status_code: int,
+                     data: Optional[dict]) -> dict:
+        """
+        @param claim: edited :class StudioVideoClaimsObj
+        @param status_code: edit_video response status
+        @param data: edit_video response
+        @return: edit status and code
+        """
+        if status_code != 409:
+            self.studio.invalidate_video_matches(claim.video_id)
+        return self.studio._edit_result(status_code, data)
+
+    async def trim_out(self, claim: StudioVideoClaimsObj) -> dict:
+        """
+        Trim out copyright segment
+        @param claim: Pass :class StudioVideoClaimsObj
+        @return: edit status and code
+        """
+        if ineligible := self.studio._edit_ineligible(claim, "TRIM_SEGMENT"):
+            return ineligible
+        payload = self.studio._edit_payload(claim, "REMOVE_SONG_METHOD_TRIM",
+                                            await self.get_claimed_duration(claim),
+                                            False)
+        return self._edit_result(claim, *await self._post("video_editor/edit_video",
+                                                          payload))
+
+    async def mute_segment_songs(self, claim: StudioVideoClaimsObj,
+                                 song_only=True) -> dict:
+        """
+        To mute the songs of the segment or mute entire segment sound
+        @param claim: Pass :class StudioVideoClaimsObj
+        @param song_only: "True" to mute cpr song only, "False" to mute entire sound
+        @return: edit status and code
+        """
+        if ineligible := self.studio._edit_ineligible(claim, "MUTE_SONG"):
+            return ineligible
+        payload = self.studio._edit_payload(
+            claim,
+            "REMOVE_SONG_METHOD_WAVEFORM_ERASE" if song_only
+            else "REMOVE_SONG_METHOD_MUTE",
+            await self.get_claimed_duration(claim),
+            True)
+        return self._edit_result(claim, *await self._post("video_editor/edit_video",
+                                                          payload))
@@ -0,0 +1,247 @@
+"""YouTube Studio Local Video Catalog"""
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from requests import HTTPError
+from sqlalchemy import func
+
+from artifi.google.ext.youtube import GoogleYouTubeStudio, StudioVideoObj
+from artifi.google.ext.youtube_model import YtCatalogStateModel, YtVideoModel
+
+
+class YouTubeStudioCatalog:
+    """
+    Local catalog of the channel videos kept in Artifi.db_engine, dashboards
+    and claim jobs read from it instead of paging Studio every time
+    example_usage: catalog = YouTubeStudioCatalog(studio)
+                   catalog.refresh()
+                   catalog.videos(restriction="COPYRIGHT")
+    """
+
+    recheck_mask = StudioVideoObj.mask("claims")
+    recheck_mask["metrics"] = {"all": True}
+
+    def __init__(self, studio: GoogleYouTubeStudio):
+        """@param studio: logged in :class GoogleYouTubeStudio"""
+        self.studio = studio
+        self.context = studio.context
+        self.context.create_db_table([YtVideoModel, YtCatalogStateModel])
+
+    @staticmethod
+    def _compact(video: StudioVideoObj) -> dict:
+        """
+        @param video: pass :class StudioVideoObj
+        @return: only the keys the object reads
+        """
+        return video.raw
+
+    def _store(self, row: YtVideoModel, payload: dict):
+        """
+        @param row: catalog row to fill
+        @param payload: compact video resource
+        """
+        video = StudioVideoObj(payload)
+        row.yt_video_id = video.video_id
+        row.yt_channel_id = video.channel_id
+        row.yt_video_title = video.video_title
+        row.yt_video_restriction = video.restriction
+        row.yt_video_status = video.video_status
+        row.yt_video_views = int(video.insights.get("total_view") or 0)
+        row.yt_video_time_created = video.time_created
+        row.yt_video_payload = json.dumps(payload)
+        row.yt_video_checked_at = datetime.now()
+        row.yt_video_updated_at = datetime.now()
+
+    def _upsert(self, videos: List[StudioVideoObj]) -> int:
+        """
+        @param videos: list of :class StudioVideoObj
+        @return: number of new videos
+        """
+        if not videos:
+            return 0
+        with self.context.db_session() as session:
+            rows: Dict[str, YtVideoModel] = {
+                row.yt_video_id: row for row in session.query(YtVideoModel).filter(
+                    YtVideoModel.yt_video_id.in_([video.video_id for video in videos]))
+            }
+            added = 0
+            for video in videos:
+                if not (row := rows.get(video.video_id)):
+                    row = YtVideoModel(self.context)
+                    row.yt_video_created_at = datetime.now()
+                    added += 1
+                self._store(row, self._compact(video))
+                session.add(row)
+            session.commit()
+        return added
+
+    def newest_time(self) -> Optional[int]:
+        """@return: newest timeCreatedSeconds in the catalog"""
+        with self.context.db_session() as session:
+            return session.query(func.max(YtVideoModel.yt_video_time_created)).filter(
+                YtVideoModel.yt_channel_id == self.studio._channel_id).scalar()
+
+    def _crawl_state(self) -> Tuple[Optional[int], Optional[str], Optional[datetime]]:
+        """@return: head display time, resume page token and full listing time"""
+        with self.context.db_session() as session:
+            state = session.query(YtCatalogStateModel).filter(
+                YtCatalogStateModel.yt_catalog_channel_id == self.studio._channel_id
+            ).first()
+            if not state:
+                return None, None, None
+            return (state.yt_catalog_head_time, state.yt_catalog_page_token,
+                    state.yt_catalog_crawled_at)
+
+    def _save_crawl_state(self, **values):
+        """@param values: head_time, page_token or crawled_at to store"""
+        with self.context.db_session() as session:
+            state = session.query(YtCatalogStateModel).filter(
+                YtCatalogStateModel.yt_catalog_channel_id == self.studio._channel_id
+            ).first()
+            if not state:
+                state = YtCatalogStateModel(self.context)
+                state.yt_catalog_channel_id = self.studio._channel_id
+                state.yt_catalog_created_at = datetime.now()
+            for key, value in values.items():
+                setattr(state, f"yt_catalog_{key}", value)
+            state.yt_catalog_updated_at = datetime.now()
+            session.add(state)
+            session.commit()
+
+    def _resume(self, page_token: str, fetched: List[str]) -> int:
+        """
+        Go on with a full listing which stopped before the last page
+        @param page_token: next page of the listing
+        @param fetched: collects the stored video IDs
+        @return: number of new videos
+        """
+        added = 0
+        try:
+            for videos, next_token in self.studio.list_video_pages(
+                    page_token=page_token):
+                added += self._upsert(videos)
+                fetched.extend(video.video_id for video in videos)
+                self._save_crawl_state(
+                    page_token=next_token,
+                    crawled_at=None if next_token else datetime.now())
+        except HTTPError as e:
+            if e.response is None or e.response.status_code != 400:
+                raise
+            # the page token expired, the next refresh lists from the top
+            self.context.logger.warning(
+                "Video Catalog Page Token Expired, Listing Starts Over")
+            self._save_crawl_state(head_time=None, page_token=None)
+        return added
+
+    def refresh(self, recheck_limit: int = 200) -> dict:
+        """
+        Fetch the videos shown above the newest video of the last refresh,
+        go on with the first full listing if it stopped before the last page,
+        then re-check metrics and claim status of the least recently checked
+        videos
+        @param recheck_limit: Number of known videos to re-check, 0 to skip
+        @return: count of added, updated and re-checked videos
+        """
+        head_time, page_token, crawled_at = self._crawl_state()
+        full_listing = head_time is None
+        fetched: List[str] = []
+        added = 0
+        newest = None
+        # Studio orders by display time, an upload or a video published since
+        # the last refresh is shown above the stored head time
+        for videos, next_token in self.studio.list_video_pages():
+            if newest is None:
+                newest = max((video.display_time for video in videos
+                              if video.display_time), default=None)
+            shown_above = [video for video in videos if full_listing
+                           or not video.display_time
+                           or video.display_time >= head_time]
+            added += self._upsert(shown_above)
+            fetched.extend(video.video_id for video in shown_above)
+            if full_listing:
+                # a failed first listing goes on from this page next time
+                self._save_crawl_state(
+                    head_time=newest, page_token=next_token,
+                    crawled_at=None if next_token else datetime.now())
+            elif len(shown_above) < len(videos):
+                break
+        if not full_listing:
+            self._save_crawl_state(head_time=newest or head_time)
+            if crawled_at is None and page_token:
+                added += self._resume(page_token, fetched)
+        rechecked = self.recheck(limit=recheck_limit, skip=fetched)
+        self.context.logger.info(
+            f"Video Catalog Refreshed, Added: {added} Re-Checked: {rechecked}")
+        return {"added": added, "updated": len(fetched) - added,
+                "rechecked": rechecked}
+
+    def recheck(self, video_ids: Optional[List[str]] = None, limit: int = 200,
+                skip: Optional[List[str]] = None) -> int:
+        """
+        Refresh metrics and claim status with a small mask
+        @param video_ids: Video unique IDs, default is the least recently
+                          checked videos
+        @param limit: Number of videos when video_ids is not given
+        @param skip: Video unique IDs to leave out
+        @return: number of re-checked videos
+        """
+        with self.context.db_session() as session:
+            if video_ids is None:
+                if not limit:
+                    return 0
+                query = session.query(YtVideoModel.yt_video_id).filter(
+                    YtVideoModel.yt_channel_id == self.studio._channel_id)
+                if skip:
+                    query = query.filter(YtVideoModel.yt_video_id.notin_(skip))
+                video_ids = [row.yt_video_id for row in query.order_by(
+                    YtVideoModel.yt_video_checked_at).limit(limit)]
+            if not video_ids:
+                return 0
+            rows = {row.yt_video_id: row for row in session.query(YtVideoModel).filter(
+                YtVideoModel.yt_video_id.in_(video_ids))}
+            checked = 0
+            for video in self.studio.get_videos(list(rows), self.recheck_mask):
+                if row := rows.get(video.video_id):
+                    payload = json.loads(row.yt_video_payload)
+                    fresh = video.raw
+                    # Studio leaves out a key which became empty, e.g. a
+                    # lifted restriction, so every masked key is replaced
+                    for key in self.recheck_mask:
+                        if key in fresh:
+                            payload[key] = fresh[key]
+                        else:
+                            payload.pop(key, None)
+                    self._store(row, payload)
+                    session.add(row)
+                    checked += 1
+            session.commit()
+        return checked
+
+    def get(self, video_id: str) -> Optional[StudioVideoObj]:
+        """
+        @param video_id: Video unique ID
+        @return: :class StudioVideoObj from the catalog
+        """
+        with self.context.db_session() as session:
+            row = session.query(YtVideoModel).filter(
+                YtVideoModel.yt_video_id == video_id).first()
+            return StudioVideoObj(json.loads(row.yt_video_payload)) if row else None
+
+    def videos(self, restriction: Optional[str] = None,
+               limit: Optional[int] = None) -> List[StudioVideoObj]:
+        """
+        @param restriction: Optional filter, e.g. COPYRIGHT or NO_RESTRICTION
+        @param limit: Maximum number of videos
+        @return: catalog videos of the channel, newest first
+        """
+        with self.context.db_session() as session:
+            query = session.query(YtVideoModel.yt_video_payload).filter(
+                YtVideoModel.yt_channel_id == self.studio._channel_id)
+            if restriction:
+                query = query.filter(
+                    YtVideoModel.yt_video_restriction == restriction)
+            query = query.order_by(YtVideoModel.yt_video_time_created.desc())
+            if limit:
+                query = query.limit(limit)
+            return [StudioVideoObj(json.loads(row.yt_video_payload)) for row in query]
@@ -0,0 +1,75 @@
+"""YouTube Studio DB Models"""
+from sqlalchemy import INTEGER, TIMESTAMP, VARCHAR, Column
+
+from artifi import Artifi
+
+
+class YtVideoModel(Artifi.dbmodel):
+    """YouTube Studio video catalog"""
+
+    def __init__(self, context):
+        self.context: Artifi = context
+
+    __tablename__ = "yt_video"
+    yt_video_pid = Column(INTEGER(), autoincrement=True, primary_key=True)
+    yt_video_id = Column(VARCHAR(), index=True)
+    yt_channel_id = Column(VARCHAR(), index=True)
+    yt_video_title = Column(VARCHAR())
+    yt_video_restriction = Column(VARCHAR())
+    yt_video_status = Column(VARCHAR())
+    yt_video_views = Column(INTEGER())
+    yt_video_time_created = Column(INTEGER())
+    # JSON of the keys read by StudioVideoObj
+    yt_video_payload = Column(VARCHAR())
+
+    # logs
+    yt_video_checked_at = Column(TIMESTAMP())
+    yt_video_created_at = Column(TIMESTAMP())
+    yt_video_updated_at = Column(TIMESTAMP())
+
+
+class YtCatalogStateModel(Artifi.dbmodel):
+    """Listing progress of the video catalog of a channel"""
+
+    def __init__(self, context):
+        self.context: Artifi = context
+
+    __tablename__ = "yt_catalog_state"
+    yt_catalog_pid = Column(INTEGER(), autoincrement=True, primary_key=True)
+    yt_catalog_channel_id = Column(VARCHAR(), index=True)
+    # display time of the newest video when the list was last read from the top
+    yt_catalog_head_time = Column(INTEGER())
+    # next page of the full listing, None once it reached the last page
+    yt_catalog_page_token = Column(VARCHAR())
+
+    # logs
+    yt_catalog_crawled_at = Column(TIMESTAMP())
+    yt_catalog_created_at = Column(TIMESTAMP())
+    yt_catalog_updated_at = Column(TIMESTAMP())
+
+
+class YtClaimJobModel(Artifi.dbmodel):
+    """Queued copyright claim resolution"""
+
+    def __init__(self, context):
+        self.context: Artifi = context
+
+    __tablename__ = "yt_claim_job"
+    yt_claim_job_pid = Column(INTEGER(), autoincrement=True, primary_key=True)
+    yt_claim_job_claim_id = Column(VARCHAR(), index=True)
+    yt_claim_job_video_id = Column(VARCHAR(), index=True)
+    yt_claim_job_channel_id = Column(VARCHAR(), index=True)
+    # TRIM_SEGMENT, MUTE_SONG or MUTE_SEGMENT
+    yt_claim_job_action = Column(VARCHAR())
+    # QUEUED, WAITING, DONE, INELIGIBLE or FAILED
+    yt_claim_job_state = Column(VARCHAR(), index=True)
+    yt_claim_job_attempts = Column(INTEGER(), default=0)
+    yt_claim_job_next_attempt_at = Column(TIMESTAMP(), index=True)
+    yt_claim_job_result = Column(VARCHAR())
+    # JSON of the claim resource, and of the claimed segments while a 409 is retried
+    yt_claim_job_claim = Column(VARCHAR())
+    yt_claim_job_segments = Column(VARCHAR())
+
+    # logs
+    yt_claim_job_created_at = Column(TIMESTAMP())
+    yt_claim_job_updated_at = Column(TIMESTAMP())
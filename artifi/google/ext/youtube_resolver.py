@@ -0,0 +1,263 @@
+"""YouTube Studio Copyright Claim Resolution Queue"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func
+
+from artifi.google.ext.youtube import GoogleYouTubeStudio, StudioVideoClaimsObj, \
+    StudioVideoObj
+from artifi.google.ext.youtube_model import YtClaimJobModel
+
+
+class YouTubeClaimResolver:
+    """
+    Persistent queue of claim edits, videos are resolved concurrently while
+    the edits of one video run one after another, a 409 from Studio is
+    retried later on an exponential schedule by the Artifi scheduler
+    example_usage: resolver = YouTubeClaimResolver(studio)
+                   resolver.enqueue_channel("TRIM_SEGMENT")
+                   studio.context.start_scheduler()
+    """
+
+    actions = ("TRIM_SEGMENT", "MUTE_SONG", "MUTE_SEGMENT")
+    open_states = ("QUEUED", "WAITING")
+    active_statuses = ("ACTIVE",)
+
+    def __init__(self, studio: GoogleYouTubeStudio, concurrency: int = 4,
+                 interval: int = 1, base_delay: int = 2, max_delay: int = 240,
+                 max_attempts: int = 12):
+        """
+        @param studio: logged in :class GoogleYouTubeStudio
+        @param concurrency: Number of videos edited at the same time
+        @param interval: minutes between scheduler runs
+        @param base_delay: minutes before the first retry of a 409
+        @param max_delay: upper bound of the retry delay in minutes
+        @param max_attempts: attempts before a job is marked FAILED
+        """
+        self.studio = studio
+        self.context = studio.context
+        self.concurrency = concurrency
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._running = threading.Lock()
+        self.context.create_db_table([YtClaimJobModel])
+        self.context.add_scheduler(
+            self.run,
+            job_id=f"yt_claim_resolver_{self.studio._channel_id}",
+            interval=interval,
+            no_end=True,
+        )
+
+    @staticmethod
+    def _action_option(action: str) -> str:
+        """
+        @param action: TRIM_SEGMENT, MUTE_SONG or MUTE_SEGMENT
+        @return: resolve option of :class StudioVideoClaimsObj required by it
+        """
+        return "TRIM_SEGMENT" if action == "TRIM_SEGMENT" else "MUTE_SONG"
+
+    def enqueue(self, claims: Iterable[StudioVideoClaimsObj],
+                action: str = "TRIM_SEGMENT") -> int:
+        """
+        @param claims: claims of :class StudioVideoClaimsObj
+        @param action: TRIM_SEGMENT, MUTE_SONG or MUTE_SEGMENT
+        @return: number of queued claims, claims already queued are skipped
+        """
+        if action not in self.actions:
+            raise ValueError(f"Unknown Action {action}, Use One Of {self.actions}")
+        claims = {claim.claim_id: claim for claim in claims}
+        if not claims:
+            return 0
+        with self.context.db_session() as session:
+            queued = {row.yt_claim_job_claim_id for row in session.query(
+                YtClaimJobModel.yt_claim_job_claim_id).filter(and_(
+                    YtClaimJobModel.yt_claim_job_claim_id.in_(list(claims)),
+                    YtClaimJobModel.yt_claim_job_state.in_(self.open_states)))}
+            added = 0
+            for claim_id, claim in claims.items():
+                if claim_id in queued:
+                    continue
+                job = YtClaimJobModel(self.context)
+                job.yt_claim_job_claim_id = claim_id
+                job.yt_claim_job_video_id = claim.video_id
+                job.yt_claim_job_channel_id = self.studio._channel_id
+                job.yt_claim_job_action = action
+                job.yt_claim_job_state = "QUEUED"
+                job.yt_claim_job_attempts = 0
+                job.yt_claim_job_next_attempt_at = datetime.now()
+                job.yt_claim_job_claim = json.dumps(claim.raw)
+                job.yt_claim_job_created_at = datetime.now()
+                job.yt_claim_job_updated_at = datetime.now()
+                session.add(job)
+                added += 1
+            session.commit()
+        return added
+
+    def enqueue_channel(self, action: str = "TRIM_SEGMENT",
+                        videos: Optional[Iterable[StudioVideoObj]] = None) -> int:
+        """
+        Queue every claim of the channel which can be resolved with the action
+        @param action: TRIM_SEGMENT, MUTE_SONG or MUTE_SEGMENT
+        @param videos: :class StudioVideoObj to scan, default is every video
+        @return: number of queued claims
+        """
+        option = self._action_option(action)
+        added = 0
+        batch = []
+        for claim in self.studio.scan_claims(videos):
+            if option in claim.resolve_option:
+                batch.append(claim)
+            if len(batch) == 100:
+                added += self.enqueue(batch, action)
+                batch = []
+        added += self.enqueue(batch, action)
+        self.context.logger.info(f"Queued {added} Claims To {action}")
+        return added
+
+    def _backoff(self, attempts: int) -> datetime:
+        """
+        @param attempts: attempts made so far
+        @return: time of the next attempt
+        """
+        delay = min(self.base_delay * 2 ** max(attempts - 1, 0), self.max_delay)
+        return datetime.now() + timedelta(minutes=delay)
+
+    def _current_claim(self, job: YtClaimJobModel) -> Optional[StudioVideoClaimsObj]:
+        """
+        @param job: queued claim edit
+        @return: claim as Studio shows it now, None when it is no longer active
+        """
+        # matches of the video are read again with the claim
+        self.studio.invalidate_video_matches(job.yt_claim_job_video_id)
+        video = StudioVideoObj({"videoId": job.yt_claim_job_video_id})
+        claim = next((claim for claim in self.studio.list_video_claims(video)
+                      if claim.claim_id == job.yt_claim_job_claim_id), None)
+        if claim is None or claim.status not in self.active_statuses:
+            return None
+        job.yt_claim_job_claim = json.dumps(claim.raw)
+        return claim
+
+    def _edit(self, job: YtClaimJobModel) -> dict:
+        """
+        @param job: queued claim edit
+        @return: edit status and code
+        """
+        if job.yt_claim_job_segments is None:
+            # an earlier edit of the video may have released or moved the claim
+            claim = self._current_claim(job)
+            if claim is None:
+                return {"status": "Claim is released or resolved already",
+                        "code": "CLAIM_RELEASED"}
+        else:
+            claim = StudioVideoClaimsObj(json.loads(job.yt_claim_job_claim))
+        if ineligible := self.studio._edit_ineligible(
+                claim, self._action_option(job.yt_claim_job_action)):
+            return ineligible
+        # the matches are kept only while the same edit waits on a 409
+        if job.yt_claim_job_segments is None:
+            job.yt_claim_job_segments = json.dumps(
+                self.studio._get_claimed_duration(claim))
+        segments = json.loads(job.yt_claim_job_segments)
+        if job.yt_claim_job_action == "TRIM_SEGMENT":
+            return self.studio.trim_out(claim, segments=segments)
+        return self.studio.mute_segment_songs(
+            claim, song_only=job.yt_claim_job_action == "MUTE_SONG",
+            segments=segments)
+
+    def _resolve_video(self, job_pids: List[int]):
+        """
+        Edit the due claims of one video in queue order, a 409 pauses the
+        rest of the video until the retry
+        @param job_pids: due jobs of the video
+        """
+        with self.context.db_session() as session:
+            jobs = session.query(YtClaimJobModel).filter(
+                YtClaimJobModel.yt_claim_job_pid.in_(job_pids)).order_by(
+                YtClaimJobModel.yt_claim_job_pid).all()
+            retry_at = None
+            for job in jobs:
+                job.yt_claim_job_updated_at = datetime.now()
+                if retry_at:
+                    job.yt_claim_job_next_attempt_at = retry_at
+                    continue
+                job.yt_claim_job_attempts += 1
+                try:
+                    result = self._edit(job)
+                except Exception as e:
+                    self.context.logger.error(
+                        f"Failed To Resolve Claim: {job.yt_claim_job_claim_id} "
+                        f"Reason: {e}")
+                    result = {"status": str(e), "code": "ERROR"}
+                job.yt_claim_job_result = result["code"]
+                if result["code"] != "WAITING_FOR_COMPLETE":
+                    job.yt_claim_job_segments = None
+                if result["code"] == "INITIATED_FOR_EDIT":
+                    job.yt_claim_job_state = "DONE"
+                    # the edit shifts the matches of the other claims
+                    session.query(YtClaimJobModel).filter(and_(
+                        YtClaimJobModel.yt_claim_job_video_id == job.yt_claim_job_video_id,
+                        YtClaimJobModel.yt_claim_job_pid != job.yt_claim_job_pid,
+                        YtClaimJobModel.yt_claim_job_state.in_(self.open_states),
+                    )).update({YtClaimJobModel.yt_claim_job_segments: None},
+                              synchronize_session="fetch")
+                elif result["code"] == "CLAIM_RELEASED":
+                    job.yt_claim_job_state = "DONE"
+                elif result["code"].startswith("INELIGIBLE"):
+                    job.yt_claim_job_state = "INELIGIBLE"
+                elif job.yt_claim_job_attempts >= self.max_attempts:
+                    job.yt_claim_job_state = "FAILED"
+                else:
+                    job.yt_claim_job_state = "WAITING"
+                    job.yt_claim_job_next_attempt_at = self._backoff(
+                        job.yt_claim_job_attempts)
+                    if result["code"] == "WAITING_FOR_COMPLETE":
+                        retry_at = job.yt_claim_job_next_attempt_at
+                session.commit()
+            session.commit()
+
+    def run(self) -> int:
+        """
+        Resolve the due jobs, called by the scheduler, a run is skipped while
+        the previous one is still going
+        @return: number of videos processed
+        """
+        if not self._running.acquire(blocking=False):
+            return 0
+        try:
+            with self.context.db_session() as session:
+                due = session.query(YtClaimJobModel.yt_claim_job_pid,
+                                    YtClaimJobModel.yt_claim_job_video_id).filter(and_(
+                    YtClaimJobModel.yt_claim_job_channel_id == self.studio._channel_id,
+                    YtClaimJobModel.yt_claim_job_state.in_(self.open_states),
+                    YtClaimJobModel.yt_claim_job_next_attempt_at <= datetime.now(),
+                )).order_by(YtClaimJobModel.yt_claim_job_video_id).all()
+            videos = [[row.yt_claim_job_pid for row in rows] for _, rows in
+                      groupby(due, key=lambda row: row.yt_claim_job_video_id)]
+            if not videos:
+                return 0
+            self.studio._grow_pool(self.concurrency)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for video, job in zip(videos, [pool.submit(self._resolve_video, pids)
+                                               for pids in videos]):
+                    try:
+                        job.result()
+                    except Exception as e:
+                        self.context.logger.error(
+                            f"Claim Resolver Failed On Jobs: {video} Reason: {e}")
+            self.context.logger.info(f"Claim Resolver Processed {len(videos)} Videos")
+            return len(videos)
+        finally:
+            self._running.release()
+
+    def status(self) -> Dict[str, int]:
+        """@return: number of jobs of the channel in every state"""
+        with self.context.db_session() as session:
+            return dict(session.query(YtClaimJobModel.yt_claim_job_state,
+                                      func.count(YtClaimJobModel.yt_claim_job_pid)).filter(
+                YtClaimJobModel.yt_claim_job_channel_id == self.studio._channel_id
+            ).group_by(YtClaimJobModel.yt_claim_job_state).all())
@@ -0,0 +1,185 @@
+"""
+Memory and construction time of StudioVideoObj and StudioVideoClaimsObj
+against the previous eager objects which kept the whole resource alive
+
+usage: python benchmarks/bench_studio_objects.py [videos.json] [claims.json]
+       videos.json: recorded list_creator_videos pages, either one response
+                    or a list of responses, default is 5000 generated videos
+       claims.json: recorded list_creator_received_claims responses, same
+                    format, default is 5000 generated claims
+"""
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from artifi.google.ext.youtube import StudioVideoClaimsObj, StudioVideoObj
+from artifi.utils import get_nested_key
+
+
+class EagerVideoObj:
+    """StudioVideoObj before the slots, kept for comparison"""
+
+    def __init__(self, video: dict):
+        self._video = video
+        self._time_created = int(video.get("timeCreatedSeconds") or 0) or None
+        self._video_id = video.get("videoId")
+        self._channel_id = video.get("channelId")
+        self._video_title = video.get("title")
+        self._video_length = video.get("lengthSeconds")
+        self._description = video.get("description")
+        self._download_url = video.get("downloadUrl")
+        self._restriction = get_nested_key(video.get("allRestrictions"), "reason")
+        self._is_private = video.get("privacy") == "VIDEO_PRIVACY_PRIVATE"
+        self._is_drafted = video.get("draftStatus") == "DRAFT_STATUS_NONE"
+        metrics = video.get("metrics") or {}
+        self._insights = {
+            "total_comments": metrics.get("commentCount"),
+            "total_dislike": metrics.get("dislikeCount"),
+            "total_like": metrics.get("likeCount"),
+            "total_view": metrics.get("viewCount"),
+        }
+        self._edit_processing_status = video.get("inlineEditProcessingStatus")
+        self._video_status = video.get("status")
+
+
+class EagerClaimsObj:
+    """StudioVideoClaimsObj before the slots, kept for comparison"""
+
+    def __init__(self, claim: dict):
+        self._claim = claim
+        self._claim_id = claim.get("claimId")
+        self._video_id = claim.get("videoId")
+        self._type = claim.get("type")
+        start = int(claim.get("matchDetails", {}).get("longestMatchStartTimeSeconds", 0))
+        length = int(claim.get("matchDetails", {}).get("longestMatchDurationSeconds", 0))
+        self._duration = f"{start // 60:02d}:{start % 60:02d} - " \
+                         f"{(start + length) // 60:02d}:{(start + length) % 60:02d}"
+        self._resolve_option = claim.get("nontakedownClaimActions", {}).get("options")
+        meta_data = claim.get("asset", {}).get("srMetadata") or claim.get(
+            "asset", {}).get("metadata", {})
+        self._claim_title = get_nested_key(meta_data, "title")
+        self._status = claim.get("status")
+        self._artists = get_nested_key(meta_data, "artists")
+
+
+def generated_videos(count: int = 5000) -> List[dict]:
+    """@return: video resources shaped like a full mask response"""
+    return [{
+        "videoId": f"video{index:07d}",
+        "channelId": "UCbenchmarkchannel000000",
+        "title": f"Recorded Video Number {index}",
+        "lengthSeconds": str(180 + index % 900),
+        "description": "Lorem ipsum dolor sit amet, " * 20,
+        "downloadUrl": f"https://studio.youtube.com/download/video{index:07d}",
+        "allRestrictions": [{
+            "reason": "VIDEO_RESTRICTION_REASON_COPYRIGHT" if index % 3
+            else "VIDEO_RESTRICTION_REASON_NONE",
+            "type": "VIDEO_RESTRICTION_TYPE_MONETIZATION",
+            "details": {"copyrightDetails": {"claims": [{"claimId": f"c{index}"}]}},
+        }],
+        "privacy": "VIDEO_PRIVACY_PUBLIC",
+        "draftStatus": "DRAFT_STATUS_NONE",
+        "metrics": {"commentCount": "12", "dislikeCount": "1",
+                    "likeCount": "340", "viewCount": str(index * 17)},
+        "inlineEditProcessingStatus": "VIDEO_PROCESSING_STATUS_UNEDITED",
+        "status": "VIDEO_STATUS_PROCESSED",
+        "timeCreatedSeconds": str(1700000000 + index * 60),
+        "thumbnailDetails": {"thumbnails": [
+            {"url": f"https://i.ytimg.com/vi/video{index:07d}/{size}.jpg"}
+            for size in ("default", "mqdefault", "hqdefault", "sddefault")]},
+    } for index in range(count)]
+
+
+def generated_claims(count: int = 5000) -> List[dict]:
+    """@return: claim resources shaped like list_creator_received_claims"""
+    return [{
+        "claimId": f"claim{index:07d}",
+        "videoId": f"video{index // 3:07d}",
+        "type": "CLAIM_TYPE_AUDIO",
+        "matchDetails": {"longestMatchStartTimeSeconds": str(index % 600),
+                         "longestMatchDurationSeconds": "42"},
+        "nontakedownClaimActions": {"options": [
+            "NON_TAKEDOWN_CLAIM_OPTION_ERASE_SONG",
+            "NON_TAKEDOWN_CLAIM_OPTION_TRIM"]},
+        "asset": {"srMetadata": {"title": f"Song {index}",
+                                 "artists": ["Artist A", "Artist B"],
+                                 "album": "Album", "isrc": f"US{index:010d}"}},
+        "status": "ACTIVE",
+        "policy": {"rules": [{"action": "MONETIZE", "conditions": ["WORLD"]}]},
+    } for index in range(count)]
+
+
+def recorded(path: str, key: str) -> List[dict]:
+    """
+    @param path: recorded response or list of responses
+    @param key: videos or receivedClaims
+    @return: resources of the responses
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    pages = data if isinstance(data, list) else [data]
+    return [item for page in pages for item in page.get(key, [])]
+
+
+def retained(factory: Callable, load: Callable) -> float:
+    """
+    @param factory: object class
+    @param load: returns fresh resources, dropped after the objects are built
+    @return: bytes kept alive per object
+    """
+    resources = load()
+    count = len(resources)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    # the resources are copied so only what the objects keep stays alive
+    objects = [factory(json.loads(json.dumps(item))) for item in resources]
+    del resources
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def construction(factory: Callable, resources: List[dict]) -> float:
+    """
+    @param factory: object class
+    @param resources: parsed resources
+    @return: microseconds per object
+    """
+    runs = timeit.repeat(lambda: [factory(item) for item in resources],
+                         number=1, repeat=5)
+    return min(runs) / len(resources) * 1e6
+
+
+def report(name: str, eager: Callable, compact: Callable, load: Callable):
+    """Print the comparison of one object type"""
+    resources = load()
+    eager_bytes, compact_bytes = retained(eager, load), retained(compact, load)
+    eager_us, compact_us = construction(eager, resources), construction(compact,
+                                                                         resources)
+    print(f"{name} ({len(resources)} resources)")
+    print(f"  retained  eager {eager_bytes:10.0f} B  slots {compact_bytes:10.0f} B"
+          f"  ({1 - compact_bytes / eager_bytes:.0%} less)")
+    print(f"  construct eager {eager_us:10.2f} us slots {compact_us:10.2f} us"
+          f"  ({1 - compact_us / eager_us:.0%} less)")
+
+
+def main():
+    """Run the benchmark"""
+    videos_path = sys.argv[1] if len(sys.argv) > 1 else None
+    claims_path = sys.argv[2] if len(sys.argv) > 2 else None
+    report("StudioVideoObj", EagerVideoObj, StudioVideoObj,
+           (lambda: recorded(videos_path, "videos")) if videos_path
+           else generated_videos)
+    report("StudioVideoClaimsObj", EagerClaimsObj, StudioVideoClaimsObj,
+           (lambda: recorded(claims_path, "receivedClaims")) if claims_path
+           else generated_claims)
+
+
+if __name__ == "__main__":
+    main()